@@ -0,0 +1,110 @@
+# benchmarks/bench_api_concurrency.py
+"""
+Throughput and latency of /extract under N concurrent clients, plus /health latency measured
+while they run (shows whether extraction blocks the event loop).
+
+    uvicorn pdf_extractor.api.main:app --port 8000 &
+    python -m benchmarks.bench_api_concurrency --url http://localhost:8000 --pdf some.pdf \
+        --clients 8 --requests 64 [--json]
+
+Run it against the server before and after a change and compare. Needs httpx.
+"""
+from __future__ import annotations
+import argparse
+import asyncio
+import json
+import statistics
+import time
+from pathlib import Path
+from typing import Dict, List
+
+import httpx
+
+
+def _pct(values: List[float], p: float) -> float:
+    if not values:
+        return float("nan")
+    values = sorted(values)
+    return values[min(len(values) - 1, int(round(p / 100 * (len(values) - 1))))]
+
+
+async def _client(http: httpx.AsyncClient, url: str, name: str, pdf: bytes, queue: "asyncio.Queue[int]",
+                  latencies: List[float], statuses: Dict[int, int]) -> None:
+    while True:
+        try:
+            queue.get_nowait()
+        except asyncio.QueueEmpty:
+            return
+        t = time.perf_counter()
+        r = await http.post(f"{url}/extract", files={"pdf": (name, pdf, "application/pdf")})
+        latencies.append(time.perf_counter() - t)
+        statuses[r.status_code] = statuses.get(r.status_code, 0) + 1
+
+
+async def _probe(http: httpx.AsyncClient, url: str, stop: asyncio.Event, latencies: List[float]) -> None:
+    while not stop.is_set():
+        t = time.perf_counter()
+        try:
+            await http.get(f"{url}/health")
+            latencies.append(time.perf_counter() - t)
+        except httpx.HTTPError:
+            pass
+        await asyncio.sleep(0.1)
+
+
+async def run(url: str, pdf_path: str, clients: int, requests: int, timeout: float) -> Dict[str, object]:
+    pdf = Path(pdf_path).read_bytes()
+    queue: "asyncio.Queue[int]" = asyncio.Queue()
+    for k in range(requests):
+        queue.put_nowait(k)
+    latencies: List[float] = []
+    health: List[float] = []
+    statuses: Dict[int, int] = {}
+    stop = asyncio.Event()
+
+    limits = httpx.Limits(max_connections=clients + 1)
+    async with httpx.AsyncClient(timeout=timeout, limits=limits) as http:
+        probe = asyncio.create_task(_probe(http, url, stop, health))
+        t0 = time.perf_counter()
+        await asyncio.gather(*(_client(http, url, Path(pdf_path).name, pdf, queue, latencies, statuses)
+                               for _ in range(clients)))
+        wall = time.perf_counter() - t0
+        stop.set()
+        await probe
+
+    ok = statuses.get(200, 0)
+    return {
+        "clients": clients,
+        "requests": requests,
+        "statuses": statuses,
+        "wall_s": round(wall, 3),
+        "throughput_rps": round(ok / wall, 3) if wall else None,
+        "latency_p50_s": round(_pct(latencies, 50), 3),
+        "latency_p99_s": round(_pct(latencies, 99), 3),
+        "latency_mean_s": round(statistics.fmean(latencies), 3) if latencies else None,
+        "health_p50_ms": round(_pct(health, 50) * 1000, 1),
+        "health_p99_ms": round(_pct(health, 99) * 1000, 1),
+    }
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("--url", default="http://localhost:8000")
+    ap.add_argument("--pdf", required=True)
+    ap.add_argument("--clients", type=int, nargs="*", default=[1, 4, 8])
+    ap.add_argument("--requests", type=int, default=32, help="requests per client count")
+    ap.add_argument("--timeout", type=float, default=600.0)
+    ap.add_argument("--json", action="store_true")
+    args = ap.parse_args()
+
+    for n in args.clients:
+        r = asyncio.run(run(args.url, args.pdf, n, args.requests, args.timeout))
+        if args.json:
+            print(json.dumps(r))
+            continue
+        print(f"clients={n:>3}: {r['throughput_rps']} req/s | p50 {r['latency_p50_s']}s p99 {r['latency_p99_s']}s "
+              f"| /health p50 {r['health_p50_ms']}ms p99 {r['health_p99_ms']}ms | {r['statuses']}")
+
+
+if __name__ == "__main__":
+    main()
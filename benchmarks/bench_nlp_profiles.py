@@ -0,0 +1,99 @@
+# benchmarks/bench_nlp_profiles.py
+"""
+Model load time and per-line latency of each GazetteNLP profile.
+
+    python -m benchmarks.bench_nlp_profiles [--text output/<stem>/completo.txt ...] [--repeat 3] [--json]
+
+Without --text a small built-in gazette sample is used. "full" falls back to blank 'pt' when no
+pt_core_news_* model is installed (the printed pipe names show which one ran).
+"""
+from __future__ import annotations
+import argparse
+import json
+import statistics
+import time
+from pathlib import Path
+from typing import Dict, List
+
+import spacy  # imported up front so it is not counted as load time
+
+from pdf_extractor.services.gazette_nlp import GazetteNLP, NLP_PROFILES
+
+SAMPLE = """\
+Sumário
+SECRETARIA REGIONAL DE EDUCAÇÃO
+Despacho n.º 216/2025
+Nomeia o diretor da escola básica e secundária.
+CÂMARA MUNICIPAL DO FUNCHAL
+Aviso n.º 12/2025
+Procedimento concursal comum para a constituição de relação jurídica de emprego público.
+Deliberação n.º 7/2025
+Considerando o disposto no artigo 3.º do Decreto Legislativo Regional n.º 5/2024/M, de 2 de abril,
+determina-se o seguinte, com efeitos a partir da data da sua publicação no Jornal Oficial.
+Funchal, 3 de março de 2025. — O Secretário Regional, João Silva.
+"""
+
+
+def load_lines(paths: List[str]) -> List[str]:
+    if not paths:
+        return [ln.strip() for ln in SAMPLE.splitlines() if ln.strip()]
+    lines: List[str] = []
+    for p in paths:
+        text = Path(p).read_text(encoding="utf-8", errors="ignore")
+        lines.extend(ln.strip() for ln in text.splitlines() if ln.strip())
+    return lines
+
+
+def bench_profile(profile: str, lines: List[str], repeat: int) -> Dict[str, object]:
+    t0 = time.perf_counter()
+    gnlp = GazetteNLP(profile=profile)
+    load_s = time.perf_counter() - t0
+
+    per_line: List[float] = []
+    for _ in range(repeat):
+        for ln in lines:
+            t = time.perf_counter()
+            gnlp.nlp(ln)
+            per_line.append(time.perf_counter() - t)
+
+    t = time.perf_counter()
+    for _ in range(repeat):
+        for _doc in gnlp.nlp.pipe(lines, batch_size=256):
+            pass
+    pipe_s = time.perf_counter() - t
+
+    per_line.sort()
+    return {
+        "profile": profile,
+        "pipes": gnlp.nlp.pipe_names,
+        "load_s": round(load_s, 3),
+        "lines": len(lines),
+        "line_mean_us": round(statistics.fmean(per_line) * 1e6, 1),
+        "line_p50_us": round(per_line[len(per_line) // 2] * 1e6, 1),
+        "line_p95_us": round(per_line[int(len(per_line) * 0.95)] * 1e6, 1),
+        "pipe_lines_per_s": round(len(lines) * repeat / pipe_s) if pipe_s else None,
+    }
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("--text", nargs="*", default=[], help="completo.txt files to take lines from")
+    ap.add_argument("--profiles", nargs="*", default=list(NLP_PROFILES), choices=list(NLP_PROFILES))
+    ap.add_argument("--repeat", type=int, default=3)
+    ap.add_argument("--json", action="store_true", help="print one JSON object per profile")
+    args = ap.parse_args()
+
+    lines = load_lines(args.text)
+    print(f"spaCy {spacy.__version__}, {len(lines)} lines x {args.repeat}")
+    for profile in args.profiles:
+        r = bench_profile(profile, lines, args.repeat)
+        if args.json:
+            print(json.dumps(r, ensure_ascii=False))
+            continue
+        print(f"{r['profile']:>6}: load {r['load_s']:.3f}s | per line mean {r['line_mean_us']}us "
+              f"p50 {r['line_p50_us']}us p95 {r['line_p95_us']}us | nlp.pipe {r['pipe_lines_per_s']} lines/s "
+              f"| pipes={r['pipes']}")
+
+
+if __name__ == "__main__":
+    main()
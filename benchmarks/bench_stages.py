@@ -0,0 +1,199 @@
+# benchmarks/bench_stages.py
+"""
+Per-stage timings and peak memory of Pipeline.process_pdf_bytes over synthetic gazettes
+(benchmarks/synth_gazette.py), with a regression check against a saved run.
+
+    python -m benchmarks.bench_stages [--scenarios small medium ...] [--repeat 5] [--out run.json]
+    python -m benchmarks.bench_stages --baseline base.json [--threshold 0.2] [--mem-threshold 0.15]
+
+Stages are the ones StageTimings reports (text_extraction = TextExtractor incl. OCR, line_index =
+spaCy classification, sumario = SumarioParser, slicing = BodySlicer, link_or_build = Linker +
+DocFactory). Result/OCR caches are off and the line memo is cleared before every run, so each run
+processes the PDF from scratch; times are medians over --repeat runs after one warm-up. Peak
+memory comes from a separate tracemalloc run (Python allocations only, not MuPDF's buffers).
+
+With --baseline, a metric regresses when it is more than threshold slower/larger than the
+baseline AND by more than --min-delta-ms (noise floor for tiny stages); the exit code is then 1.
+Scenarios needing OCR are skipped when no OCR engine is available. Baselines are machine
+specific: make one on the machine that will run the comparison (e.g. CI), don't commit it.
+"""
+from __future__ import annotations
+import argparse
+import json
+import platform
+import statistics
+import sys
+import time
+import tracemalloc
+from dataclasses import asdict
+from typing import Any, Dict, List, Optional
+
+import fitz  # PyMuPDF
+import spacy
+
+from pdf_extractor import __version__
+from pdf_extractor.config import Config
+from pdf_extractor.services.metrics import StageTimings
+from pdf_extractor.services.ocr_backend import get_ocr_backend
+from pdf_extractor.services.orchestrator import Pipeline
+
+from .synth_gazette import SCENARIOS, make_gazette
+
+STAGES = ("text_extraction", "line_index", "sumario", "slicing", "link_or_build")
+
+
+def _run(pipe: Pipeline, pdf: bytes, name: str) -> StageTimings:
+    pipe.gnlp.clear_memo()
+    t = StageTimings()
+    t0 = time.perf_counter()
+    pipe.process_pdf_bytes(pdf, pdf_name=f"{name}.pdf", timings=t)
+    t.add("total", time.perf_counter() - t0)
+    return t
+
+
+def bench_scenario(pipe: Pipeline, name: str, repeat: int) -> Dict[str, Any]:
+    spec = SCENARIOS[name]
+    pdf = make_gazette(spec)
+    first = _run(pipe, pdf, name)  # warm-up (imports, first OCR engine, page 2 heuristics...)
+    runs = [_run(pipe, pdf, name) for _ in range(max(1, repeat))]
+
+    tracemalloc.start()
+    try:
+        tracemalloc.reset_peak()
+        _run(pipe, pdf, name)
+        _current, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    def median(stage: str) -> float:
+        return statistics.median(r.stages.get(stage, 0.0) for r in runs)
+
+    return {
+        "spec": asdict(spec),
+        "pdf_bytes": len(pdf),
+        "pages": first.pages,
+        "ocr_pages": first.ocr_pages,
+        "docs": first.docs,
+        "links": first.links,
+        "runs": len(runs),
+        "total_s": round(median("total"), 6),
+        "total_min_s": round(min(r.stages["total"] for r in runs), 6),
+        "stages_s": {s: round(median(s), 6) for s in STAGES},
+        "ocr_s": round(statistics.median(r.ocr_s for r in runs), 6),
+        "peak_py_mb": round(peak / (1024 * 1024), 3),
+    }
+
+
+def run_all(scenarios: List[str], repeat: int, cfg: Config) -> Dict[str, Any]:
+    ocr_ok = get_ocr_backend(cfg.ocr_backend, cfg.ocr_lang, cfg.ocr_engines).version() != "unknown"
+    pipe = Pipeline(cfg)
+    out: Dict[str, Any] = {
+        "meta": {
+            "pdf_extractor": __version__,
+            "pipeline_version": pipe.version,
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "pymupdf": fitz.VersionBind,
+            "spacy": spacy.__version__,
+            "ocr": ocr_ok,
+            "repeat": repeat,
+            "created": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        },
+        "scenarios": {},
+        "skipped": [],
+    }
+    for name in scenarios:
+        if SCENARIOS[name].scanned > 0 and not ocr_ok:
+            out["skipped"].append(name)
+            continue
+        out["scenarios"][name] = bench_scenario(pipe, name, repeat)
+    return out
+
+
+def compare(current: Dict[str, Any], baseline: Dict[str, Any], threshold: float, mem_threshold: float,
+            min_delta_s: float) -> List[Dict[str, Any]]:
+    """One row per (scenario, metric) present in both runs; status is ok | regression | improved | changed."""
+    rows: List[Dict[str, Any]] = []
+    for name, cur in current["scenarios"].items():
+        base = baseline.get("scenarios", {}).get(name)
+        if base is None:
+            continue
+        if cur["docs"] != base["docs"] or cur["pages"] != base["pages"]:
+            # different output: timings are not comparable as such (generator or pipeline changed)
+            rows.append({"scenario": name, "metric": "docs/pages", "base": [base["docs"], base["pages"]],
+                         "new": [cur["docs"], cur["pages"]], "ratio": None, "status": "changed"})
+        metrics = [("total_s", cur["total_s"], base["total_s"], threshold, min_delta_s)]
+        metrics += [(f"stages_s.{s}", cur["stages_s"].get(s, 0.0), base.get("stages_s", {}).get(s), threshold,
+                     min_delta_s) for s in STAGES]
+        metrics.append(("peak_py_mb", cur["peak_py_mb"], base.get("peak_py_mb"), mem_threshold, 0.5))
+        for metric, new, old, limit, floor in metrics:
+            if old is None:
+                continue
+            ratio = (new / old) if old else None
+            status = "ok"
+            if new - old > floor and (old == 0 or new > old * (1 + limit)):
+                status = "regression"
+            elif old - new > floor and new < old * (1 - limit):
+                status = "improved"
+            rows.append({"scenario": name, "metric": metric, "base": old, "new": new,
+                         "ratio": round(ratio, 3) if ratio is not None else None, "status": status})
+    return rows
+
+
+def _print_run(r: Dict[str, Any]) -> None:
+    print(f"pdf_extractor {r['meta']['pdf_extractor']} ({r['meta']['pipeline_version']}), "
+          f"python {r['meta']['python']}, OCR {'on' if r['meta']['ocr'] else 'off'}")
+    for name, s in r["scenarios"].items():
+        stages = " ".join(f"{k}={v * 1000:.1f}" for k, v in s["stages_s"].items())
+        print(f"{name:>8}: {s['pages']:>3}p ({s['ocr_pages']} OCR) {s['docs']:>3} docs | "
+              f"total {s['total_s'] * 1000:.1f}ms | {stages} (ms) | peak {s['peak_py_mb']} MB")
+    if r["skipped"]:
+        print(f"skipped (no OCR engine): {', '.join(r['skipped'])}")
+
+
+def _print_compare(rows: List[Dict[str, Any]]) -> None:
+    for row in rows:
+        if row["status"] == "ok":
+            continue
+        print(f"{row['status'].upper():>10}: {row['scenario']} {row['metric']} {row['base']} -> {row['new']}"
+              + (f" (x{row['ratio']})" if row["ratio"] is not None else ""))
+    bad = sum(1 for row in rows if row["status"] == "regression")
+    print(f"{len(rows)} metrics compared, {bad} regression(s)")
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("--scenarios", nargs="*", default=list(SCENARIOS), choices=list(SCENARIOS))
+    ap.add_argument("--repeat", type=int, default=5)
+    ap.add_argument("--out", help="write the run as JSON (use it later as --baseline)")
+    ap.add_argument("--baseline", help="JSON from an earlier --out run to compare against")
+    ap.add_argument("--threshold", type=float, default=0.20, help="allowed slowdown (0.20 = 20%%)")
+    ap.add_argument("--mem-threshold", type=float, default=0.15, help="allowed peak memory growth")
+    ap.add_argument("--min-delta-ms", type=float, default=5.0, help="ignore time differences below this")
+    ap.add_argument("--json", action="store_true", help="print the run (and comparison) as JSON")
+    args = ap.parse_args(argv)
+
+    # same settings as the API minus caches (and without spawning OCR processes)
+    cfg = Config(dpi=300, ocr_adaptive=True, ignore_top_percent=0.10, skip_last_page=True)
+    result = run_all(args.scenarios, args.repeat, cfg)
+    rows: List[Dict[str, Any]] = []
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as f:
+            baseline = json.load(f)
+        rows = compare(result, baseline, args.threshold, args.mem_threshold, args.min_delta_ms / 1000)
+        result["comparison"] = {"baseline": args.baseline, "rows": rows}
+
+    if args.out:
+        with open(args.out, "w", encoding="utf-8") as f:
+            json.dump(result, f, indent=2, ensure_ascii=False)
+    if args.json:
+        print(json.dumps(result, ensure_ascii=False))
+    else:
+        _print_run(result)
+        if args.baseline:
+            _print_compare(rows)
+    return 1 if any(row["status"] == "regression" for row in rows) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
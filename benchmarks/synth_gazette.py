@@ -0,0 +1,216 @@
+# benchmarks/synth_gazette.py
+"""
+Synthetic gazette PDFs for benchmarks, built locally with PyMuPDF: a masthead in the ignored top
+band, a Sumário (org lines, act headers, one-line summaries), then the body (org headings, act
+headers, paragraphs, signatures) and a blank back page (skip_last_page).
+
+    python -m benchmarks.synth_gazette --out /tmp/gazettes [--scenarios small mixed ...]
+
+Knobs (GazetteSpec): body page count (a minimum), fraction of scanned pages (rendered to an
+image, so they go through OCR), a two-column page 2, Sumário size and act density (paragraph
+lines per act).
+The same spec and seed always give the same bytes.
+"""
+from __future__ import annotations
+import argparse
+import random
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Dict, List, Tuple
+
+import fitz  # PyMuPDF
+
+ORGS = [
+    "PRESIDÊNCIA DO GOVERNO REGIONAL",
+    "SECRETARIA REGIONAL DE EDUCAÇÃO, CIÊNCIA E TECNOLOGIA",
+    "SECRETARIA REGIONAL DE SAÚDE E PROTEÇÃO CIVIL",
+    "SECRETARIA REGIONAL DE FINANÇAS",
+    "SECRETARIA REGIONAL DE AGRICULTURA, PESCAS E AMBIENTE",
+    "CÂMARA MUNICIPAL DO FUNCHAL",
+    "CÂMARA MUNICIPAL DE SANTA CRUZ",
+    "ASSEMBLEIA LEGISLATIVA DA REGIÃO AUTÓNOMA DA MADEIRA",
+]
+# tipos the gazette_ruler tags as written (its patterns are the unaccented ALLOWED_TIPOS)
+TIPOS = ["Despacho", "Aviso", "Edital", "Contrato"]
+WORDS = (
+    "considerando o disposto no artigo da lei regional nos termos do procedimento concursal comum "
+    "para a constituição de relação jurídica de emprego público por tempo indeterminado determina-se "
+    "que seja publicado com efeitos a partir da data da sua publicação no jornal oficial da região "
+    "autorizo a nomeação em regime de substituição do técnico superior da carreira geral"
+).split()
+# no one-letter capitals ("O Secretário..."): ORG_HEAD would take the line for an org heading
+SIGNERS = ["Secretário Regional, João Silva.", "Diretora Regional, Maria Sousa.", "Presidente, Rui Gomes."]
+
+PAGE_W, PAGE_H = 595, 842  # A4 points
+MARGIN_X, TOP, BOTTOM = 50, 110, 800  # TOP is below the 10% band the pipeline ignores
+LINE_H = 14
+FONT_SIZE = 10
+COL_GAP, COL_FONT_SIZE, COL_LINE_H = 20, 7, 10  # two-column page
+COL_W = (PAGE_W - 2 * MARGIN_X - COL_GAP) / 2
+
+
+@dataclass(slots=True)
+class GazetteSpec:
+    body_pages: int = 4                # pages after the Sumário (more when the acts don't fit)
+    sumario_items: int = 8             # acts listed in the Sumário (and present in the body)
+    act_lines: int = 12                # paragraph lines per act: lower = denser pages
+    scanned: float = 0.0               # fraction of pages rendered as images (OCR)
+    two_column_page2: bool = False     # first body page in two columns (page 2 with a one-page Sumário)
+    scan_dpi: int = 150
+    seed: int = 0
+
+
+# name -> spec; the bench runs these by default
+SCENARIOS: Dict[str, GazetteSpec] = {
+    "small": GazetteSpec(body_pages=2, sumario_items=6, act_lines=8),
+    "medium": GazetteSpec(body_pages=20, sumario_items=40, act_lines=14, two_column_page2=True),
+    "large": GazetteSpec(body_pages=100, sumario_items=160, act_lines=18, two_column_page2=True),
+    "dense": GazetteSpec(body_pages=20, sumario_items=120, act_lines=3),
+    "mixed": GazetteSpec(body_pages=8, sumario_items=16, act_lines=12, scanned=0.5, two_column_page2=True),
+    "scanned": GazetteSpec(body_pages=4, sumario_items=8, act_lines=10, scanned=1.0),
+}
+
+
+def _acts(spec: GazetteSpec, rnd: random.Random) -> List[Tuple[str, str, str]]:
+    """
+    (org, header, summary) in publication order. Each org appears once, with all its acts: the
+    Sumário ends where its first org heading comes back (start of the body).
+    """
+    orgs = rnd.sample(ORGS, len(ORGS))
+    acts: List[Tuple[int, str, str]] = []
+    numbers: Dict[str, int] = {}
+    for _ in range(spec.sumario_items):
+        tipo = rnd.choice(TIPOS)
+        numbers[tipo] = numbers.get(tipo, rnd.randint(1, 400)) + rnd.randint(1, 3)
+        acts.append((rnd.randrange(len(orgs)), f"{tipo} n.º {numbers[tipo]}/2025", _sentence(rnd, 8, 14)))
+    acts.sort(key=lambda a: a[0])  # stable: numbers stay increasing within an org
+    return [(orgs[k], header, summary) for k, header, summary in acts]
+
+
+def _sentence(rnd: random.Random, lo: int, hi: int) -> str:
+    first = rnd.choice([w for w in WORDS if len(w) > 2])  # see SIGNERS
+    rest = " ".join(rnd.choice(WORDS) for _ in range(rnd.randint(lo, hi) - 1))
+    return f"{first.capitalize()} {rest}."
+
+
+def _sumario_lines(acts: List[Tuple[str, str, str]]) -> List[str]:
+    lines = ["Sumário"]
+    prev = None
+    for org, header, summary in acts:
+        if org != prev:
+            lines.append(org)
+            prev = org
+        lines.extend([header, summary])
+    return lines
+
+
+def _body_lines(acts: List[Tuple[str, str, str]], spec: GazetteSpec, rnd: random.Random) -> List[str]:
+    lines: List[str] = []
+    prev = None
+    for org, header, _summary in acts:
+        if org != prev:
+            lines.append(org)
+            prev = org
+        lines.append(header)
+        lines.extend(_sentence(rnd, 9, 13) for _ in range(spec.act_lines))
+        lines.append(f"Funchal, {rnd.randint(1, 28)} de março de 2025. — {rnd.choice(SIGNERS)}")
+    return lines
+
+
+def _wrap(line: str) -> List[str]:
+    """Greedy word wrap to the column width (org names and act headers fit on one line)."""
+    out: List[str] = []
+    cur = ""
+    for w in line.split():
+        nxt = f"{cur} {w}" if cur else w
+        if cur and fitz.get_text_length(nxt, fontsize=COL_FONT_SIZE) > COL_W:
+            out.append(cur)
+            nxt = w
+        cur = nxt
+    return out + [cur] if cur else out
+
+
+def _write_page(doc: fitz.Document, lines: List[str]) -> None:
+    page = doc.new_page(width=PAGE_W, height=PAGE_H)
+    page.insert_text((MARGIN_X, 50), "JORNAL OFICIAL — Série", fontsize=FONT_SIZE)  # in the ignored band
+    y = TOP
+    for ln in lines:
+        page.insert_text((MARGIN_X, y), ln, fontsize=FONT_SIZE)
+        y += LINE_H
+
+
+def _write_columns(doc: fitz.Document, rows: List[str]) -> None:
+    page = doc.new_page(width=PAGE_W, height=PAGE_H)
+    page.insert_text((MARGIN_X, 50), "JORNAL OFICIAL — Série", fontsize=FONT_SIZE)
+    half = (len(rows) + 1) // 2
+    # right column first: content-stream order differs from reading order, like the real page 2
+    for x, col in ((MARGIN_X + COL_W + COL_GAP, rows[half:]), (MARGIN_X, rows[:half])):
+        y = TOP
+        for ln in col:
+            page.insert_text((x, y), ln, fontsize=COL_FONT_SIZE)
+            y += COL_LINE_H
+
+
+def _rasterize(doc: fitz.Document, indices: List[int], dpi: int) -> fitz.Document:
+    out = fitz.open()
+    for i, page in enumerate(doc):
+        if i in indices:
+            pix = page.get_pixmap(dpi=dpi, colorspace=fitz.csGRAY, alpha=False)
+            p = out.new_page(width=page.rect.width, height=page.rect.height)
+            p.insert_image(p.rect, pixmap=pix)
+        else:
+            out.insert_pdf(doc, from_page=i, to_page=i)
+    return out
+
+
+def make_gazette(spec: GazetteSpec) -> bytes:
+    rnd = random.Random(spec.seed)
+    acts = _acts(spec, rnd)
+    per_page = (BOTTOM - TOP) // LINE_H
+
+    doc = fitz.open()
+    sumario = _sumario_lines(acts)
+    for k in range(0, len(sumario), per_page):
+        _write_page(doc, sumario[k:k + per_page])
+
+    body = _body_lines(acts, spec, rnd)
+    per = max(1, min(per_page, -(-len(body) // max(1, spec.body_pages))))
+    col_rows = 2 * ((BOTTOM - TOP) // COL_LINE_H)
+    first_body = len(doc)
+    i = 0
+    while i < len(body):
+        if spec.two_column_page2 and len(doc) == first_body:
+            # as many lines as fit, wrapped into two columns
+            rows: List[str] = []
+            while i < len(body) and len(rows) + len(_wrap(body[i])) <= col_rows:
+                rows.extend(_wrap(body[i]))
+                i += 1
+            _write_columns(doc, rows)
+        else:
+            _write_page(doc, body[i:i + per])
+            i += per
+    doc.new_page(width=PAGE_W, height=PAGE_H)  # back cover: dropped by skip_last_page
+
+    n = len(doc) - 1
+    scanned = sorted(rnd.sample(range(n), round(n * spec.scanned))) if spec.scanned > 0 else []
+    if scanned:
+        doc = _rasterize(doc, scanned, spec.scan_dpi)
+    return doc.tobytes(garbage=3, deflate=True)
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("--out", required=True, help="directory for <scenario>.pdf")
+    ap.add_argument("--scenarios", nargs="*", default=list(SCENARIOS), choices=list(SCENARIOS))
+    args = ap.parse_args()
+
+    out = Path(args.out)
+    out.mkdir(parents=True, exist_ok=True)
+    for name in args.scenarios:
+        data = make_gazette(SCENARIOS[name])
+        (out / f"{name}.pdf").write_bytes(data)
+        print(f"{name}: {len(fitz.open(stream=data, filetype='pdf'))} pages, {len(data)} bytes, {asdict(SCENARIOS[name])}")
+
+
+if __name__ == "__main__":
+    main()
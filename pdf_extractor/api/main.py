@@ -1,30 +1,98 @@
 # api/main.py
 from __future__ import annotations
-from fastapi import FastAPI, UploadFile, File, HTTPException
-from fastapi.responses import JSONResponse
+from concurrent.futures import Future, ThreadPoolExecutor
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+from fastapi import FastAPI, UploadFile, File, Header, HTTPException, Query, Request
+from fastapi.responses import JSONResponse, Response, StreamingResponse
+import asyncio
+import json
 import logging
+import os
+import tempfile
+import time
+import zipfile
 
 import uvicorn
 
+from pdf_extractor import __version__
 from pdf_extractor.config import Config
+from pdf_extractor.io.job_store import JobStore
+from pdf_extractor.services.job_runner import JobRunner
+from pdf_extractor.services.metrics import CONTENT_TYPE, HTTP_SECONDS, REGISTRY, StageTimings, record
 from pdf_extractor.services.orchestrator import Pipeline
+from pdf_extractor.services.worker_pool import ExtractionPool, PoolFull, Reservation
 
-app = FastAPI(title="PDF Gazette Extractor", version="1.0.0")
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    if POOL is not None:
+        await asyncio.to_thread(POOL.start)  # pre-warm: every worker builds its Pipeline now
+    if JOB_RUNNER is not None:
+        JOB_RUNNER.start()
+    yield
+    if JOB_RUNNER is not None:
+        JOB_RUNNER.stop(timeout=30)
+    if POOL is not None:
+        POOL.stop()
+
+
+app = FastAPI(title="PDF Gazette Extractor", version=__version__, lifespan=lifespan)
 
 # Build long-lived components once (spaCy loads here)
 CFG = Config(
     input_root="output",
     output_root="extracted",
     dpi=300,                 # API-friendly default; OCR will still bump quality page-by-page
+    ocr_adaptive=True,       # ...by starting at ocr_low_dpi and re-rendering weak pages/blocks at dpi
     ocr_lang="por",
     ignore_top_percent=0.10,
     skip_last_page=True,
+    nlp_cache_dir="nlp_cache",  # prebuilt by `python -m pdf_extractor.cli.build_nlp`; rebuilt here if stale
+    result_cache_dir="result_cache",  # repeated uploads are answered from disk (workers share it)
+    job_dir="jobs",
+    profile_dir="profiles",  # X-Profile: 1 captures go here; set profile_sample_rate to also sample traffic
 )
 PIPE = Pipeline(CFG)
 
+# /extract, /extract/sumario, /extract/batch and /jobs run in worker processes, off the event loop
+POOL = ExtractionPool(CFG, workers=CFG.api_workers, max_pending=CFG.api_max_pending) if CFG.api_workers > 0 else None
+
+# /jobs: persistent queue + worker threads (started/stopped with the app)
+JOB_STORE = JobStore(CFG.job_dir) if CFG.job_dir else None
+JOB_RUNNER = (JobRunner(JOB_STORE, CFG, workers=CFG.job_workers, retry_delay_s=CFG.job_retry_delay_s, pool=POOL)
+              if JOB_STORE is not None else None)
+
+# /extract/batch without a pool (api_workers == 0): at most api_max_concurrency PDFs run at once
+# in these threads. Either way each batch keeps at most batch_max_parallel of its files in
+# flight, so other clients' files interleave. With the pool, a batch is admitted once (up front)
+# and its files run in the slots it reserved.
+BATCH_EXECUTOR = (ThreadPoolExecutor(max_workers=CFG.api_max_concurrency, thread_name_prefix="batch")
+                  if POOL is None else None)
+
+@app.middleware("http")
+async def server_timing(request: Request, call_next):
+    """Request latency histogram + `total` entry appended to the endpoint's Server-Timing."""
+    t0 = time.perf_counter()
+    response = await call_next(request)
+    elapsed = time.perf_counter() - t0
+    route = request.scope.get("route")
+    HTTP_SECONDS.observe(elapsed, method=request.method, route=getattr(route, "path", "unmatched"),
+                         status=str(response.status_code))
+    total = f"total;dur={elapsed * 1000:.1f}"
+    stages = response.headers.get("Server-Timing")
+    response.headers["Server-Timing"] = f"{stages}, {total}" if stages else total
+    return response
+
+NDJSON = "application/x-ndjson"
+
 @app.post("/extract")
 async def extract_pdf(
-    pdf: UploadFile = File(...)):
+    pdf: UploadFile = File(...),
+    stream: bool = Query(False, description="one JSON line per doc, then a trailer line (also: Accept: application/x-ndjson)"),
+    if_none_match: Optional[str] = Header(None),
+    accept: Optional[str] = Header(None),
+    x_profile: Optional[str] = Header(None)):
 
     if not pdf.filename.lower().endswith(".pdf"):
         raise HTTPException(status_code=400, detail="File must be a PDF")
@@ -32,13 +100,43 @@ async def extract_pdf(
     try:
         content = await pdf.read()
 
-        # run the pipeline (no date, no diagnostics)
-        bundle = PIPE.process_pdf_bytes(content, pdf_name=pdf.filename, publication_date=None)
+        # ETag = content address of (bytes, name, date, pipeline version): same tag, same docs
+        key = PIPE.result_key(content, pdf_name=pdf.filename, publication_date=None)
+        etag = f'"{key}"'
+        if _etag_matches(if_none_match, etag):
+            return Response(status_code=304, headers={"ETag": etag})
+
+        # X-Profile: 1 -> cProfile capture of this extraction (when CFG.profile_dir is set); the
+        # capture id comes back in X-Profile-Id. A profiled request is answered as plain JSON.
+        profile = PIPE.profiles is not None and (x_profile or "").lower() in ("1", "true", "yes")
+
+        timings = StageTimings()
+        t0 = time.perf_counter()
+        bundle = PIPE.result_cache.get(key) if PIPE.result_cache is not None and not profile else None
+        cache_state = "hit" if bundle is not None else ("bypass" if profile else "miss")
+        if bundle is not None:
+            timings.add("result_cache", time.perf_counter() - t0)
+            timings.cache, timings.docs = "hit", len(bundle.get("docs", []))
+            record(timings)
+
+        if not profile and (stream or NDJSON in (accept or "")):
+            return await _stream_docs(content, pdf.filename, bundle, timings,
+                                      headers={"ETag": etag, "X-Cache": cache_state})
 
+        if bundle is None:
+            # run the pipeline (no date, no diagnostics); the worker stores the result in the cache
+            bundle = await _run_pipeline("process_pdf_bytes", content, pdf_name=pdf.filename, publication_date=None,
+                                         timings=timings, profile=profile)
+
+        headers = {"ETag": etag, "X-Cache": cache_state, "Server-Timing": timings.server_timing()}
+        if timings.profile:
+            headers["X-Profile-Id"] = timings.profile
         # return ONLY docs; omit notes/source_path/etc.
-        return JSONResponse(content={"docs": bundle.get("docs", [])})
+        return JSONResponse(content={"docs": bundle.get("docs", [])}, headers=headers)
 
       
+    except HTTPException:
+        raise
     except ValueError as e:
         # bad input (corrupt pdf, etc.)
         logging.exception("Bad request during extraction")
@@ -48,6 +146,286 @@ async def extract_pdf(
         logging.exception("Extraction failed")
         raise HTTPException(status_code=500, detail=f"Extraction failed: {e.__class__.__name__}: {e}")
 
+@app.post("/extract/sumario")
+async def extract_sumario(
+    pdf: UploadFile = File(...)):
+    """Quick scan: only the Sumário items (with their orgs); stops extracting once the block is closed."""
+
+    if not pdf.filename.lower().endswith(".pdf"):
+        raise HTTPException(status_code=400, detail="File must be a PDF")
+
+    try:
+        content = await pdf.read()
+        timings = StageTimings()
+        result = await _run_pipeline("scan_sumario", content, pdf_name=pdf.filename, timings=timings)
+        return JSONResponse(content={"items": result["items"], "pages_scanned": result["pages_scanned"]},
+                            headers={"Server-Timing": timings.server_timing()})
+
+    except HTTPException:
+        raise
+    except ValueError as e:
+        logging.exception("Bad request during sumario scan")
+        raise HTTPException(status_code=400, detail=f"Bad request: {e.__class__.__name__}: {e}")
+    except Exception as e:
+        logging.exception("Sumario scan failed")
+        raise HTTPException(status_code=500, detail=f"Sumario scan failed: {e.__class__.__name__}: {e}")
+
+def _etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    if not if_none_match:
+        return False
+    tags = [t.strip() for t in if_none_match.split(",")]
+    return any(t.removeprefix("W/") == etag for t in tags)
+
+async def _stream_docs(content: bytes, pdf_name: str, bundle: Optional[Dict[str, Any]],
+                       timings: StageTimings, headers: Dict[str, str]) -> StreamingResponse:
+    """
+    NDJSON /extract: each doc is sent as soon as it is built (in a pool worker, which spools the
+    lines to a temp file that is tailed here), then {"trailer": {...}}. Errors after the first byte
+    can't change the status code any more: they end the stream with an {"error", "status"} line.
+    """
+    if bundle is not None:
+        trailer = {"trailer": {"pdf_name": pdf_name, "notes": bundle.get("notes", []), "docs": timings.docs}}
+        return StreamingResponse(_ndjson(bundle.get("docs", []) + [trailer]), media_type=NDJSON, headers=headers)
+
+    if POOL is None:
+        # sync iterator: StreamingResponse pulls it in the threadpool
+        docs = PIPE.iter_docs(content, pdf_name=pdf_name, publication_date=None, timings=timings)
+        return StreamingResponse(_ndjson(docs, timings), media_type=NDJSON, headers=headers)
+
+    fd, path = tempfile.mkstemp(prefix="extract-", suffix=".ndjson")
+    os.close(fd)
+    try:
+        fut = POOL.submit_ndjson(path, "iter_docs", content, pdf_name=pdf_name, publication_date=None,
+                                 timings=timings)
+    except PoolFull:
+        os.unlink(path)
+        raise HTTPException(status_code=503, detail="Server busy, retry later",
+                            headers={"Retry-After": str(CFG.api_retry_after_s)})
+    return StreamingResponse(_tail_ndjson(path, fut, timings), media_type=NDJSON, headers=headers)
+
+def _ndjson(records: Iterable[Dict[str, Any]], timings: Optional[StageTimings] = None) -> Iterator[bytes]:
+    try:
+        for obj in records:
+            yield json.dumps(obj, ensure_ascii=False).encode("utf-8") + b"\n"
+    except Exception as e:
+        logging.exception("Streaming extraction failed")
+        yield _error_line(e)
+        return
+    if timings is not None:
+        record(timings)
+
+async def _tail_ndjson(path: str, fut: Future, timings: StageTimings) -> AsyncIterator[bytes]:
+    try:
+        with open(path, "rb") as f:
+            while True:
+                done = fut.done()  # checked before reading: nothing is written after it turns True
+                chunk = f.read(1 << 16)
+                if chunk:
+                    yield chunk
+                elif done:
+                    break
+                else:
+                    await asyncio.sleep(0.05)
+        e = fut.exception()
+        if e is not None:
+            logging.error(f"Streaming extraction failed: {e.__class__.__name__}: {e}")
+            yield _error_line(e)
+        else:
+            timings.update(fut.result())
+            record(timings)
+    finally:
+        fut.cancel()  # client went away before the worker started: don't run it
+        os.unlink(path)
+
+def _error_line(e: BaseException) -> bytes:
+    if isinstance(e, ValueError):
+        err = {"status": 400, "error": f"Bad request: {e.__class__.__name__}: {e}"}
+    else:
+        err = {"status": 500, "error": f"Extraction failed: {e.__class__.__name__}: {e}"}
+    return json.dumps(err, ensure_ascii=False).encode("utf-8") + b"\n"
+
+async def _run_pipeline(method: str, *args, timings: Optional[StageTimings] = None,
+                        reservation: Optional[Reservation] = None, **kwargs):
+    """
+    Pipeline.<method> in the process pool (503 + Retry-After when its queue is full), or in the
+    slots of a reservation (never full). timings is filled in (from the worker's copy) and
+    recorded for /metrics.
+    """
+    if timings is not None:
+        kwargs["timings"] = timings
+    if POOL is None:
+        result = await asyncio.to_thread(getattr(PIPE, method), *args, **kwargs)
+    else:
+        try:
+            fut = (reservation or POOL).submit(method, *args, **kwargs)
+        except PoolFull:
+            raise HTTPException(status_code=503, detail="Server busy, retry later",
+                                headers={"Retry-After": str(CFG.api_retry_after_s)})
+        result = await asyncio.wrap_future(fut)
+        if timings is not None:
+            result, done = result
+            timings.update(done)
+    if timings is not None:
+        record(timings)
+    return result
+
+@app.get("/health")
+async def health():
+    return {"status": "ok", "inflight": POOL.inflight if POOL is not None else None}
+
+@app.get("/metrics")
+async def metrics():
+    """Prometheus text format: per-stage histograms, page/OCR/doc/link counters, request latency."""
+    return Response(content=REGISTRY.render(), media_type=CONTENT_TYPE)
+
+@app.post("/extract/batch")
+async def extract_batch(
+    pdfs: Optional[List[UploadFile]] = File(None),
+    archive: Optional[UploadFile] = File(None)):
+    """
+    Many PDFs per request: repeated `pdfs` parts and/or one zip `archive` (its *.pdf entries).
+    Returns per-file results keyed by filename; a failing file does not fail the batch.
+    """
+    files: List[Tuple[str, Optional[Callable[[], bytes]]]] = []  # (name, reader); None -> not a PDF
+    total = 0
+    for pdf in pdfs or []:
+        pdf.file.seek(0, 2)
+        total += pdf.file.tell()
+        pdf.file.seek(0)
+        is_pdf = (pdf.filename or "").lower().endswith(".pdf")
+        files.append((pdf.filename or "upload.pdf", pdf.file.read if is_pdf else None))
+
+    zf: Optional[zipfile.ZipFile] = None
+    if archive is not None:
+        try:
+            zf = zipfile.ZipFile(archive.file)
+        except zipfile.BadZipFile as e:
+            raise HTTPException(status_code=400, detail=f"Bad request: BadZipFile: {e}")
+        for info in zf.infolist():
+            if info.is_dir() or info.filename.startswith("__MACOSX/"):
+                continue
+            total += info.file_size
+            is_pdf = info.filename.lower().endswith(".pdf")
+            files.append((info.filename, (lambda name=info.filename: zf.read(name)) if is_pdf else None))
+
+    if not files:
+        raise HTTPException(status_code=400, detail="No files (send `pdfs` parts or a zip `archive`)")
+    if len(files) > CFG.batch_max_files:
+        raise HTTPException(status_code=400, detail=f"Too many files: {len(files)} > {CFG.batch_max_files}")
+    if total > CFG.batch_max_mb * 1024 * 1024:
+        raise HTTPException(status_code=413, detail=f"Batch too large: {total} bytes > {CFG.batch_max_mb} MB")
+
+    loop = asyncio.get_running_loop()
+    parallel = max(1, CFG.batch_max_parallel)
+    reservation: Optional[Reservation] = None
+    n_pdfs = sum(1 for _name, read in files if read is not None)
+    if POOL is not None and n_pdfs:
+        # admit the whole batch now (one 503 for the request), not file by file as slots run out
+        try:
+            reservation = POOL.reserve(min(parallel, n_pdfs))
+        except PoolFull:
+            if zf is not None:
+                zf.close()
+            raise HTTPException(status_code=503, detail="Server busy, retry later",
+                                headers={"Retry-After": str(CFG.api_retry_after_s)})
+        parallel = reservation.slots
+    slots = asyncio.Semaphore(parallel)
+
+    async def run(name: str, read: Optional[Callable[[], bytes]]) -> Dict[str, Any]:
+        if read is None:
+            return {"status": 400, "error": "File must be a PDF"}
+        async with slots:
+            if reservation is None:
+                return await loop.run_in_executor(BATCH_EXECUTOR, _extract_one, name, read)
+            return await _extract_one_pooled(name, read, reservation)
+
+    try:
+        outcomes = await asyncio.gather(*(run(name, read) for name, read in files))
+    finally:
+        if reservation is not None:
+            reservation.release()
+        if zf is not None:
+            zf.close()
+
+    results: Dict[str, Dict[str, Any]] = {}
+    for (name, _read), outcome in zip(files, outcomes):
+        key, n = name, 1
+        while key in results:  # same filename twice (e.g. in different zip folders)
+            n += 1
+            key = f"{name} ({n})"
+        results[key] = outcome
+    failed = sum(1 for r in outcomes if "error" in r)
+    return JSONResponse(content={"results": results, "ok": len(outcomes) - failed, "failed": failed})
+
+
+def _extract_one(name: str, read: Callable[[], bytes]) -> Dict[str, Any]:
+    """One batch entry in this process (no pool), with /extract's error mapping folded into the result."""
+    timings = StageTimings()
+    try:
+        bundle = PIPE.process_pdf_bytes(read(), pdf_name=name.rsplit("/", 1)[-1], publication_date=None,
+                                        timings=timings)
+        record(timings)
+        return {"status": 200, "docs": bundle.get("docs", [])}
+    except Exception as e:
+        return _batch_error(name, e)
+
+async def _extract_one_pooled(name: str, read: Callable[[], bytes], reservation: Reservation) -> Dict[str, Any]:
+    """One batch entry in the process pool, in one of the batch's reserved slots."""
+    try:
+        content = await asyncio.to_thread(read)  # zip entries are inflated here
+        bundle = await _run_pipeline("process_pdf_bytes", content, pdf_name=name.rsplit("/", 1)[-1],
+                                     publication_date=None, timings=StageTimings(), reservation=reservation)
+        return {"status": 200, "docs": bundle.get("docs", [])}
+    except Exception as e:
+        return _batch_error(name, e)
+
+def _batch_error(name: str, e: Exception) -> Dict[str, Any]:
+    if isinstance(e, ValueError):
+        logging.exception(f"Bad request during batch extraction: {name}")
+        return {"status": 400, "error": f"Bad request: {e.__class__.__name__}: {e}"}
+    logging.exception(f"Batch extraction failed: {name}")
+    return {"status": 500, "error": f"Extraction failed: {e.__class__.__name__}: {e}"}
+
+@app.post("/jobs", status_code=202)
+async def create_job(
+    pdf: UploadFile = File(...)):
+    """Queue a PDF for extraction; poll GET /jobs/{id}, then fetch GET /jobs/{id}/result."""
+
+    if JOB_STORE is None:
+        raise HTTPException(status_code=503, detail="Job queue disabled")
+    if not pdf.filename.lower().endswith(".pdf"):
+        raise HTTPException(status_code=400, detail="File must be a PDF")
+
+    content = await pdf.read()
+    # sqlite insert + input file write: off the event loop
+    job_id = await asyncio.to_thread(JOB_STORE.create, pdf.filename, content, max_attempts=CFG.job_max_attempts)
+    JOB_RUNNER.notify()
+    return {"id": job_id, "status": "queued"}
+
+@app.get("/jobs/{job_id}")
+async def get_job(job_id: str):
+    if JOB_STORE is None:
+        raise HTTPException(status_code=503, detail="Job queue disabled")
+    job = JOB_STORE.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Unknown job")
+    return job.to_json()
+
+@app.get("/jobs/{job_id}/result")
+async def get_job_result(job_id: str):
+    if JOB_STORE is None:
+        raise HTTPException(status_code=503, detail="Job queue disabled")
+    job = JOB_STORE.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Unknown job")
+    if job.status == "failed":
+        raise HTTPException(status_code=500, detail=f"Extraction failed: {job.error}")
+    if job.status != "done":
+        raise HTTPException(status_code=409, detail=f"Job is {job.status}")
+    bundle = JOB_STORE.result(job_id) or {}
+    # same shape as /extract
+    return JSONResponse(content={"docs": bundle.get("docs", [])})
+
 if __name__ == "__main__":
     uvicorn.run("api.main:app", host="0.0.0.0", port=8000, reload=True)
     
@@ -0,0 +1,49 @@
+# pdf_extractor/cli/check_fast_path.py
+"""
+Differential check of the GazetteNLP fast path against spaCy over a corpus:
+
+    python -m pdf_extractor.cli.check_fast_path --input-root output [--limit 50]
+
+Every non-empty line of <input-root>/*/completo.txt goes through spaCy; a line the fast path
+would skip must come back with no DOC_TYPE and no SUM_ORG_LINE. Exits 1 on any disagreement.
+"""
+from __future__ import annotations
+import argparse
+import sys
+from pathlib import Path
+
+from ..config import Config
+from ..services.gazette_nlp import GazetteNLP
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--input-root", default="output")
+    ap.add_argument("--nlp-profile", default="rules", choices=["rules", "full"])
+    ap.add_argument("--limit", type=int, default=20, help="mismatching lines to print")
+    args = ap.parse_args()
+
+    cfg = Config(input_root=args.input_root, nlp_profile=args.nlp_profile)
+    gnlp = GazetteNLP(profile=cfg.nlp_profile)
+
+    total = skipped = 0
+    mismatches = []
+    for stem in sorted(p for p in Path(cfg.input_root).iterdir() if p.is_dir()):
+        completo = stem / "completo.txt"
+        if not completo.exists():
+            continue
+        lines = [ln for ln in completo.read_text(encoding="utf-8", errors="ignore").splitlines() if ln.strip()]
+        s, bad = gnlp.verify_fast_path(lines)
+        total += len(lines)
+        skipped += s
+        mismatches.extend((stem.name, ln) for ln in bad)
+
+    rate = (skipped / total) if total else 0.0
+    print(f"lines={total} skipped_by_fast_path={skipped} ({rate:.1%}) mismatches={len(mismatches)}")
+    for name, ln in mismatches[:args.limit]:
+        print(f"  [{name}] {ln[:120]}")
+    sys.exit(1 if mismatches else 0)
+
+
+if __name__ == "__main__":
+    main()
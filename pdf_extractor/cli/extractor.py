@@ -1,70 +1,408 @@
-# pdf_extractor/cli/extract.py  (replace main() body with this flow)
+# pdf_extractor/cli/extractor.py
 from __future__ import annotations
 import argparse
+import os
+import shutil
+import signal
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
 from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Tuple
 from ..config import Config
 from ..domain.bundle import PdfBundle
-from ..io.repository import save_bundle
+from ..io.manifest import InputHash, Manifest
+from ..io.repository import bundle_complete, save_bundle
 from ..io.validators import validate_bundle
-from ..services.gazette_nlp import GazetteNLP
-from ..services.sumario import SumarioParser
-from ..services.slicer import BodySlicer
-from ..services.linker import Linker
-from ..services.factory import DocFactory
+from ..services.line_index import LineIndex
+from ..services.metrics import StageTimings
+from ..services.orchestrator import Pipeline, pipeline_version, stems_version
+
+MANIFEST_SAVE_EVERY = 50  # stems; the manifest is also saved at the end (and on Ctrl+C)
 
 def main():
     ap = argparse.ArgumentParser()
     ap.add_argument("--input-root", default="output")
     ap.add_argument("--output-root", default="extracted")
+    ap.add_argument("--pdf-dir", default=None,
+                    help="process the *.pdf in this folder (TextExtractor included) instead of --input-root stems")
+    ap.add_argument("--watch", action="store_true",
+                    help="with --pdf-dir: keep polling it and move each processed PDF to --done-dir/--failed-dir")
+    ap.add_argument("--poll-s", type=float, default=2.0, help="--watch polling interval")
+    ap.add_argument("--done-dir", default=None, help="--watch: processed PDFs (default <pdf-dir>/done)")
+    ap.add_argument("--failed-dir", default=None, help="--watch: PDFs that failed (default <pdf-dir>/failed)")
+    ap.add_argument("--dpi", type=int, default=None, help="--pdf-dir: OCR resolution (default: Config.dpi)")
+    ap.add_argument("--ocr-cache-dir", default=None, help="--pdf-dir: on-disk OCR text cache")
+    ap.add_argument("--nlp-profile", default="rules", choices=["rules", "full"])
+    ap.add_argument("--nlp-cache-dir", default=None, help="serialized spaCy pipeline (see cli/build_nlp.py)")
+    ap.add_argument("--workers", type=int, default=1,
+                    help="stems processed in parallel, each worker with its own GazetteNLP (0 = one per CPU)")
+    ap.add_argument("--resume", action="store_true", help="skip stems whose bundle.json is already complete")
+    ap.add_argument("--force", action="store_true",
+                    help="rebuild stems the manifest says are unchanged (same input and pipeline)")
+    ap.add_argument("--profile", action="store_true", help="cProfile every stem into --profile-dir")
+    ap.add_argument("--profile-rate", type=float, default=0.0, help="...or only this fraction of stems")
+    ap.add_argument("--profile-dir", default="profiles")
     args = ap.parse_args()
+    if args.watch and not args.pdf_dir:
+        ap.error("--watch needs --pdf-dir")
 
-    cfg = Config(input_root=args.input_root, output_root=args.output_root)
+    cfg = Config(input_root=args.input_root, output_root=args.output_root, nlp_profile=args.nlp_profile,
+                 nlp_cache_dir=args.nlp_cache_dir, ocr_cache_dir=args.ocr_cache_dir,
+                 profile_dir=args.profile_dir if (args.profile or args.profile_rate > 0) else None,
+                 profile_sample_rate=args.profile_rate)
+    if args.dpi:
+        cfg.dpi = args.dpi
 
-    input_root = Path(cfg.input_root)
     out_root = Path(cfg.output_root)
     out_root.mkdir(parents=True, exist_ok=True)
+    workers = args.workers if args.workers > 0 else (os.cpu_count() or 1)
+
+    if args.watch:
+        _watch(Path(args.pdf_dir), cfg, args, workers)
+        return
+
+    if args.pdf_dir:
+        # <pdf-dir>/<stem>.pdf -> <output-root>/<stem>/
+        stems = _list_pdfs(Path(args.pdf_dir))
+    else:
+        input_root = Path(cfg.input_root)
+        stems = [p for p in sorted(input_root.iterdir()) if p.is_dir() and (p / "completo.txt").exists()]
+    todo = [p for p in stems if not (args.resume and bundle_complete(cfg.output_root, _stem_name(p)))]
+    if len(todo) < len(stems):
+        print(f"Resuming: {len(stems) - len(todo)} stem(s) already complete, {len(todo)} to go.")
+
+    # incremental: only stems whose input or pipeline changed since the manifest was written
+    manifest = Manifest(cfg.output_root)
+    fingerprint = pipeline_version(cfg) if args.pdf_dir else stems_version(cfg)
+    inputs: Dict[str, InputHash] = {}
+    reasons: Dict[str, int] = {}
+    changed: List[Path] = []
+    for p in todo:
+        name = _stem_name(p)
+        inputs[name] = manifest.input_hash(name, _input_path(p))
+        why = manifest.status(name, inputs[name].sha256, fingerprint)
+        if why == "unchanged" and not args.force:
+            continue
+        reasons[why] = reasons.get(why, 0) + 1
+        changed.append(p)
+    if len(changed) < len(todo):
+        print(f"Unchanged: {len(todo) - len(changed)} stem(s) skipped (same input, pipeline {fingerprint}).")
+    if reasons:
+        print(f"Rebuilding {len(changed)} stem(s): "
+              + ", ".join(f"{n} {_REASONS[why]}" for why, n in sorted(reasons.items())) + ".")
+    todo = changed
+
+    workers = max(1, min(workers, len(todo)))
+    progress = _Progress(len(todo), skipped=len(stems) - len(todo))
+    if todo:
+        pool = _Workers(cfg, args.profile, workers)
+        try:
+            for k, r in enumerate(pool.run(todo), start=1):
+                progress.done(r)
+                _update_manifest(manifest, r, inputs[r["stem"]], fingerprint)
+                if k % MANIFEST_SAVE_EVERY == 0:
+                    manifest.save()
+        except KeyboardInterrupt:
+            # finished stems are saved (and in the manifest); --resume continues from there
+            pool.close(cancel=True)
+            raise
+        finally:
+            manifest.save()
+        pool.close()
 
-    # Build spaCy-based helpers
-    gnlp = GazetteNLP()
-    sumario = SumarioParser(gnlp)
-    slicer = BodySlicer(gnlp)
-    linker = Linker()
-    factory = DocFactory()
+    progress.report(workers)
+    print(f"Processed {progress.processed} PDF stems.")
+    if progress.failed:
+        raise SystemExit(1)
 
-    processed = 0
-    for stem in sorted(p for p in input_root.iterdir() if p.is_dir()):
+
+class _StemRunner:
+    """
+    Per process: one warm Pipeline (spaCy helpers built once), then one stem at a time, validated
+    and saved here. A stem is a folder with completo.txt or a .pdf (full pipeline, OCR included).
+    """
+
+    def __init__(self, cfg: Config, force_profile: bool = False):
+        self.cfg = cfg
+        self.force_profile = force_profile
+        self.pipe = Pipeline(cfg)
+        self.parts = (self.pipe.gnlp, self.pipe.sumario, self.pipe.slicer, self.pipe.linker, self.pipe.factory)
+        self.profiles = self.pipe.profiles
+
+    def run(self, stem_path: str) -> Dict[str, Any]:
+        """Summary dict for the parent: stem, path, docs, issues, seconds, profile, or error."""
+        stem = Path(stem_path)
+        name = _stem_name(stem)
+        t = StageTimings()
+        t0 = time.perf_counter()
+        try:
+            if _is_pdf(stem):
+                bundle = self._run_pdf(stem, t)
+            else:
+                bundle = self._run_txt(stem, t)
+            # Validate and save
+            issues = validate_bundle(bundle)
+            save_bundle(bundle, dest_root=self.cfg.output_root, name=name)
+        except Exception as e:
+            return {"stem": name, "path": stem_path, "error": f"{e.__class__.__name__}: {e}",
+                    "seconds": time.perf_counter() - t0}
+        return {"stem": name, "path": stem_path, "docs": len(bundle.docs), "issues": issues,
+                "seconds": time.perf_counter() - t0, "profile": t.profile}
+
+    def _run_txt(self, stem: Path, t: StageTimings) -> PdfBundle:
         completo = stem / "completo.txt"
-        if not completo.exists():
+        reason = self.profiles.wanted(self.force_profile) if self.profiles is not None else None
+        if reason is None:
+            return _process_stem(stem, completo, self.parts, t)
+        return self.profiles.run(_process_stem, stem, completo, self.parts, t,
+                                 pdf_name=f"{stem.name}.pdf", timings=t, reason=reason)
+
+    def _run_pdf(self, pdf: Path, t: StageTimings) -> PdfBundle:
+        # profiling (forced or sampled) happens inside process_pdf_bytes
+        out = self.pipe.process_pdf_bytes(pdf.read_bytes(), pdf_name=pdf.name, timings=t,
+                                          profile=self.force_profile, source_path=str(pdf))
+        return PdfBundle.from_json(out)
+
+
+class _Workers:
+    """_StemRunner in this process (workers == 1) or one per pool process; kept warm across run() calls."""
+
+    def __init__(self, cfg: Config, force_profile: bool, workers: int):
+        self.runner: Optional[_StemRunner] = None
+        self.ex: Optional[ProcessPoolExecutor] = None
+        if workers == 1:
+            self.runner = _StemRunner(cfg, force_profile)
+        else:
+            self.ex = ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                                          initargs=(cfg, force_profile))
+
+    def run(self, stems: List[Path]) -> Iterator[Dict[str, Any]]:
+        """Summaries in completion order."""
+        if self.runner is not None:
+            for stem in stems:
+                yield self.runner.run(str(stem))
+            return
+        futures = [self.ex.submit(_run_in_worker, str(stem)) for stem in stems]
+        for fut in as_completed(futures):
+            yield fut.result()
+
+    def close(self, cancel: bool = False) -> None:
+        if self.ex is not None:
+            self.ex.shutdown(wait=not cancel, cancel_futures=cancel)
+
+
+_REASONS = {"new": "new", "input": "with a changed input", "pipeline": "built by another pipeline",
+            "output": "with a missing or modified bundle.json", "unchanged": "unchanged (--force)"}
+
+
+def _update_manifest(manifest: Manifest, r: Dict[str, Any], inp: InputHash, fingerprint: str) -> None:
+    if "error" in r:
+        manifest.forget(r["stem"])  # whatever is on disk was not built from this input
+    else:
+        # the hash and stat taken before the build: an input rewritten since is seen as changed
+        manifest.record(r["stem"], _input_path(Path(r["path"])), inp, fingerprint, r["docs"])
+
+
+def _input_path(p: Path) -> Path:
+    """The file a stem is built from."""
+    return p if _is_pdf(p) else p / "completo.txt"
+
+
+def _is_pdf(p: Path) -> bool:
+    return p.suffix.lower() == ".pdf"
+
+
+def _stem_name(p: Path) -> str:
+    """Output folder name: the PDF's stem, or the stem folder's name."""
+    return p.stem if _is_pdf(p) else p.name
+
+
+def _list_pdfs(folder: Path) -> List[Path]:
+    return [p for p in sorted(folder.iterdir())
+            if p.is_file() and _is_pdf(p) and not p.name.startswith(".")]
+
+
+def _watch(pdf_dir: Path, cfg: Config, args: argparse.Namespace, workers: int) -> None:
+    """
+    Poll pdf_dir until Ctrl+C / SIGTERM (the batch in progress is finished first). A PDF is taken
+    once its size and mtime are unchanged across two polls (still being copied otherwise), then
+    moved to done_dir, or to failed_dir next to a <name>.error.txt (one the manifest already has,
+    same bytes and pipeline, goes straight to done_dir). Polling rather than inotify:
+    no extra dependency, and it works on network shares.
+    """
+    done_dir = Path(args.done_dir) if args.done_dir else pdf_dir / "done"
+    failed_dir = Path(args.failed_dir) if args.failed_dir else pdf_dir / "failed"
+    done_dir.mkdir(parents=True, exist_ok=True)
+    failed_dir.mkdir(parents=True, exist_ok=True)
+
+    stop = threading.Event()
+    signal.signal(signal.SIGTERM, lambda *_: stop.set())
+    pool = _Workers(cfg, args.profile, workers)  # warm before the first PDF arrives
+    manifest = Manifest(cfg.output_root)
+    fingerprint = pipeline_version(cfg)
+    seen: Dict[Path, Tuple[int, int]] = {}
+    ok = failed = skipped = 0
+    print(f"Watching {pdf_dir} every {args.poll_s:g}s with {workers} worker(s) (Ctrl+C to stop).")
+    try:
+        while not stop.is_set():
+            ready: List[Path] = []
+            inputs: Dict[str, InputHash] = {}
+            for pdf in _stable_pdfs(pdf_dir, seen):
+                inputs[pdf.stem] = manifest.input_hash(pdf.stem, pdf)
+                if not args.force and manifest.status(pdf.stem, inputs[pdf.stem].sha256, fingerprint) == "unchanged":
+                    # the same PDF dropped again: its bundle is already there
+                    print(f"[{pdf.stem}] unchanged, skipped")
+                    skipped += 1
+                    _move(pdf, done_dir)
+                else:
+                    ready.append(pdf)
+            if ready:
+                progress = _Progress(len(ready))
+                for r in pool.run(ready):
+                    progress.done(r)
+                    _update_manifest(manifest, r, inputs[r["stem"]], fingerprint)
+                    src = Path(r["path"])
+                    seen.pop(src, None)
+                    if "error" in r:
+                        failed += 1
+                        dest = _move(src, failed_dir)
+                        dest.with_name(f"{dest.name}.error.txt").write_text(r["error"] + "\n", encoding="utf-8")
+                    else:
+                        ok += 1
+                        _move(src, done_dir)
+                manifest.save()
+            stop.wait(args.poll_s)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        pool.close(cancel=True)
+        manifest.save()
+    print(f"Stopped watching: {ok} PDF(s) processed, {failed} failed, {skipped} unchanged.")
+
+
+def _stable_pdfs(pdf_dir: Path, seen: Dict[Path, Tuple[int, int]]) -> List[Path]:
+    """PDFs whose (size, mtime) is the same as on the previous poll; seen is updated in place."""
+    ready: List[Path] = []
+    current: Dict[Path, Tuple[int, int]] = {}
+    for p in _list_pdfs(pdf_dir):
+        try:
+            st = p.stat()
+        except FileNotFoundError:
             continue
+        sig = (st.st_size, st.st_mtime_ns)
+        current[p] = sig
+        if st.st_size > 0 and seen.get(p) == sig:
+            ready.append(p)
+    seen.clear()
+    seen.update(current)
+    return ready
+
+
+def _move(src: Path, dest_dir: Path) -> Path:
+    """src into dest_dir, without overwriting an earlier PDF of the same name."""
+    dest = dest_dir / src.name
+    if dest.exists():
+        dest = dest_dir / f"{src.stem}-{time.strftime('%Y%m%dT%H%M%S')}{src.suffix}"
+    shutil.move(str(src), str(dest))
+    return dest
+
+
+class _Progress:
+    """One line per finished stem (with rate and ETA), then a throughput summary."""
+
+    def __init__(self, total: int, skipped: int = 0):
+        self.total = total
+        self.skipped = skipped
+        self.processed = 0
+        self.docs = 0
+        self.failed: List[str] = []
+        self.busy_s = 0.0  # sum of per-stem times (> wall time with several workers)
+        self.t0 = time.perf_counter()
+
+    def done(self, r: Dict[str, Any]) -> None:
+        n = self.processed + len(self.failed) + 1
+        self.busy_s += r["seconds"]
+        if "error" in r:
+            self.failed.append(r["stem"])
+            print(f"[{r['stem']}] FAILED: {r['error']}")
+        else:
+            self.processed += 1
+            self.docs += r["docs"]
+            if r["issues"]:
+                print(f"[{r['stem']}] Warnings: {r['issues']}")
+            if r["profile"]:
+                print(f"[{r['stem']}] profile {r['profile']}")
+        elapsed = time.perf_counter() - self.t0
+        rate = n / elapsed if elapsed else 0.0
+        eta = (self.total - n) / rate if rate else 0.0
+        status = "failed" if "error" in r else f"{r['docs']} docs"
+        print(f"[{n}/{self.total}] {r['stem']}: {status} in {r['seconds']:.2f}s | {rate:.2f} stems/s, ETA {_hms(eta)}")
+
+    def report(self, workers: int) -> None:
+        elapsed = time.perf_counter() - self.t0
+        n = self.processed + len(self.failed)
+        print(f"Done in {_hms(elapsed)} with {workers} worker(s): {self.processed} ok, {len(self.failed)} failed, "
+              f"{self.skipped} skipped | {n / elapsed if elapsed else 0:.2f} stems/s, "
+              f"{self.docs / elapsed if elapsed else 0:.1f} docs/s, {self.busy_s / n if n else 0:.2f}s per stem")
+        if self.failed:
+            print(f"Failed stems: {', '.join(sorted(self.failed))}")
+
+
+def _hms(seconds: float) -> str:
+    m, s = divmod(int(seconds), 60)
+    h, m = divmod(m, 60)
+    return f"{h}h{m:02d}m{s:02d}s" if h else f"{m}m{s:02d}s"
+
+
+# ---------- process-pool workers (module level so they can be pickled) ----------
+_RUNNER: Optional[_StemRunner] = None
+
+
+def _init_worker(cfg: Config, force_profile: bool) -> None:
+    global _RUNNER
+    _RUNNER = _StemRunner(cfg, force_profile)
+
+
+def _run_in_worker(stem_path: str) -> Dict[str, Any]:
+    return _RUNNER.run(stem_path)
 
-        # Read combined text (from your earlier extractor)
-        lines = completo.read_text(encoding="utf-8", errors="ignore").splitlines()
 
-        # Sumário detection + items
-        sum_start, sum_end = sumario.find_range(lines)
-        sum_lines = lines[sum_start:sum_end] if (sum_start is not None and sum_end is not None) else []
-        items = sumario.parse_items(sum_lines)
+def _process_stem(stem: Path, completo: Path, parts: tuple, t: Optional[StageTimings] = None) -> PdfBundle:
+    gnlp, sumario, slicer, linker, factory = parts
+    t = t if t is not None else StageTimings()
 
-        # Body headers & slices
-        exclude = (sum_start, sum_end) if (sum_start is not None and sum_end is not None) else None
-        header_lines = slicer.detect_headers(lines, exclude)
-        slices = slicer.slices(lines, header_lines)
+    # Read combined text (from your earlier extractor)
+    t0 = time.perf_counter()
+    lines = completo.read_text(encoding="utf-8", errors="ignore").splitlines()
+    index = LineIndex(gnlp, lines)  # one spaCy pass per unique line, shared by all stages
+    t.add("line_index", time.perf_counter() - t0)
 
-        # Link & build docs
-        links = linker.link(items, slices)
-        docs = [factory.build(lk, pdf_name=f"{stem.name}.pdf", source_path=str(completo), publication_date=None)
-                for lk in links]
+    # Sumário detection + items
+    t0 = time.perf_counter()
+    sum_start, sum_end = sumario.find_range(lines, index)
+    sum_lines = lines[sum_start:sum_end] if (sum_start is not None and sum_end is not None) else []
+    items = sumario.parse_items(sum_lines, index.sub(sum_start, sum_end) if sum_lines else None)
+    t.add("sumario", time.perf_counter() - t0)
 
-        bundle = PdfBundle(pdf_name=f"{stem.name}.pdf", source_path=str(completo), docs=docs, notes=[])
+    # Body headers & slices
+    t0 = time.perf_counter()
+    exclude = (sum_start, sum_end) if (sum_start is not None and sum_end is not None) else None
+    header_lines = slicer.detect_headers(lines, exclude, index)
+    slices = slicer.slices(lines, header_lines, index=index)
+    t.add("slicing", time.perf_counter() - t0)
 
-        # Validate and save
-        issues = validate_bundle(bundle)
-        if issues:
-            print(f"[{stem.name}] Warnings: {issues}")
-        save_bundle(bundle, dest_root=cfg.output_root)
-        processed += 1
+    # Link & build docs
+    t0 = time.perf_counter()
+    links = linker.link(items, slices)
+    docs = [factory.build(lk, pdf_name=f"{stem.name}.pdf", source_path=str(completo), publication_date=None)
+            for lk in links]
+    t.add("link_or_build", time.perf_counter() - t0)
+    t.docs = len(docs)
+    for lk in links:
+        t.links[lk.status] = t.links.get(lk.status, 0) + 1
 
-    print(f"Processed {processed} PDF stems.")
+    return PdfBundle(pdf_name=f"{stem.name}.pdf", source_path=str(completo), docs=docs, notes=[])
 
 if __name__ == "__main__":
     main()
@@ -1,4 +1,5 @@
 from dataclasses import dataclass
+from functools import lru_cache
 import unicodedata
 
 @dataclass(slots=True)
@@ -9,6 +10,38 @@ class Config:
     ocr_lang: str = "por"
     ignore_top_percent: float = 0.10
     skip_last_page: bool = True
+    extract_workers: int = 1                     # >1 -> render/OCR pages in a process pool
+    ocr_cache_dir: str | None = None             # on-disk OCR text cache (None = disabled)
+    ocr_cache_max_mb: int = 512
+    ocr_adaptive: bool = False                   # low-dpi OCR first, escalate to dpi on low confidence
+    ocr_low_dpi: int = 150
+    ocr_min_confidence: float = 75.0
+    ocr_backend: str = "auto"                    # "auto" (tesserocr if installed) | "tesserocr" | "pytesseract"
+    ocr_engines: int = 1                         # persistent OCR engines per process
+    ocr_regions: bool = False                    # on digital pages, OCR only embedded image blocks
+    column_layout: bool = True                   # column reading order from geometry (avoids forced OCR on page 2)
+    nlp_profile: str = "rules"                   # "rules" (tokenizer + gazette_ruler) | "full" (pt_core_news_* + ruler)
+    nlp_fast_path: bool = True                   # regex pre-check: plain body lines skip spaCy
+    nlp_memo_size: int = 20000                   # line classifications kept across documents (0 = off)
+    nlp_cache_dir: str | None = None             # serialized pipeline (services/nlp_cache.py); None = build at startup
+    result_cache_dir: str | None = None          # bundle JSON per (PDF bytes, name, date, pipeline version)
+    result_cache_max_mb: int = 1024
+    result_cache_max_age_s: float = 7 * 24 * 3600
+    api_workers: int = 2                         # /extract processes (each with its own Pipeline); 0 = threads in-process
+    api_max_pending: int = 8                     # requests queued beyond the busy workers before 503
+    api_retry_after_s: int = 5                   # Retry-After on 503
+    api_max_concurrency: int = 2                 # PDFs processed at once by /extract/batch without a pool (api_workers == 0)
+    batch_max_parallel: int = 2                  # ...of which one batch may hold at most this many
+    batch_max_files: int = 500
+    batch_max_mb: int = 1024                     # total PDF bytes per batch (zip: uncompressed)
+    job_dir: str | None = None                   # /jobs queue (SQLite + inputs); None = disabled
+    job_workers: int = 1                         # worker threads; jobs run in the api_workers pool (own warm Pipeline if 0)
+    job_max_attempts: int = 3
+    job_retry_delay_s: float = 5.0
+    profile_dir: str | None = None               # cProfile captures (services/profiling.py); None = never profile
+    profile_sample_rate: float = 0.0             # fraction of process_pdf_bytes() calls profiled (0.01 = 1%)
+    profile_max_files: int = 200                 # oldest captures removed beyond these
+    profile_max_mb: int = 256
 
 ALLOWED_TIPOS = {
     "despacho","aviso","declaracao","edital","deliberacao",
@@ -16,6 +49,7 @@ ALLOWED_TIPOS = {
 }
 
 
+@lru_cache(maxsize=1024)
 def normalize_tipo(s: str | None) -> str:
     if not s:
         return "unknown"
@@ -0,0 +1,124 @@
+from __future__ import annotations
+from pathlib import Path
+from typing import Dict, Optional
+import os
+import threading
+import time
+
+
+class DiskLRUCache:
+    """
+    Content-addressed key -> bytes store on local disk:
+      - one file per key, sharded by the first two characters of the key
+      - LRU by mtime (a hit touches the file); evicts the oldest entries when over max_bytes
+      - writes are atomic (tmp file + rename), so several processes can share a directory
+      - hit/miss/eviction counters are per process
+    """
+
+    def __init__(self, root: str, max_bytes: int):
+        self.root = Path(root)
+        self.root.mkdir(parents=True, exist_ok=True)
+        self.max_bytes = max(0, max_bytes)
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._lock = threading.Lock()
+        self._size = sum(size for _mtime, size, _path in self._entries())
+
+    def _path(self, key: str) -> Path:
+        return self.root / key[:2] / key
+
+    def get(self, key: str) -> Optional[bytes]:
+        path = self._path(key)
+        try:
+            data = path.read_bytes()
+        except OSError:
+            with self._lock:
+                self.misses += 1
+            return None
+        try:
+            os.utime(path)  # mark as recently used
+        except OSError:
+            pass
+        with self._lock:
+            self.hits += 1
+        return data
+
+    def put(self, key: str, data: bytes) -> None:
+        path = self._path(key)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_name(f".{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+        tmp.write_bytes(data)
+        try:
+            old = path.stat().st_size  # overwrite: only the difference is new usage
+        except OSError:
+            old = 0
+        os.replace(tmp, path)
+        with self._lock:
+            self._size += len(data) - old
+            if self._size > self.max_bytes:
+                self._evict()
+
+    def delete(self, key: str) -> None:
+        path = self._path(key)
+        try:
+            size = path.stat().st_size
+            path.unlink()
+        except OSError:
+            return
+        with self._lock:
+            self._size -= size
+
+    def evict_idle(self, max_idle_s: float) -> int:
+        """Drop entries not used (read or written) for max_idle_s seconds."""
+        cutoff = time.time() - max_idle_s
+        dropped = 0
+        for mtime, size, path in list(self._entries()):
+            if mtime >= cutoff:
+                continue
+            try:
+                path.unlink()
+            except OSError:
+                continue
+            dropped += 1
+            with self._lock:
+                self._size -= size
+                self.evictions += 1
+        return dropped
+
+    def _entries(self):
+        for path in self.root.glob("*/*"):
+            if path.name.startswith("."):
+                continue
+            try:
+                st = path.stat()
+            except OSError:
+                continue
+            yield st.st_mtime, st.st_size, path
+
+    def _evict(self) -> None:
+        # rescan: other processes may share the directory; trim to 90% so we don't evict on every put
+        entries = sorted(self._entries(), key=lambda e: e[0])
+        total = sum(size for _mtime, size, _path in entries)
+        target = int(self.max_bytes * 0.9)
+        for _mtime, size, path in entries:
+            if total <= target:
+                break
+            try:
+                path.unlink()
+            except OSError:
+                continue
+            total -= size
+            self.evictions += 1
+        self._size = total
+
+    def stats(self) -> Dict[str, float]:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "hit_rate": (self.hits / lookups) if lookups else 0.0,
+                "bytes": self._size,
+            }
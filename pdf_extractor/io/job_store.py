@@ -0,0 +1,193 @@
+from __future__ import annotations
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Dict, Optional
+import json
+import os
+import sqlite3
+import threading
+import time
+import uuid
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    id           TEXT PRIMARY KEY,
+    pdf_name     TEXT NOT NULL,
+    status       TEXT NOT NULL,          -- queued | running | done | failed
+    stage        TEXT,
+    progress     TEXT,                   -- JSON from Pipeline.process_pdf_bytes(progress=...)
+    attempts     INTEGER NOT NULL DEFAULT 0,
+    max_attempts INTEGER NOT NULL,
+    not_before   REAL NOT NULL DEFAULT 0,  -- retry backoff
+    error        TEXT,
+    result       TEXT,                   -- bundle JSON
+    created      REAL NOT NULL,
+    updated      REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS jobs_queue ON jobs (status, not_before, created);
+"""
+
+
+@dataclass(slots=True)
+class Job:
+    id: str
+    pdf_name: str
+    status: str
+    stage: Optional[str]
+    progress: Dict[str, Any]
+    attempts: int
+    max_attempts: int
+    error: Optional[str]
+    created: float
+    updated: float
+
+    def to_json(self) -> Dict[str, Any]:
+        return {
+            "id": self.id,
+            "pdf_name": self.pdf_name,
+            "status": self.status,
+            "stage": self.stage,
+            "progress": self.progress,
+            "attempts": self.attempts,
+            "max_attempts": self.max_attempts,
+            "error": self.error,
+            "created": self.created,
+            "updated": self.updated,
+        }
+
+
+class JobStore:
+    """
+    Persistent extraction queue: <root>/jobs.sqlite3 (WAL) for job state and results,
+    <root>/inputs/<id>.pdf for the uploaded bytes (removed once the job is done or failed).
+    One connection shared under a lock; claim() is atomic, so several workers can poll it.
+    """
+
+    def __init__(self, root: str):
+        self.root = Path(root)
+        self.inputs = self.root / "inputs"
+        self.inputs.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(str(self.root / "jobs.sqlite3"), check_same_thread=False,
+                                   isolation_level=None)
+        self._db.row_factory = sqlite3.Row
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.executescript(_SCHEMA)
+
+    def close(self) -> None:
+        with self._lock:
+            self._db.close()
+
+    # ---------- producer side ----------
+
+    def create(self, pdf_name: str, pdf_bytes: bytes, max_attempts: int = 3) -> str:
+        job_id = uuid.uuid4().hex
+        path = self._input_path(job_id)
+        tmp = path.with_name(f".{path.name}.tmp")
+        tmp.write_bytes(pdf_bytes)
+        os.replace(tmp, path)
+        now = time.time()
+        with self._lock:
+            self._db.execute(
+                "INSERT INTO jobs (id, pdf_name, status, progress, max_attempts, created, updated) "
+                "VALUES (?, ?, 'queued', '{}', ?, ?, ?)",
+                (job_id, pdf_name, max(1, max_attempts), now, now))
+        return job_id
+
+    def get(self, job_id: str) -> Optional[Job]:
+        with self._lock:
+            row = self._db.execute("SELECT * FROM jobs WHERE id = ?", (job_id,)).fetchone()
+        return self._job(row) if row else None
+
+    def result(self, job_id: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            row = self._db.execute("SELECT result FROM jobs WHERE id = ? AND status = 'done'", (job_id,)).fetchone()
+        return json.loads(row["result"]) if row and row["result"] else None
+
+    # ---------- worker side ----------
+
+    def claim(self) -> Optional[Job]:
+        """Oldest runnable queued job -> running (attempts + 1), or None."""
+        now = time.time()
+        with self._lock:
+            self._db.execute("BEGIN IMMEDIATE")
+            try:
+                row = self._db.execute(
+                    "SELECT * FROM jobs WHERE status = 'queued' AND not_before <= ? ORDER BY created LIMIT 1",
+                    (now,)).fetchone()
+                if row is None:
+                    self._db.execute("COMMIT")
+                    return None
+                self._db.execute(
+                    "UPDATE jobs SET status = 'running', stage = NULL, attempts = attempts + 1, error = NULL, "
+                    "updated = ? WHERE id = ?", (now, row["id"]))
+                self._db.execute("COMMIT")
+            except Exception:
+                self._db.execute("ROLLBACK")
+                raise
+        job = self._job(row)
+        job.status, job.attempts = "running", job.attempts + 1
+        return job
+
+    def read_input(self, job_id: str) -> bytes:
+        return self._input_path(job_id).read_bytes()
+
+    def set_progress(self, job_id: str, stage: str, progress: Dict[str, Any]) -> None:
+        with self._lock:
+            self._db.execute("UPDATE jobs SET stage = ?, progress = ?, updated = ? WHERE id = ?",
+                             (stage, json.dumps(progress), time.time(), job_id))
+
+    def finish(self, job_id: str, result: Dict[str, Any]) -> None:
+        with self._lock:
+            self._db.execute("UPDATE jobs SET status = 'done', stage = NULL, error = NULL, result = ?, updated = ? "
+                             "WHERE id = ?", (json.dumps(result, ensure_ascii=False), time.time(), job_id))
+        self._input_path(job_id).unlink(missing_ok=True)
+
+    def fail(self, job_id: str, error: str, retry: bool = True, retry_delay_s: float = 0.0) -> str:
+        """Requeue (with backoff) while attempts remain and retry is True; otherwise mark failed."""
+        now = time.time()
+        with self._lock:
+            row = self._db.execute("SELECT attempts, max_attempts FROM jobs WHERE id = ?", (job_id,)).fetchone()
+            if row is None:
+                return "missing"
+            status = "queued" if retry and row["attempts"] < row["max_attempts"] else "failed"
+            self._db.execute("UPDATE jobs SET status = ?, error = ?, not_before = ?, updated = ? WHERE id = ?",
+                             (status, error, now + retry_delay_s, now, job_id))
+        if status == "failed":
+            self._input_path(job_id).unlink(missing_ok=True)
+        return status
+
+    def recover(self) -> int:
+        """After a restart: jobs left 'running' were interrupted -> back to the queue (or failed)."""
+        now = time.time()
+        with self._lock:
+            failed = self._db.execute(
+                "SELECT id FROM jobs WHERE status = 'running' AND attempts >= max_attempts").fetchall()
+            self._db.execute(
+                "UPDATE jobs SET status = 'failed', error = 'interrupted', updated = ? "
+                "WHERE status = 'running' AND attempts >= max_attempts", (now,))
+            cur = self._db.execute(
+                "UPDATE jobs SET status = 'queued', stage = NULL, updated = ? WHERE status = 'running'", (now,))
+        for row in failed:
+            self._input_path(row["id"]).unlink(missing_ok=True)
+        return cur.rowcount + len(failed)
+
+    # ---------- helpers ----------
+
+    def _input_path(self, job_id: str) -> Path:
+        return self.inputs / f"{job_id}.pdf"
+
+    @staticmethod
+    def _job(row: sqlite3.Row) -> Job:
+        return Job(
+            id=row["id"],
+            pdf_name=row["pdf_name"],
+            status=row["status"],
+            stage=row["stage"],
+            progress=json.loads(row["progress"] or "{}"),
+            attempts=row["attempts"],
+            max_attempts=row["max_attempts"],
+            error=row["error"],
+            created=row["created"],
+            updated=row["updated"],
+        )
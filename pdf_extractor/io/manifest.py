@@ -0,0 +1,132 @@
+from __future__ import annotations
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Any, Dict, Optional, Tuple
+import hashlib
+import json
+import logging
+import os
+import time
+
+MANIFEST_NAME = "manifest.json"
+MANIFEST_FORMAT = 1  # bump when the layout changes (an older manifest is then ignored)
+
+_CHUNK = 1024 * 1024
+
+
+def file_sha256(path: Path) -> str:
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(_CHUNK), b""):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+def _stat(path: Path) -> Optional[Tuple[int, int]]:
+    try:
+        st = path.stat()
+    except OSError:
+        return None
+    return st.st_size, st.st_mtime_ns
+
+
+@dataclass(frozen=True, slots=True)
+class InputHash:
+    sha256: str
+    stat: Optional[Tuple[int, int]]  # (size, mtime_ns) taken before hashing, recorded with the hash
+
+
+@dataclass(slots=True)
+class ManifestEntry:
+    input_path: str
+    input_sha256: str
+    input_size: int
+    input_mtime_ns: int
+    pipeline: str                # fingerprint of the code/rules that built the bundle
+    output_sha256: str           # of <stem>/bundle.json
+    output_size: int
+    output_mtime_ns: int
+    docs: int
+    updated: float
+
+
+class Manifest:
+    """
+    <output_root>/manifest.json: for each stem, the hash of its input (completo.txt or PDF), the
+    pipeline fingerprint and the checksum of the bundle.json built from them. A stem whose three
+    still match needs no rebuild. Hashes are only recomputed when a file's size or mtime moved, so
+    checking an unchanged archive costs one stat() per file.
+    """
+
+    def __init__(self, output_root: str):
+        self.path = Path(output_root) / MANIFEST_NAME
+        self.output_root = Path(output_root)
+        self.entries: Dict[str, ManifestEntry] = {}
+        try:
+            data = json.loads(self.path.read_text(encoding="utf-8"))
+        except FileNotFoundError:
+            return
+        except (OSError, ValueError):
+            logging.warning(f"[MANIFEST] unreadable {self.path}, rebuilding everything")
+            return
+        if data.get("format") != MANIFEST_FORMAT:
+            return
+        for stem, e in data.get("stems", {}).items():
+            try:
+                self.entries[stem] = ManifestEntry(**e)
+            except TypeError:
+                continue
+
+    def input_hash(self, stem: str, path: Path) -> InputHash:
+        """
+        sha256 of path, reused from the manifest when its size and mtime are unchanged. The stat
+        is taken first: if the file is rewritten while (or after) it is hashed, the recorded stat
+        no longer matches and the next run hashes it again.
+        """
+        st = _stat(path)
+        e = self.entries.get(stem)
+        if e is not None and e.input_path == str(path) and st == (e.input_size, e.input_mtime_ns):
+            return InputHash(e.input_sha256, st)
+        return InputHash(file_sha256(path), st)
+
+    def status(self, stem: str, input_sha: str, pipeline: str) -> str:
+        """"unchanged" | "new" | "input" | "pipeline" | "output" (what changed since the last build)."""
+        e = self.entries.get(stem)
+        if e is None:
+            return "new"
+        if e.input_sha256 != input_sha:
+            return "input"
+        if e.pipeline != pipeline:
+            return "pipeline"
+        out = self.output_root / stem / "bundle.json"
+        st = _stat(out)
+        if st is None:
+            return "output"
+        if st != (e.output_size, e.output_mtime_ns) and file_sha256(out) != e.output_sha256:
+            return "output"
+        return "unchanged"
+
+    def record(self, stem: str, input_path: Path, inp: InputHash, pipeline: str, docs: int) -> None:
+        """After a successful build of stem (its bundle.json is on disk) from the input hashed as inp."""
+        out = self.output_root / stem / "bundle.json"
+        in_st = inp.stat or (0, 0)
+        out_st = _stat(out) or (0, 0)
+        self.entries[stem] = ManifestEntry(
+            input_path=str(input_path), input_sha256=inp.sha256, input_size=in_st[0], input_mtime_ns=in_st[1],
+            pipeline=pipeline, output_sha256=file_sha256(out), output_size=out_st[0], output_mtime_ns=out_st[1],
+            docs=docs, updated=time.time(),
+        )
+
+    def forget(self, stem: str) -> None:
+        self.entries.pop(stem, None)
+
+    def save(self) -> None:
+        data: Dict[str, Any] = {
+            "format": MANIFEST_FORMAT,
+            "updated": time.time(),
+            "stems": {stem: asdict(e) for stem, e in sorted(self.entries.items())},
+        }
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = self.path.with_name(f".{self.path.name}.tmp")
+        tmp.write_text(json.dumps(data, ensure_ascii=False, indent=1), encoding="utf-8")
+        os.replace(tmp, self.path)
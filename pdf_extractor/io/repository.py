@@ -1,18 +1,45 @@
 from __future__ import annotations
 import json
+import os
 from pathlib import Path
+from typing import Optional
 from ..domain.bundle import PdfBundle
 
-def save_bundle(bundle: PdfBundle, dest_root: str) -> None:
-    root = Path(dest_root) / Path(bundle.source_path).parent.name
+def save_bundle(bundle: PdfBundle, dest_root: str, name: Optional[str] = None) -> None:
+    """
+    Into <dest_root>/<name>, by default the folder of bundle.source_path (a stem of .txt files).
+    docs/*.txt first, bundle.json last and atomically (tmp + rename): a bundle.json that exists
+    is complete (see bundle_complete()). Doc files left from an earlier run are removed.
+    """
+    root = Path(dest_root) / (name or Path(bundle.source_path).parent.name)
     docs_dir = root / "docs"
     root.mkdir(parents=True, exist_ok=True)
     docs_dir.mkdir(parents=True, exist_ok=True)
 
-    # write bundle.json
-    (root / "bundle.json").write_text(json.dumps(bundle.to_json(), ensure_ascii=False, indent=2), encoding="utf-8")
-
     # write each doc’s body to a file (ordinal ordering)
+    written = set()
     for idx, d in enumerate(bundle.docs, start=1):
         stem = f"{idx:04d}-{d._TipoDocumento}.txt"
         (docs_dir / stem).write_text(d._BodyTexto, encoding="utf-8")
+        written.add(stem)
+    for old in docs_dir.glob("*.txt"):
+        if old.name not in written:
+            old.unlink()
+
+    # write bundle.json
+    path = root / "bundle.json"
+    tmp = path.with_name(".bundle.json.tmp")
+    tmp.write_text(json.dumps(bundle.to_json(), ensure_ascii=False, indent=2), encoding="utf-8")
+    os.replace(tmp, path)
+
+def bundle_complete(dest_root: str, stem: str) -> bool:
+    """True when <dest_root>/<stem>/bundle.json was fully written (and its doc files are there)."""
+    root = Path(dest_root) / stem
+    try:
+        data = json.loads((root / "bundle.json").read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return False
+    docs = data.get("docs") if isinstance(data, dict) else None
+    if not isinstance(docs, list):
+        return False
+    return sum(1 for _ in (root / "docs").glob("*.txt")) == len(docs)
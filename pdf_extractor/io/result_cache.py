@@ -0,0 +1,74 @@
+from __future__ import annotations
+from datetime import date
+from typing import Any, Dict, Optional
+import hashlib
+import json
+import threading
+import time
+
+from .disk_cache import DiskLRUCache
+
+
+class ResultCache:
+    """
+    Bundle JSON per (PDF bytes, pdf_name, publication_date, pipeline version), on a DiskLRUCache:
+      - size: LRU eviction down from max_bytes (DiskLRUCache)
+      - age: entries older than max_age_s are dropped on read; idle ones are swept now and then
+    """
+
+    def __init__(self, root: str, max_bytes: int, max_age_s: Optional[float] = None):
+        self.disk = DiskLRUCache(root, max_bytes)
+        self.max_age_s = max_age_s
+        self.expired = 0
+        self._last_sweep = 0.0
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def key(pdf_bytes: bytes, pdf_name: str, publication_date: Optional[date], version: str,
+            source_path: Optional[str] = None) -> str:
+        h = hashlib.sha256()
+        h.update(hashlib.sha256(pdf_bytes).digest())
+        # pdf_name and the date end up in the bundle (ids, _PdfName, _DataDate); so does a
+        # non-default source_path (left out otherwise: keys of uploads stay what they were)
+        parts = [pdf_name, publication_date.isoformat() if publication_date else None, version]
+        if source_path is not None:
+            parts.append(source_path)
+        h.update(json.dumps(parts).encode("utf-8"))
+        return h.hexdigest()
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        raw = self.disk.get(key)
+        if raw is None:
+            return None
+        try:
+            entry = json.loads(raw)
+        except ValueError:
+            self.disk.delete(key)
+            return None
+        if self.max_age_s is not None and time.time() - entry.get("created", 0) > self.max_age_s:
+            self.disk.delete(key)
+            with self._lock:
+                self.expired += 1
+            return None
+        return entry["bundle"]
+
+    def put(self, key: str, bundle: Dict[str, Any]) -> None:
+        entry = {"created": time.time(), "bundle": bundle}
+        self.disk.put(key, json.dumps(entry, ensure_ascii=False).encode("utf-8"))
+        self._maybe_sweep()
+
+    def _maybe_sweep(self) -> None:
+        # an entry idle for max_age_s is at least that old; sweep at most every max_age_s / 10
+        if self.max_age_s is None:
+            return
+        now = time.time()
+        with self._lock:
+            if now - self._last_sweep < self.max_age_s / 10:
+                return
+            self._last_sweep = now
+        self.disk.evict_idle(self.max_age_s)
+
+    def stats(self) -> Dict[str, float]:
+        out = self.disk.stats()
+        out["expired"] = self.expired
+        return out
@@ -1,28 +1,192 @@
 from __future__ import annotations
-from typing import Optional, List
+from collections import OrderedDict
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Dict, Iterable, Optional, List, Tuple
+import hashlib
+import json
+import logging
+import re
+import threading
+import time
 import unicodedata
 import spacy
 from spacy.language import Language
+from spacy.tokens import Doc
 from spacy.pipeline import EntityRuler
 from spacy.matcher import Matcher
-from ..config import ALLOWED_TIPOS
+from ..config import ALLOWED_TIPOS, normalize_tipo
 
+@lru_cache(maxsize=4096)
 def ascii_lower(s: str) -> str:
     return unicodedata.normalize("NFKD", s).encode("ascii","ignore").decode("ascii").lower().strip()
 
+@dataclass(frozen=True, slots=True)
+class LineInfo:
+    """Everything the pipeline reads from one line's entities (one spaCy pass per unique line)."""
+    org: bool = False                 # has a SUM_ORG_LINE entity
+    kind_pos: int = -1                # token index of the first DOC_TYPE (-1: none)
+    kind_text: Optional[str] = None   # text of that DOC_TYPE
+    lead: bool = False                # ...and only punct/space before it (Sumário header rule)
+    number: Optional[str] = None      # digits of the last DOC_NUM
+    year: Optional[str] = None        # last DOC_YEAR with 4 digits in 1900..2100 (Sumário rule)
+    body_year: Optional[str] = None   # last all-decimal DOC_YEAR in 1900..2100 (BodySlicer rule)
+    last_idx: int = -1                # last token of the header part (kind + num/year)
+
+    def sumario_header(self) -> Tuple[Optional[str], Optional[str], Optional[str]]:
+        if not self.lead:
+            return None, None, None
+        return ascii_lower(self.kind_text), self.number, self.year
+
+    def body_header(self) -> Tuple[Optional[str], Optional[str], Optional[str], int]:
+        if self.kind_pos < 0:
+            return None, None, None, -1
+        return self.kind_text.lower().strip(), self.number, self.body_year, self.last_idx
+
+
+_PLAIN = LineInfo()
+_ORG_LINE = LineInfo(org=True)
+
+
+def line_info(doc: Doc) -> LineInfo:
+    org = False
+    kind = None
+    number = year = body_year = None
+    num_year_ends: List[int] = []
+    for e in doc.ents:
+        label = e.label_
+        if label == "SUM_ORG_LINE":
+            org = True
+        elif label == "DOC_TYPE":
+            if kind is None:
+                kind = e
+        elif label == "DOC_NUM":
+            digits = "".join(ch for ch in e.text if ch.isdigit())
+            if digits:
+                number = digits
+            num_year_ends.append(e.end)
+        elif label == "DOC_YEAR":
+            # isdecimal(), not just isdigit(): superscripts ("¹") are digits int() rejects
+            y = "".join(ch for ch in e.text if ch.isdigit())
+            if len(y) == 4 and y.isdecimal() and 1900 <= int(y) <= 2100:
+                year = y
+            if e.text.isdecimal() and 1900 <= int(e.text) <= 2100:
+                body_year = e.text
+            num_year_ends.append(e.end)
+    if kind is None:
+        return _ORG_LINE if org else _PLAIN  # number/year are only read on header lines
+
+    last_idx = kind.end - 1
+    if number or body_year:
+        # expand to include the rightmost num/year entity
+        last_idx = max([kind.end] + num_year_ends) - 1
+    return LineInfo(
+        org=org,
+        kind_pos=kind.start,
+        kind_text=kind.text,
+        lead=all((tok.is_punct or tok.is_space) for tok in doc[:kind.start]),
+        number=number,
+        year=year,
+        body_year=body_year,
+        last_idx=last_idx,
+    )
+
+
+# Fast path: a line can only get a DOC_TYPE if it has an ALLOWED_TIPOS word (LOWER match on a
+# token; tokens never start/end inside a run of letters), and only a SUM_ORG_LINE if it has an
+# all-uppercase alphabetic token, i.e. a letter run that is upper case. Anything else is plain
+# body text and skips spaCy. Check with cli/check_fast_path.py after changing the ruler patterns.
+_LETTER_RUN = re.compile(r"[^\W\d_]+")
+_TIPO_WORD = re.compile(r"(?<![^\W\d_])(?:%s)(?![^\W\d_])"
+                        % "|".join(sorted(map(re.escape, ALLOWED_TIPOS), key=len, reverse=True)))
+
+
+def may_be_tagged(text: str) -> bool:
+    """False -> spaCy would find neither a DOC_TYPE nor a SUM_ORG_LINE on this line."""
+    if _TIPO_WORD.search(text.lower()):
+        return True
+    return any(run.isupper() for run in _LETTER_RUN.findall(text))
+
+
+class _LineMemo:
+    """Bounded, thread-safe LRU of stripped line text -> LineInfo (shared across documents)."""
+
+    def __init__(self, capacity: int):
+        self.capacity = max(0, capacity)
+        self._data: "OrderedDict[str, LineInfo]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: str) -> Optional[LineInfo]:
+        with self._lock:
+            info = self._data.get(key)
+            if info is None:
+                self.misses += 1
+                return None
+            self._data.move_to_end(key)
+            self.hits += 1
+            return info
+
+    def put(self, key: str, info: LineInfo) -> None:
+        if not self.capacity:
+            return
+        with self._lock:
+            self._data[key] = info
+            self._data.move_to_end(key)
+            while len(self._data) > self.capacity:
+                self._data.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+
+    def stats(self) -> Dict[str, float]:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "size": len(self._data),
+                "capacity": self.capacity,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": (self.hits / lookups) if lookups else 0.0,
+            }
+
+
+# "rules": tokenizer + sentencizer + gazette_ruler (everything the pipeline reads: ents, token flags)
+# "full":  pt_core_news_* (tok2vec, parser, NER, ...) + gazette_ruler, for future enrichment
+NLP_PROFILES = ("rules", "full")
+
+
 class GazetteNLP:
-    def __init__(self, nlp: Optional[Language] = None):
-        self.nlp = nlp or self._build_pipeline()
+    def __init__(self, nlp: Optional[Language] = None, profile: str = "rules", fast_path: bool = True,
+                 memo_size: int = 20000):
+        if profile not in NLP_PROFILES:
+            raise ValueError(f"unknown nlp profile {profile!r} (expected one of {NLP_PROFILES})")
+        self.profile = profile
+        self.fast_path = fast_path
+        t0 = time.perf_counter()
+        self.nlp = nlp or self._build_pipeline(profile)
         self.matcher = Matcher(self.nlp.vocab)
         self._add_org_head_patterns()
+        # cold-start report; load_gazette_nlp() overwrites both with the cache lookup included
+        self.startup_s = time.perf_counter() - t0
+        self.startup_source = "given" if nlp is not None else "built"
+        # classify() results for lines that went through spaCy; only valid for the pattern set
+        # whose hash is _memo_hash (_memo_count: cheap per-line check, see _check_memo)
+        self._memo = _LineMemo(memo_size)
+        self._memo_count = self._pattern_count()
+        self._memo_hash = self._base_hash = self._pattern_hash()
 
-    def _build_pipeline(self) -> Language:
-        # Prefer Portuguese model if available; else blank 'pt'
-        for name in ("pt_core_news_lg","pt_core_news_md","pt_core_news_sm"):
-            try:
-                return self._with_rules(spacy.load(name))
-            except Exception:
-                continue
+    def _build_pipeline(self, profile: str = "rules") -> Language:
+        if profile == "full":
+            # Prefer Portuguese model if available; else blank 'pt'
+            for name in ("pt_core_news_lg","pt_core_news_md","pt_core_news_sm"):
+                try:
+                    return self._with_rules(spacy.load(name))
+                except Exception:
+                    continue
+        # statistical components would only be overwritten by gazette_ruler: skip them
         return self._with_rules(spacy.blank("pt"))
 
     def _with_rules(self, nlp: Language) -> Language:
@@ -35,12 +199,14 @@ class GazetteNLP:
         ruler.add_patterns(self._sum_org_line_patterns())
         return nlp
 
-    def _doctype_patterns(self) -> List[dict]:
+    @staticmethod
+    def _doctype_patterns() -> List[dict]:
         # tag DOC_TYPE on your controlled tipos (ASCII/lowercase matching via LOWER)
         kinds = sorted(ALLOWED_TIPOS)
         return [{"label":"DOC_TYPE","pattern":[{"LOWER":k}]} for k in kinds]
 
-    def _num_year_patterns(self) -> List[dict]:
+    @staticmethod
+    def _num_year_patterns() -> List[dict]:
         # DOC_NUM: numeric token(s) (we keep it simple; training can do better later)
         # DOC_YEAR: 4-digit number in a plausible range (filter in code)
         return [
@@ -49,19 +215,26 @@ class GazetteNLP:
         ]
 
     def _add_org_head_patterns(self):
+        for pattern in self._org_head_patterns():
+            self.matcher.add("ORG_HEAD", [pattern])
+
+    @staticmethod
+    def _org_head_patterns() -> List[List[dict]]:
         # ORG_HEAD via Matcher: runs of uppercase alphabetic tokens, with optional hyphen or short preps
         # Example: "CÂMARA MUNICIPAL DE LISBOA", "DIREÇÃO-GERAL DA SAÚDE"
-        # Pattern 1: UPPER+ (allow several tokens)
-        self.matcher.add("ORG_HEAD", [[{"IS_ALPHA":True, "IS_UPPER":True, "OP":"+"}]])
-        # Pattern 2: UPPER+ - UPPER+
-        self.matcher.add("ORG_HEAD", [[
-            {"IS_ALPHA":True, "IS_UPPER":True, "OP":"+"},
-            {"TEXT":"-"},
-            {"IS_ALPHA":True, "IS_UPPER":True, "OP":"+"},
-        ]])
-
+        return [
+            # Pattern 1: UPPER+ (allow several tokens)
+            [{"IS_ALPHA":True, "IS_UPPER":True, "OP":"+"}],
+            # Pattern 2: UPPER+ - UPPER+
+            [
+                {"IS_ALPHA":True, "IS_UPPER":True, "OP":"+"},
+                {"TEXT":"-"},
+                {"IS_ALPHA":True, "IS_UPPER":True, "OP":"+"},
+            ],
+        ]
 
-    def _sum_org_line_patterns(self) -> List[dict]:
+    @staticmethod
+    def _sum_org_line_patterns() -> List[dict]:
         #Coarse rule: one or more UPPERCASE alpha tokens; allow hyphenated forms as separate tokens
         return [
             {"label": "SUM_ORG_LINE", "pattern":[{"IS_ALPHA":True, "IS_UPPER":True, "OP":"+"}]},
@@ -72,10 +245,97 @@ class GazetteNLP:
             ]}
         ]
 
+    def add_patterns(self, patterns: List[dict]) -> None:
+        """Extend gazette_ruler; drops the memoized classifications and turns the fast path off."""
+        self.nlp.get_pipe("gazette_ruler").add_patterns(patterns)
+        self._check_memo(full=True)
+
+    def _pattern_count(self) -> int:
+        return len(self.nlp.get_pipe("gazette_ruler")) if "gazette_ruler" in self.nlp.pipe_names else -1
+
+    def _pattern_hash(self) -> str:
+        if "gazette_ruler" not in self.nlp.pipe_names:
+            return ""
+        patterns = self.nlp.get_pipe("gazette_ruler").patterns
+        return hashlib.sha256(json.dumps(patterns, sort_keys=True, default=str).encode("utf-8")).hexdigest()
+
+    def _check_memo(self, full: bool = False) -> None:
+        # the ruler can also change behind our back (nlp.get_pipe("gazette_ruler").add_patterns,
+        # remove, clear). Hashing the patterns costs more than a memoized classify(), so single
+        # lines only compare the count; batches and add_patterns() compare the hash, which also
+        # catches a same-size swap
+        n = self._pattern_count()
+        if not full and n == self._memo_count:
+            return
+        self._memo_count = n
+        h = self._pattern_hash()
+        if h == self._memo_hash:
+            return
+        self._memo.clear()
+        self._memo_hash = h
+        if self.fast_path and h != self._base_hash:
+            # may_be_tagged() only knows the built-in patterns
+            logging.warning("[NLP] gazette_ruler patterns changed; fast path disabled")
+            self.fast_path = False
+
+    def clear_memo(self) -> None:
+        """Forget memoized line classifications (benchmarks: every run sees the lines for the first time)."""
+        self._memo.clear()
+
+    def memo_stats(self) -> Dict[str, Dict[str, float]]:
+        ascii_info = ascii_lower.cache_info()
+        tipo_info = normalize_tipo.cache_info()
+        return {
+            "lines": self._memo.stats(),
+            "ascii_lower": {"hits": ascii_info.hits, "misses": ascii_info.misses, "size": ascii_info.currsize},
+            "normalize_tipo": {"hits": tipo_info.hits, "misses": tipo_info.misses, "size": tipo_info.currsize},
+        }
+
     # helpers
-    def is_org_heading(self, text:str) -> bool:
+    def classify(self, text: str) -> LineInfo:
         t = text.strip()
         if not t:
-            return False
-        doc = self.nlp(t)
-        return any(ent.label_ == "SUM_ORG_LINE" for ent in doc.ents)
+            return _PLAIN
+        self._check_memo()
+        if self.fast_path and not may_be_tagged(t):
+            return _PLAIN
+        info = self._memo.get(t)
+        if info is None:
+            info = line_info(self.nlp(t))
+            self._memo.put(t, info)
+        return info
+
+    def classify_many(self, texts: Iterable[str], batch_size: int = 256) -> List[LineInfo]:
+        """Batched classify() for already stripped, non-empty texts."""
+        texts = list(texts)
+        self._check_memo(full=True)
+        out: List[LineInfo] = [_PLAIN] * len(texts)
+        todo: List[int] = []
+        for i, t in enumerate(texts):
+            if self.fast_path and not may_be_tagged(t):
+                continue
+            info = self._memo.get(t)
+            if info is None:
+                todo.append(i)
+            else:
+                out[i] = info
+        for i, doc in zip(todo, self.nlp.pipe((texts[i] for i in todo), batch_size=batch_size)):
+            out[i] = line_info(doc)
+            self._memo.put(texts[i], out[i])
+        return out
+
+    def verify_fast_path(self, texts: Iterable[str], batch_size: int = 256) -> Tuple[int, List[str]]:
+        """Differential check: (lines skipped by the fast path, lines where spaCy disagrees)."""
+        texts = [t.strip() for t in texts if t.strip()]
+        skipped = 0
+        mismatches: List[str] = []
+        for t, doc in zip(texts, self.nlp.pipe(texts, batch_size=batch_size)):
+            if may_be_tagged(t):
+                continue
+            skipped += 1
+            if line_info(doc) != _PLAIN:
+                mismatches.append(t)
+        return skipped, mismatches
+
+    def is_org_heading(self, text:str) -> bool:
+        return self.classify(text).org
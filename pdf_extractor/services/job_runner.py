@@ -0,0 +1,141 @@
+# pdf_extractor/services/job_runner.py
+from __future__ import annotations
+from typing import Any, Dict, List, Optional
+import logging
+import threading
+
+from ..config import Config
+from ..io.job_store import Job, JobStore
+from .metrics import StageTimings, record
+from .orchestrator import Pipeline
+from .worker_pool import ExtractionPool, PoolFull
+
+
+class JobRunner:
+    """
+    Worker threads draining a JobStore. With a pool, each job runs in an ExtractionPool process
+    (the threads only claim, submit and wait); without one, each thread builds its own Pipeline
+    once and runs jobs in-process. Stage progress is written back to the store either way.
+    Failed jobs are retried up to their max_attempts with retry_delay_s backoff, except bad input.
+    """
+
+    def __init__(self, store: JobStore, cfg: Config, workers: int = 1, retry_delay_s: float = 5.0,
+                 poll_s: float = 1.0, pool: Optional[ExtractionPool] = None):
+        self.store = store
+        self.cfg = cfg
+        self.pool = pool
+        self.workers = max(1, workers)
+        self.retry_delay_s = retry_delay_s
+        self.poll_s = poll_s
+        self._stop = threading.Event()
+        self._wake = threading.Event()
+        self._threads: List[threading.Thread] = []
+
+    def start(self) -> None:
+        recovered = self.store.recover()
+        if recovered:
+            logging.info(f"[JOBS] recovered {recovered} interrupted job(s)")
+        self._stop.clear()
+        for k in range(self.workers):
+            t = threading.Thread(target=self._loop, name=f"job-worker-{k}", daemon=True)
+            t.start()
+            self._threads.append(t)
+
+    def stop(self, timeout: Optional[float] = None) -> None:
+        """Let running jobs finish (up to timeout); anything still running is recovered on next start."""
+        self._stop.set()
+        self._wake.set()
+        for t in self._threads:
+            t.join(timeout)
+        self._threads = []
+
+    def notify(self) -> None:
+        """A job was queued: wake an idle worker now instead of at the next poll."""
+        self._wake.set()
+
+    def _loop(self) -> None:
+        pipe: Optional[Pipeline] = None
+        while not self._stop.is_set():
+            try:
+                job = self.store.claim()
+            except Exception:
+                logging.exception("[JOBS] claim failed")
+                job = None
+            if job is None:
+                self._wake.wait(self.poll_s)
+                self._wake.clear()
+                continue
+            if pipe is None and self.pool is None:
+                pipe = Pipeline(self.cfg)
+            self._run(pipe, job)
+
+    def _run(self, pipe: Optional[Pipeline], job: Job) -> None:
+        logging.info(f"[JOBS] {job.id} '{job.pdf_name}' attempt {job.attempts}/{job.max_attempts}")
+
+        def progress(stage: str, info: dict) -> None:
+            self.store.set_progress(job.id, stage, info)
+
+        timings = StageTimings()
+        try:
+            pdf_bytes = self.store.read_input(job.id)
+            if self.pool is None:
+                bundle = pipe.process_pdf_bytes(pdf_bytes, pdf_name=job.pdf_name, publication_date=None,
+                                                progress=progress, timings=timings)
+            else:
+                bundle = self._run_in_pool(job, pdf_bytes, timings)
+                if bundle is None:
+                    logging.info(f"[JOBS] {job.id} not started before shutdown; requeued on next start")
+                    return
+        except (ValueError, FileNotFoundError) as e:
+            # bad input (orchestrator.BadInputError, upload gone): retrying won't help
+            status = self.store.fail(job.id, f"{e.__class__.__name__}: {e}", retry=False)
+            logging.warning(f"[JOBS] {job.id} {status}: {e.__class__.__name__}: {e}")
+        except Exception as e:
+            logging.exception(f"[JOBS] {job.id} failed")
+            status = self.store.fail(job.id, f"{e.__class__.__name__}: {e}", retry=True,
+                                     retry_delay_s=self.retry_delay_s)
+            logging.info(f"[JOBS] {job.id} -> {status}")
+        else:
+            self.store.finish(job.id, bundle)
+            logging.info(f"[JOBS] {job.id} done ({len(bundle.get('docs', []))} docs)")
+        finally:
+            record(timings)  # same process as the API: shows up on /metrics
+
+    def _run_in_pool(self, job: Job, pdf_bytes: bytes, timings: StageTimings) -> Optional[Dict[str, Any]]:
+        """Bundle from a pool worker; waits while the pool is full. None when stopping first."""
+        progress = StoreProgress(str(self.store.root), job.id)
+        while True:
+            try:
+                fut = self.pool.submit("process_pdf_bytes", pdf_bytes, pdf_name=job.pdf_name,
+                                       publication_date=None, progress=progress, timings=timings)
+                break
+            except PoolFull:
+                # /extract traffic has the pool: the job stays claimed and tries again
+                if self._stop.wait(self.poll_s):
+                    return None
+        bundle, done = fut.result()
+        timings.update(done)
+        return bundle
+
+
+class StoreProgress:
+    """Pipeline progress callback that can be pickled to a pool worker: it writes to the JobStore at root from there."""
+
+    def __init__(self, root: str, job_id: str):
+        self.root = root
+        self.job_id = job_id
+
+    def __call__(self, stage: str, info: Dict[str, Any]) -> None:
+        _store(self.root).set_progress(self.job_id, stage, info)
+
+
+# per process: JobStore connections opened by StoreProgress in pool workers
+_STORES: Dict[str, JobStore] = {}
+_STORES_LOCK = threading.Lock()
+
+
+def _store(root: str) -> JobStore:
+    with _STORES_LOCK:
+        if root not in _STORES:
+            _STORES[root] = JobStore(root)
+        return _STORES[root]
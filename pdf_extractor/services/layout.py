@@ -0,0 +1,117 @@
+# pdf_extractor/services/layout.py
+from __future__ import annotations
+from dataclasses import dataclass, field
+from typing import List, Optional, Tuple
+
+import fitz  # PyMuPDF
+
+# get_text("blocks") tuple: (x0, y0, x1, y1, text, block_no, block_type)  block_type: 0 text, 1 image
+Block = Tuple[float, float, float, float, str, int, int]
+
+
+@dataclass(slots=True)
+class PageLayout:
+    blocks: List[Block]                 # reading order (text + image blocks)
+    columns: int = 1                    # 1, or 2 when a gutter was found
+    gutter: Optional[float] = None      # x of the column split
+    ok: bool = True                     # False -> reconstruction failed the quality check
+    reason: Optional[str] = None        # why it failed
+    spanning: List[Block] = field(default_factory=list)
+
+    @property
+    def text(self) -> str:
+        return "".join(b[4] for b in self.blocks if b[6] == 0).strip()
+
+
+def analyze_layout(page: fitz.Page, clip: fitz.Rect, min_column_chars: int = 40) -> PageLayout:
+    """
+    Rebuild reading order from block geometry:
+      - blocks that share a horizontal band with another block are column text; the gutter is the
+        x (near the middle) crossed by the fewest of them, with enough text on both sides
+      - blocks alone in their band that cross the gutter are full-width (headers, titles, footers)
+      - emit, band by band: left column top-down, right column top-down, then the full-width block
+    Single-column pages come back unchanged (columns=1). Two-column results must pass a quality
+    check (no column block across the gutter or beside a full-width block, enough text per column,
+    no undecodable glyphs).
+    """
+    flags = fitz.TEXTFLAGS_BLOCKS | fitz.TEXT_PRESERVE_IMAGES
+    blocks: List[Block] = list(page.get_text("blocks", clip=clip, flags=flags) or [])
+    text_blocks = [b for b in blocks if b[6] == 0 and b[4].strip()]
+    if len(text_blocks) < 2:
+        return PageLayout(blocks=blocks)
+
+    side_by_side = [b for b in text_blocks if any(o is not b and _overlap_y(o, b) for o in text_blocks)]
+    gutter = _find_gutter(side_by_side, clip, min_column_chars)
+    if gutter is None:
+        return PageLayout(blocks=blocks)
+
+    tol = 1.0
+    def crosses(b: Block) -> bool:
+        return b[0] < gutter - tol and b[2] > gutter + tol
+    left = [b for b in blocks if not crosses(b) and b[2] <= gutter + tol]
+    right = [b for b in blocks if not crosses(b) and b[2] > gutter + tol]
+    spanning = sorted((b for b in blocks if crosses(b)), key=lambda b: b[1])
+
+    # a column needs real height; a short right-aligned block (signature, date) is not a column
+    min_height = 0.20 * (clip.y1 - clip.y0)
+    for col in (left, right):
+        if sum(b[3] - b[1] for b in col if b[6] == 0) < min_height:
+            return PageLayout(blocks=blocks)
+
+    layout = PageLayout(blocks=blocks, columns=2, gutter=gutter, spanning=spanning)
+    reason = _check_quality(text_blocks, left, right, spanning, min_column_chars)
+    if reason:
+        layout.ok, layout.reason = False, reason
+        return layout
+
+    ordered: List[Block] = []
+    bounds = [b[1] for b in spanning] + [float("inf")]
+    prev = float("-inf")
+    for k, y in enumerate(bounds):
+        def in_band(b: Block) -> bool:
+            return prev <= b[1] < y
+        ordered.extend(sorted((b for b in left if in_band(b)), key=lambda b: (b[1], b[0])))
+        ordered.extend(sorted((b for b in right if in_band(b)), key=lambda b: (b[1], b[0])))
+        if k < len(spanning):
+            ordered.append(spanning[k])
+        prev = y
+    layout.blocks = ordered
+    return layout
+
+
+def _overlap_y(a: Block, b: Block, tol: float = 2.0) -> bool:
+    return a[1] < b[3] - tol and b[1] < a[3] - tol
+
+
+def _find_gutter(text_blocks: List[Block], clip: fitz.Rect, min_column_chars: int) -> Optional[float]:
+    width = clip.x1 - clip.x0
+    best: Optional[Tuple[int, float, float]] = None  # (crossing blocks, distance from centre, x)
+    centre = clip.x0 + width / 2
+    x = clip.x0 + 0.25 * width
+    while x <= clip.x0 + 0.75 * width:
+        crossing = sum(1 for b in text_blocks if b[0] < x < b[2])
+        left_chars = sum(len(b[4].strip()) for b in text_blocks if b[2] <= x)
+        right_chars = sum(len(b[4].strip()) for b in text_blocks if b[0] >= x)
+        if left_chars >= min_column_chars and right_chars >= min_column_chars:
+            cand = (crossing, abs(x - centre), x)
+            if best is None or cand < best:
+                best = cand
+        x += 2.0
+    if best is None or best[0] >= len(text_blocks) / 2:
+        return None
+    return best[2]
+
+
+def _check_quality(text_blocks: List[Block], left: List[Block], right: List[Block],
+                   spanning: List[Block], min_column_chars: int) -> Optional[str]:
+    for s in spanning:
+        if any(_overlap_y(s, b) for b in left + right):
+            return "block across the gutter beside column text"
+    for name, col in (("left", left), ("right", right)):
+        if sum(len(b[4].strip()) for b in col if b[6] == 0) < min_column_chars:
+            return f"{name} column too short"
+    text = "".join(b[4] for b in text_blocks)
+    bad = sum(1 for ch in text if ch == "\ufffd" or "\ue000" <= ch <= "\uf8ff")  # replacement / private-use
+    if bad > 0.01 * max(1, len(text)):
+        return "undecodable glyphs"
+    return None
@@ -0,0 +1,98 @@
+# pdf_extractor/services/line_index.py
+from __future__ import annotations
+from array import array
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from .gazette_nlp import GazetteNLP, LineInfo, ascii_lower
+
+
+class LineIndex:
+    """
+    Per-document line classification: every unique stripped line goes through spaCy once, in
+    batched nlp.pipe calls, and stages read the results by line number instead of re-parsing.
+      - extend() appends lines (the pipeline feeds it page by page while extraction is running)
+      - sub(start, end) is a view with local line numbers (e.g. the Sumário block)
+    Per unique line: org-heading flag, DOC_TYPE token position, header end, kind/number/year.
+    """
+
+    def __init__(self, gnlp: GazetteNLP, lines: Iterable[str] = (), batch_size: int = 256):
+        self.gnlp = gnlp
+        self.batch_size = batch_size
+        self._ids = array("i")                    # line -> unique id (-1: blank line)
+        self._uid: Dict[str, int] = {}            # stripped text -> unique id
+        # per unique id
+        self._org = array("b")
+        self._lead = array("b")
+        self._kind_pos = array("i")
+        self._last_idx = array("i")
+        self._kind: List[Optional[str]] = []
+        self._number: List[Optional[str]] = []
+        self._year: List[Optional[str]] = []
+        self._body_year: List[Optional[str]] = []
+        self.extend(lines)
+
+    def __len__(self) -> int:
+        return len(self._ids)
+
+    @property
+    def unique(self) -> int:
+        return len(self._uid)
+
+    def extend(self, lines: Iterable[str]) -> None:
+        new: List[str] = []
+        for ln in lines:
+            t = ln.strip()
+            if not t:
+                self._ids.append(-1)
+                continue
+            uid = self._uid.get(t)
+            if uid is None:
+                uid = self._uid[t] = len(self._uid)
+                new.append(t)
+            self._ids.append(uid)
+        if new:
+            for info in self.gnlp.classify_many(new, batch_size=self.batch_size):
+                self._append(info)
+
+    def _append(self, info: LineInfo) -> None:
+        self._org.append(info.org)
+        self._lead.append(info.lead)
+        self._kind_pos.append(info.kind_pos)
+        self._last_idx.append(info.last_idx)
+        self._kind.append(info.kind_text)
+        self._number.append(info.number)
+        self._year.append(info.year)
+        self._body_year.append(info.body_year)
+
+    def sub(self, start: int, end: int) -> "LineIndex":
+        """View over lines[start:end] sharing the per-line tables (read-only)."""
+        view = object.__new__(LineIndex)
+        for name in ("gnlp", "batch_size", "_uid", "_org", "_lead", "_kind_pos", "_last_idx",
+                     "_kind", "_number", "_year", "_body_year"):
+            setattr(view, name, getattr(self, name))
+        view._ids = self._ids[start:end]
+        return view
+
+    # ---------- lookups (i = line number) ----------
+
+    def is_org(self, i: int) -> bool:
+        uid = self._ids[i]
+        return uid >= 0 and bool(self._org[uid])
+
+    def starts_header(self, i: int) -> bool:
+        """DOC_TYPE with only punct/space before it (Sumário header rule)."""
+        uid = self._ids[i]
+        return uid >= 0 and bool(self._lead[uid])
+
+    def sumario_header(self, i: int) -> Tuple[Optional[str], Optional[str], Optional[str]]:
+        uid = self._ids[i]
+        if uid < 0 or not self._lead[uid]:
+            return None, None, None
+        return ascii_lower(self._kind[uid]), self._number[uid], self._year[uid]
+
+    def body_header(self, i: int) -> Tuple[Optional[str], Optional[str], Optional[str], int]:
+        """DOC_TYPE anywhere on the line (BodySlicer rule)."""
+        uid = self._ids[i]
+        if uid < 0 or self._kind_pos[uid] < 0:
+            return None, None, None, -1
+        return self._kind[uid].lower().strip(), self._number[uid], self._body_year[uid], self._last_idx[uid]
@@ -35,6 +35,7 @@ class Linker:
         logging.info(f"[LINK] sumario_items={len(items)} body_slices={len(slices)}")
         for it in items:
             key = (it.tipo or "unknown", it.number or None, it.year or None)
+            doc = f"{it.tipo} {it.number}/{it.year}"
             candidates = index.get(key, [])
             anchor = None
             for idx in candidates:
@@ -44,11 +45,11 @@ class Linker:
             if anchor is not None:
                 used.add(anchor)
                 sl = slices[anchor]
-                logging.info(f"[LINK] MATCH doc='{it.doc_name}' -> slice[{anchor}] lines = [{sl.start_line}:{sl.end_line}]")
+                logging.info(f"[LINK] MATCH doc='{doc}' -> slice[{anchor}] lines = [{sl.start_line}:{sl.end_line}]")
                 results.append(LinkResult(item=it, slice=sl, status= "matched"))
             else:
                 #no body anchor found -> keep the Sumário item (no fallback body-only docs)
-                logging.info(f"[LINK] UNMATCHED doc='{it.doc_name}' (no anchor)")
+                logging.info(f"[LINK] UNMATCHED doc='{doc}' (no anchor)")
                 results.append(LinkResult(item=it, slice=None, status="unmatched", reason="no_body_anchor"))
 
 
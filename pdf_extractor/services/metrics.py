@@ -0,0 +1,206 @@
+# pdf_extractor/services/metrics.py
+from __future__ import annotations
+from dataclasses import dataclass, field, fields
+from typing import Dict, List, Optional, Sequence, Tuple
+import bisect
+import math
+import threading
+
+# seconds; extraction of a gazette ranges from ~50 ms (digital, cache) to minutes (scanned, 300 dpi)
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0, 300.0)
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+def _fmt(v: float) -> str:
+    return "+Inf" if v == math.inf else repr(float(v))
+
+
+def _labels(names: Sequence[str], values: Tuple[str, ...], extra: str = "") -> str:
+    parts = [f'{n}="{_escape(v)}"' for n, v in zip(names, values)]
+    if extra:
+        parts.append(extra)
+    return "{" + ",".join(parts) + "}" if parts else ""
+
+
+def _escape(v: str) -> str:
+    return str(v).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+class _Metric:
+    kind = ""
+
+    def __init__(self, name: str, doc: str, labels: Sequence[str] = ()):
+        self.name = name
+        self.doc = doc
+        self.label_names = tuple(labels)
+        self._lock = threading.Lock()
+
+    def _key(self, labels: Dict[str, str]) -> Tuple[str, ...]:
+        if set(labels) != set(self.label_names):
+            raise ValueError(f"{self.name}: expected labels {self.label_names}, got {tuple(labels)}")
+        return tuple(str(labels[n]) for n in self.label_names)
+
+    def render(self) -> List[str]:
+        return [f"# HELP {self.name} {self.doc}", f"# TYPE {self.name} {self.kind}"] + self._samples()
+
+    def _samples(self) -> List[str]:
+        raise NotImplementedError
+
+
+class Counter(_Metric):
+    kind = "counter"
+
+    def __init__(self, name: str, doc: str, labels: Sequence[str] = ()):
+        super().__init__(name, doc, labels)
+        self._values: Dict[Tuple[str, ...], float] = {}
+
+    def inc(self, amount: float = 1.0, **labels: str) -> None:
+        if amount < 0:
+            raise ValueError(f"{self.name}: counters only go up")
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def value(self, **labels: str) -> float:
+        return self._values.get(self._key(labels), 0.0)
+
+    def _samples(self) -> List[str]:
+        with self._lock:
+            items = sorted(self._values.items())
+        return [f"{self.name}{_labels(self.label_names, k)} {_fmt(v)}" for k, v in items]
+
+
+class Histogram(_Metric):
+    kind = "histogram"
+
+    def __init__(self, name: str, doc: str, labels: Sequence[str] = (), buckets: Sequence[float] = DEFAULT_BUCKETS):
+        super().__init__(name, doc, labels)
+        self.buckets = tuple(sorted(buckets))
+        # label values -> (per-bucket counts (non-cumulative, last one is +Inf), sum)
+        self._values: Dict[Tuple[str, ...], Tuple[List[int], List[float]]] = {}
+
+    def observe(self, value: float, **labels: str) -> None:
+        key = self._key(labels)
+        with self._lock:
+            counts, total = self._values.setdefault(key, ([0] * (len(self.buckets) + 1), [0.0]))
+            counts[bisect.bisect_left(self.buckets, value)] += 1
+            total[0] += value
+
+    def count(self, **labels: str) -> int:
+        entry = self._values.get(self._key(labels))
+        return sum(entry[0]) if entry else 0
+
+    def _samples(self) -> List[str]:
+        with self._lock:
+            items = sorted((k, (list(c), t[0])) for k, (c, t) in self._values.items())
+        out: List[str] = []
+        for key, (counts, total) in items:
+            acc = 0
+            for le, n in zip(self.buckets + (math.inf,), counts):
+                acc += n
+                le_label = 'le="' + _fmt(le) + '"'
+                out.append(f"{self.name}_bucket{_labels(self.label_names, key, le_label)} {acc}")
+            out.append(f"{self.name}_sum{_labels(self.label_names, key)} {_fmt(total)}")
+            out.append(f"{self.name}_count{_labels(self.label_names, key)} {acc}")
+        return out
+
+
+class Registry:
+    """Process-wide set of metrics, rendered in the Prometheus text exposition format (0.0.4)."""
+
+    def __init__(self):
+        self._metrics: Dict[str, _Metric] = {}
+        self._lock = threading.Lock()
+
+    def register(self, metric: _Metric) -> _Metric:
+        with self._lock:
+            if metric.name in self._metrics:
+                raise ValueError(f"metric {metric.name} already registered")
+            self._metrics[metric.name] = metric
+        return metric
+
+    def counter(self, name: str, doc: str, labels: Sequence[str] = ()) -> Counter:
+        return self.register(Counter(name, doc, labels))
+
+    def histogram(self, name: str, doc: str, labels: Sequence[str] = (),
+                  buckets: Sequence[float] = DEFAULT_BUCKETS) -> Histogram:
+        return self.register(Histogram(name, doc, labels, buckets))
+
+    def render(self) -> str:
+        with self._lock:
+            metrics = list(self._metrics.values())
+        lines: List[str] = []
+        for m in metrics:
+            lines.extend(m.render())
+        return "\n".join(lines) + "\n"
+
+
+REGISTRY = Registry()
+
+STAGE_SECONDS = REGISTRY.histogram(
+    "pdf_extractor_stage_seconds", "Wall time per pipeline stage.", ["stage"])
+EXTRACTIONS = REGISTRY.counter(
+    "pdf_extractor_extractions_total", "process_pdf_bytes() calls, by result cache outcome (hit, miss, bypass, off).", ["cache"])
+PAGES = REGISTRY.counter(
+    "pdf_extractor_pages_total", "Pages extracted (digital or OCR).")
+OCR_PAGES = REGISTRY.counter(
+    "pdf_extractor_ocr_pages_total", "Pages sent to OCR, whole-page or by region (cache hits included).")
+OCR_SECONDS = REGISTRY.counter(
+    "pdf_extractor_ocr_seconds_total", "Render + OCR wall time (OCR cache misses only).")
+DOCS = REGISTRY.counter(
+    "pdf_extractor_docs_total", "Docs produced.")
+LINKS = REGISTRY.counter(
+    "pdf_extractor_links_total", "Sumário items by linker outcome (matched, unmatched, unanchored).", ["status"])
+HTTP_SECONDS = REGISTRY.histogram(
+    "pdf_extractor_http_request_seconds", "API request latency.", ["method", "route", "status"])
+
+
+@dataclass(slots=True)
+class StageTimings:
+    """
+    Filled in by Pipeline.process_pdf_bytes()/scan_sumario(timings=...). Plain data, so a pool
+    worker can send it back with the result; record() adds it to REGISTRY in the API process.
+    """
+    stages: Dict[str, float] = field(default_factory=dict)  # stage -> seconds, in pipeline order
+    cache: Optional[str] = None   # result cache: "hit" | "miss" | "bypass" | "off"; None for scan_sumario
+    pages: int = 0
+    ocr_pages: int = 0
+    ocr_s: float = 0.0
+    docs: int = 0
+    links: Dict[str, int] = field(default_factory=dict)  # linker status -> items
+    profile: Optional[str] = None  # id of the cProfile capture (services/profiling.py), when one was taken
+
+    def add(self, stage: str, seconds: float) -> None:
+        self.stages[stage] = self.stages.get(stage, 0.0) + seconds
+
+    def update(self, other: "StageTimings") -> None:
+        """Copy another (e.g. unpickled from a worker) into this one."""
+        for f in fields(self):
+            setattr(self, f.name, getattr(other, f.name))
+
+    def server_timing(self) -> str:
+        """Server-Timing header value (durations in ms)."""
+        parts = [f"{stage};dur={seconds * 1000:.1f}" for stage, seconds in self.stages.items()]
+        if self.ocr_s:
+            parts.append(f'ocr;desc="{self.ocr_pages} page(s)";dur={self.ocr_s * 1000:.1f}')
+        if self.cache:
+            parts.append(f'cache;desc="{self.cache}"')
+        return ", ".join(parts)
+
+
+def record(t: StageTimings) -> None:
+    for stage, seconds in t.stages.items():
+        STAGE_SECONDS.observe(seconds, stage=stage)
+    if t.cache:
+        EXTRACTIONS.inc(cache=t.cache)
+    if t.pages:
+        PAGES.inc(t.pages)
+    if t.ocr_pages:
+        OCR_PAGES.inc(t.ocr_pages)
+    if t.ocr_s:
+        OCR_SECONDS.inc(t.ocr_s)
+    if t.docs:
+        DOCS.inc(t.docs)
+    for status, n in t.links.items():
+        LINKS.inc(n, status=status)
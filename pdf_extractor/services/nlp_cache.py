@@ -0,0 +1,114 @@
+# pdf_extractor/services/nlp_cache.py
+from __future__ import annotations
+from pathlib import Path
+from typing import Any, Dict, Optional
+import hashlib
+import json
+import logging
+import os
+import shutil
+import time
+
+import spacy
+
+from .. import __version__
+from ..config import ALLOWED_TIPOS, Config
+from .gazette_nlp import GazetteNLP
+
+# bump when the on-disk layout changes
+NLP_CACHE_FORMAT = 1
+
+
+def _model_for(profile: str) -> str:
+    # same preference order as GazetteNLP._build_pipeline
+    if profile == "full":
+        for name in ("pt_core_news_lg", "pt_core_news_md", "pt_core_news_sm"):
+            version = spacy.util.get_package_version(name)
+            if version:
+                return f"{name}=={version}"
+    return "blank:pt"
+
+
+def pipeline_spec(profile: str) -> Dict[str, Any]:
+    """Everything the built pipeline depends on; its hash names the cache directory."""
+    return {
+        "format": NLP_CACHE_FORMAT,
+        "pdf_extractor": __version__,
+        "spacy": spacy.__version__,
+        "profile": profile,
+        "model": _model_for(profile),
+        "allowed_tipos": sorted(ALLOWED_TIPOS),
+        "ruler_patterns": (GazetteNLP._doctype_patterns() + GazetteNLP._num_year_patterns()
+                           + GazetteNLP._sum_org_line_patterns()),
+        "matcher_patterns": {"ORG_HEAD": GazetteNLP._org_head_patterns()},
+    }
+
+
+def pipeline_fingerprint(profile: str) -> str:
+    spec = json.dumps(pipeline_spec(profile), sort_keys=True, ensure_ascii=False)
+    return hashlib.sha256(spec.encode("utf-8")).hexdigest()
+
+
+def save_gazette_nlp(gnlp: GazetteNLP, target: Path, fingerprint: str) -> None:
+    """nlp.to_disk() + meta.json, written to a temp dir and renamed into place."""
+    target.parent.mkdir(parents=True, exist_ok=True)
+    tmp = target.with_name(f".{target.name}.{os.getpid()}.tmp")
+    shutil.rmtree(tmp, ignore_errors=True)
+    tmp.mkdir()
+    gnlp.nlp.to_disk(tmp / "nlp")
+    meta = {"fingerprint": fingerprint, "spec": pipeline_spec(gnlp.profile), "created": time.time()}
+    (tmp / "meta.json").write_text(json.dumps(meta, ensure_ascii=False, indent=2), encoding="utf-8")
+    try:
+        os.replace(tmp, target)
+    except OSError:
+        # another process got there first
+        shutil.rmtree(tmp, ignore_errors=True)
+        return
+    # drop stale builds of the same profile
+    for old in target.parent.glob(f"{gnlp.profile}-*"):
+        if old != target:
+            shutil.rmtree(old, ignore_errors=True)
+
+
+def load_gazette_nlp(cache_dir: str, profile: str = "rules", rebuild: bool = False, **kwargs) -> GazetteNLP:
+    """
+    GazetteNLP restored from <cache_dir>/<profile>-<fingerprint>/ when it exists and its meta
+    fingerprint matches; otherwise built from scratch and saved there. kwargs go to GazetteNLP.
+    """
+    t0 = time.perf_counter()
+    fingerprint = pipeline_fingerprint(profile)
+    target = Path(cache_dir) / f"{profile}-{fingerprint[:16]}"
+
+    gnlp: Optional[GazetteNLP] = None
+    if not rebuild and (target / "meta.json").exists():
+        try:
+            meta = json.loads((target / "meta.json").read_text(encoding="utf-8"))
+            if meta.get("fingerprint") == fingerprint:
+                gnlp = GazetteNLP(nlp=spacy.load(target / "nlp"), profile=profile, **kwargs)
+                gnlp.startup_source = "cache"
+        except Exception:
+            logging.exception(f"[NLP] could not load cached pipeline {target}; rebuilding")
+            gnlp = None
+
+    if gnlp is None:
+        gnlp = GazetteNLP(profile=profile, **kwargs)
+        try:
+            if target.exists():
+                shutil.rmtree(target)  # rejected above (forced, corrupt or mismatching meta)
+            save_gazette_nlp(gnlp, target, fingerprint)
+        except OSError as e:
+            # read-only image etc.: keep the freshly built pipeline
+            logging.warning(f"[NLP] could not write pipeline cache {target}: {e}")
+
+    gnlp.startup_s = time.perf_counter() - t0
+    logging.info(f"[NLP] pipeline ({profile}) {gnlp.startup_source} in {gnlp.startup_s:.3f}s [{target.name}]")
+    return gnlp
+
+
+def gazette_nlp_from_config(cfg: Config) -> GazetteNLP:
+    kwargs = dict(fast_path=cfg.nlp_fast_path, memo_size=cfg.nlp_memo_size)
+    if cfg.nlp_cache_dir:
+        return load_gazette_nlp(cfg.nlp_cache_dir, cfg.nlp_profile, **kwargs)
+    gnlp = GazetteNLP(profile=cfg.nlp_profile, **kwargs)
+    logging.info(f"[NLP] pipeline ({cfg.nlp_profile}) built in {gnlp.startup_s:.3f}s")
+    return gnlp
@@ -0,0 +1,192 @@
+# pdf_extractor/services/ocr_backend.py
+from __future__ import annotations
+from contextlib import contextmanager
+from functools import lru_cache
+from typing import Dict, Iterator, List, Optional, Union
+import logging
+import queue
+
+import fitz  # PyMuPDF
+from PIL import Image
+import pytesseract
+
+# image_to_data() returns pytesseract's Output.DICT layout (only the keys we use)
+DATA_KEYS = ("block_num", "par_num", "line_num", "word_num", "left", "top", "width", "height", "conf", "text")
+
+# what the backends OCR: a rendered page/region (its samples are handed over without copying
+# where the engine allows it) or a PIL image
+OcrImage = Union[fitz.Pixmap, Image.Image]
+
+
+def as_pil(img: OcrImage) -> Image.Image:
+    """PIL view of a pixmap's samples (no copy, no PNG encoding); the pixmap must outlive it."""
+    if isinstance(img, Image.Image):
+        return img
+    mode = {1: "L", 3: "RGB"}[img.n]
+    return Image.frombuffer(mode, (img.width, img.height), img.samples_mv, "raw", mode, img.stride, 1)
+
+
+class OcrBackend:
+    """OCR engine behind TextExtractor. Methods return None on failure instead of raising."""
+    name = "base"
+
+    def image_to_string(self, img: OcrImage) -> Optional[str]:
+        raise NotImplementedError
+
+    def image_to_data(self, img: OcrImage) -> Optional[Dict[str, list]]:
+        raise NotImplementedError
+
+    def version(self) -> str:
+        raise NotImplementedError
+
+
+class PytesseractBackend(OcrBackend):
+    """One tesseract subprocess per call (image goes through a temp file). Always available."""
+    name = "pytesseract"
+
+    def __init__(self, lang: str = "por"):
+        self.lang = lang
+        self._version: Optional[str] = None
+
+    def image_to_string(self, img: OcrImage) -> Optional[str]:
+        img = as_pil(img)
+        try:
+            return pytesseract.image_to_string(img, lang=self.lang).strip()
+        except Exception:
+            try:
+                # fallback without explicit lang
+                return pytesseract.image_to_string(img).strip()
+            except Exception:
+                # last resort: don't crash if tesseract is unavailable
+                return None
+
+    def image_to_data(self, img: OcrImage) -> Optional[Dict[str, list]]:
+        try:
+            return pytesseract.image_to_data(as_pil(img), lang=self.lang, output_type=pytesseract.Output.DICT)
+        except Exception:
+            return None
+
+    def version(self) -> str:
+        if self._version is None:
+            try:
+                self._version = str(pytesseract.get_tesseract_version())
+            except Exception:
+                self._version = "unknown"
+        return self._version
+
+
+class TesserocrPool(OcrBackend):
+    """
+    Persistent in-process tesseract engines (tesserocr): the traineddata is loaded once per engine
+    and images are handed over in memory. `size` engines are shared by threads through a queue.
+    """
+    name = "tesserocr"
+    _bytes_only = False  # this tesserocr build's SetImageBytes() rejects memoryviews (found on first use)
+
+    def __init__(self, lang: str = "por", size: int = 1, tessdata_prefix: Optional[str] = None):
+        import tesserocr  # optional dependency; ImportError -> caller falls back
+        self._tesserocr = tesserocr
+        self.lang = lang
+        self._engines: "queue.Queue" = queue.Queue()
+        kwargs = {"lang": lang}
+        if tessdata_prefix:
+            kwargs["path"] = tessdata_prefix
+        for _ in range(max(1, size)):
+            self._engines.put(tesserocr.PyTessBaseAPI(**kwargs))
+
+    @contextmanager
+    def _engine(self) -> Iterator:
+        api = self._engines.get()
+        try:
+            yield api
+        finally:
+            api.Clear()
+            self._engines.put(api)
+
+    @classmethod
+    def _set_image(cls, api, img: OcrImage) -> None:
+        if isinstance(img, fitz.Pixmap):
+            # the pixmap's own samples, with its stride: no copy of the page
+            buf = img.samples_mv
+            if not buf.contiguous:
+                buf = buf.tobytes()
+            cls._set_bytes(api, buf, img.width, img.height, img.n, img.stride)
+            return
+        # SetImage() re-encodes PIL images; raw 8-bit gray/RGB buffers can be passed as-is
+        bpp = {"L": 1, "RGB": 3}.get(img.mode)
+        if bpp is None:
+            api.SetImage(img)
+        else:
+            cls._set_bytes(api, img.tobytes(), img.width, img.height, bpp, img.width * bpp)
+
+    @classmethod
+    def _set_bytes(cls, api, buf, width: int, height: int, bpp: int, stride: int) -> None:
+        if not cls._bytes_only or isinstance(buf, bytes):
+            try:
+                api.SetImageBytes(buf, width, height, bpp, stride)
+                return
+            except TypeError:
+                if isinstance(buf, bytes):
+                    raise
+                cls._bytes_only = True  # SetImageBytes(bytes imagedata, ...): copy from now on
+        api.SetImageBytes(bytes(buf), width, height, bpp, stride)
+
+    def image_to_string(self, img: OcrImage) -> Optional[str]:
+        try:
+            with self._engine() as api:
+                self._set_image(api, img)
+                return (api.GetUTF8Text() or "").strip()
+        except Exception:
+            logging.exception("tesserocr image_to_string failed")
+            return None
+
+    def image_to_data(self, img: OcrImage) -> Optional[Dict[str, list]]:
+        RIL = self._tesserocr.RIL
+        out: Dict[str, List] = {k: [] for k in DATA_KEYS}
+        try:
+            with self._engine() as api:
+                self._set_image(api, img)
+                api.Recognize()
+                it = api.GetIterator()
+                if it is None:
+                    return out
+                block = par = line = word = 0
+                for w in self._tesserocr.iterate_level(it, RIL.WORD):
+                    box = w.BoundingBox(RIL.WORD)
+                    if box is None:
+                        continue
+                    if w.IsAtBeginningOf(RIL.BLOCK):
+                        block, par, line = block + 1, 0, 0
+                    if w.IsAtBeginningOf(RIL.PARA):
+                        par, line = par + 1, 0
+                    if w.IsAtBeginningOf(RIL.TEXTLINE):
+                        line, word = line + 1, 0
+                    word += 1
+                    x1, y1, x2, y2 = box
+                    row = (block, par, line, word, x1, y1, x2 - x1, y2 - y1,
+                           w.Confidence(RIL.WORD), w.GetUTF8Text(RIL.WORD) or "")
+                    for k, v in zip(DATA_KEYS, row):
+                        out[k].append(v)
+            return out
+        except Exception:
+            logging.exception("tesserocr image_to_data failed")
+            return None
+
+    def version(self) -> str:
+        return self._tesserocr.tesseract_version().splitlines()[0].strip()
+
+
+@lru_cache(maxsize=None)
+def get_ocr_backend(kind: str = "auto", lang: str = "por", engines: int = 1,
+                    tessdata_prefix: Optional[str] = None) -> OcrBackend:
+    """
+    Process-wide backend per settings, so engines outlive the per-request TextExtractor.
+    kind: "auto" (tesserocr if installed, else pytesseract) | "tesserocr" | "pytesseract".
+    """
+    if kind in ("auto", "tesserocr"):
+        try:
+            return TesserocrPool(lang=lang, size=engines, tessdata_prefix=tessdata_prefix)
+        except Exception as e:
+            if kind == "tesserocr":
+                logging.warning(f"[OCR] tesserocr unavailable ({e.__class__.__name__}: {e}); using pytesseract")
+    return PytesseractBackend(lang=lang)
@@ -1,69 +1,295 @@
 # pdf_extractor/services/orchestrator.py
 from __future__ import annotations
-from typing import Dict, Any, Optional
+from dataclasses import asdict
+from typing import Callable, Dict, Any, Iterator, List, Optional, Tuple
 from datetime import date
+from functools import lru_cache
+from pathlib import Path
+import hashlib
+import json
+import time
 
+import fitz  # PyMuPDF
+
+from .. import __version__
 from ..config import Config
 from ..domain.bundle import PdfBundle
-from .text_extractor import TextExtractor
-from .gazette_nlp import GazetteNLP
-from .sumario import SumarioParser
+from ..domain.doc import Doc
+from ..io.disk_cache import DiskLRUCache
+from ..io.result_cache import ResultCache
+from .text_extractor import OCR_CACHE_FORMAT, PageText, TextExtractor
+from .nlp_cache import gazette_nlp_from_config, pipeline_fingerprint
+from .line_index import LineIndex
+from .sumario import SumarioParser, SumarioRangeTracker
 from .slicer import BodySlicer
-from .linker import Linker
+from .linker import Linker, LinkResult
 from .factory import DocFactory
+from .metrics import StageTimings
+from .profiling import ProfileStore
 
 import logging
 
-DEBUG_PRINTS = True
+DEBUG_PRINTS = False
+
+# progress(stage, info): stage is "text_extraction" (info={"pages": n} after each page), "sumario",
+# "slicing" or "link_or_build"
+ProgressFn = Callable[[str, Dict[str, Any]], None]
+
+# Config fields that change the bundle (the rest is paths, workers, caches, limits)
+RESULT_CONFIG_FIELDS = (
+    "dpi", "ocr_lang", "ignore_top_percent", "skip_last_page", "ocr_adaptive", "ocr_low_dpi",
+    "ocr_min_confidence", "ocr_backend", "ocr_regions", "column_layout", "nlp_profile",
+)
+
+# source_path of bundles built from request bytes
+UPLOAD_SOURCE = "memory://upload"
+
+# the PDF itself can't be read (corrupt, empty, truncated): see BadInputError
+_BAD_INPUT_ERRORS = (ValueError, FileNotFoundError, fitz.FileDataError, fitz.mupdf.FzErrorFormat)
+
+
+class BadInputError(ValueError):
+    """
+    Text extraction failed on the input itself. A ValueError, so callers treat it as bad input
+    (API 400, /jobs don't retry) even after it was pickled back from a pool worker, where
+    __cause__ no longer holds the original exception.
+    """
+
+# package sources whose logic decides a bundle: hashed into the versions below, so a code change
+# invalidates cached results and manifest entries without a __version__ bump.
+# TEXT_SOURCES: completo.txt stems (cli/extractor.py builds those); PDF_SOURCES: process_pdf_bytes()
+TEXT_SOURCES = (
+    "config.py", "domain/bundle.py", "domain/doc.py", "domain/value_objects.py",
+    "services/gazette_nlp.py", "services/line_index.py", "services/sumario.py", "services/slicer.py",
+    "services/linker.py", "services/factory.py", "cli/extractor.py",
+)
+PDF_SOURCES = tuple(f for f in TEXT_SOURCES if f != "cli/extractor.py") + (
+    "services/text_extractor.py", "services/layout.py", "services/ocr_backend.py", "services/orchestrator.py",
+)
+
+
+@lru_cache(maxsize=None)
+def source_fingerprint(files: Tuple[str, ...]) -> str:
+    """sha256 over the given package files (line endings normalized: same hash on any checkout)."""
+    root = Path(__file__).resolve().parent.parent
+    h = hashlib.sha256()
+    for rel in files:
+        h.update(rel.encode("utf-8") + b"\0")
+        h.update((root / rel).read_bytes().replace(b"\r\n", b"\n"))
+    return h.hexdigest()
+
+
+def pipeline_version(cfg: Config) -> str:
+    """Hash of everything besides the input that determines the bundle (Pipeline.version)."""
+    spec = {
+        "pdf_extractor": __version__,
+        "ocr_cache_format": OCR_CACHE_FORMAT,
+        "nlp": pipeline_fingerprint(cfg.nlp_profile),
+        "code": source_fingerprint(PDF_SOURCES),
+        "config": {f: getattr(cfg, f) for f in RESULT_CONFIG_FIELDS},
+    }
+    return hashlib.sha256(json.dumps(spec, sort_keys=True).encode("utf-8")).hexdigest()[:16]
+
+
+def stems_version(cfg: Config) -> str:
+    """pipeline_version() for completo.txt stems: no text extraction/OCR settings involved."""
+    spec = {"nlp": pipeline_fingerprint(cfg.nlp_profile), "code": source_fingerprint(TEXT_SOURCES)}
+    return hashlib.sha256(json.dumps(spec, sort_keys=True).encode("utf-8")).hexdigest()[:16]
+
 
 class Pipeline:
     """Holds long-lived components (spaCy etc.) and runs the in-memory pipeline per request."""
     def __init__(self, cfg: Config):
         self.cfg = cfg
-        self.gnlp = GazetteNLP()
+        self.gnlp = gazette_nlp_from_config(cfg)
         self.sumario = SumarioParser(self.gnlp)
         self.slicer = BodySlicer(self.gnlp)
         self.linker = Linker()
         self.factory = DocFactory()
+        self.ocr_cache = (DiskLRUCache(cfg.ocr_cache_dir, cfg.ocr_cache_max_mb * 1024 * 1024)
+                          if cfg.ocr_cache_dir else None)
+        self.result_cache = (ResultCache(cfg.result_cache_dir, cfg.result_cache_max_mb * 1024 * 1024,
+                                         cfg.result_cache_max_age_s)
+                             if cfg.result_cache_dir else None)
+        self.profiles = (ProfileStore(cfg.profile_dir, cfg.profile_sample_rate, cfg.profile_max_files,
+                                      cfg.profile_max_mb * 1024 * 1024)
+                         if cfg.profile_dir else None)
+        self.version = pipeline_version(cfg)
+
+    def result_key(self, pdf_bytes: bytes, pdf_name: str = "upload.pdf",
+                   publication_date: Optional[date] = None, source_path: str = UPLOAD_SOURCE) -> str:
+        """Content address of a process_pdf_bytes() call (also the API's ETag)."""
+        return ResultCache.key(pdf_bytes, pdf_name, publication_date, self.version,
+                               source_path if source_path != UPLOAD_SOURCE else None)
+
+    def text_extractor(self) -> TextExtractor:
+        return TextExtractor(
+            dpi=self.cfg.dpi,
+            ocr_lang=self.cfg.ocr_lang,
+            ignore_top_percent=self.cfg.ignore_top_percent,
+            skip_last_page=self.cfg.skip_last_page,
+            workers=self.cfg.extract_workers,
+            ocr_cache=self.ocr_cache,
+            adaptive_dpi=self.cfg.ocr_adaptive,
+            low_dpi=self.cfg.ocr_low_dpi,
+            min_confidence=self.cfg.ocr_min_confidence,
+            ocr_backend=self.cfg.ocr_backend,
+            ocr_engines=self.cfg.ocr_engines,
+            ocr_regions=self.cfg.ocr_regions,
+            column_layout=self.cfg.column_layout,
+        )
 
     def process_pdf_bytes(self, pdf_bytes: bytes, pdf_name: str = "upload.pdf",
-                          publication_date: Optional[date] = None) -> Dict[str, Any]:
-        # 1) extract text (RAM)
-        try:
-            tx = TextExtractor(
-                dpi=self.cfg.dpi,
-                ocr_lang=self.cfg.ocr_lang,
-                ignore_top_percent=self.cfg.ignore_top_percent,
-                skip_last_page=self.cfg.skip_last_page,
-            ).extract(pdf_bytes)
-        except Exception as e:
-            logging.exception("stage:text_extraction failed")
-            raise RuntimeError(f"stage:text_extraction -> {e.__class__.__name__}: {e}") from e
+                          publication_date: Optional[date] = None,
+                          progress: Optional[ProgressFn] = None,
+                          timings: Optional[StageTimings] = None,
+                          profile: bool = False,
+                          source_path: str = UPLOAD_SOURCE) -> Dict[str, Any]:
+        # timings: filled in with per-stage seconds and page/OCR/doc/link counts (see metrics.record)
+        # profile: force a cProfile capture (needs cfg.profile_dir); it skips the result cache read,
+        #          a cached bundle has nothing to profile. Sampled captures (profile_sample_rate) don't.
+        # source_path: recorded in the bundle and its docs (the CLI passes the PDF's path)
+        t = timings if timings is not None else StageTimings()
+        reason = self.profiles.wanted(profile) if self.profiles is not None else None
+        if reason is None:
+            return self._process_pdf_bytes(pdf_bytes, pdf_name, publication_date, progress, t, True, source_path)
+        return self.profiles.run(self._process_pdf_bytes, pdf_bytes, pdf_name, publication_date, progress, t,
+                                 not profile, source_path, pdf_name=pdf_name, timings=t, reason=reason)
 
-        # 2) downstream pipeline over combined text
-        try:
-            lines = tx.combined.splitlines()
+    def _process_pdf_bytes(self, pdf_bytes: bytes, pdf_name: str, publication_date: Optional[date],
+                           progress: Optional[ProgressFn], t: StageTimings, read_cache: bool,
+                           source_path: str) -> Dict[str, Any]:
+        key, cached = self._cached(pdf_bytes, pdf_name, publication_date, t, read=read_cache,
+                                   source_path=source_path)
+        if cached is not None:
+            return cached
+
+        links, notes = self._link(pdf_bytes, progress, t)
+        docs = list(self._build_docs(links, pdf_name, publication_date, t, source_path))
+
+        bundle = PdfBundle(pdf_name=pdf_name, source_path=source_path, docs=docs, notes=notes)
+        out = bundle.to_json()
+        if key is not None:
+            t0 = time.perf_counter()
+            self.result_cache.put(key, out)
+            t.add("result_cache", time.perf_counter() - t0)
+        return out
+
+    def iter_docs(self, pdf_bytes: bytes, pdf_name: str = "upload.pdf",
+                  publication_date: Optional[date] = None,
+                  progress: Optional[ProgressFn] = None,
+                  timings: Optional[StageTimings] = None) -> Iterator[Dict[str, Any]]:
+        """
+        process_pdf_bytes() one doc at a time: yields each doc's to_json() as soon as DocFactory
+        builds it, then a trailer {"trailer": {"pdf_name", "notes", "docs"}}. Sumário/slicing/linking
+        still need every line first; only the docs are never held together. A cached bundle is
+        served from the result cache, but a streamed result is not stored in it.
+        """
+        t = timings if timings is not None else StageTimings()
+        _key, cached = self._cached(pdf_bytes, pdf_name, publication_date, t)
+        if cached is not None:
+            yield from cached.get("docs", [])
+            yield {"trailer": {"pdf_name": pdf_name, "notes": cached.get("notes", []), "docs": t.docs}}
+            return
+
+        links, notes = self._link(pdf_bytes, progress, t)
+        for doc in self._build_docs(links, pdf_name, publication_date, t, UPLOAD_SOURCE):
+            yield doc.to_json()
+        yield {"trailer": {"pdf_name": pdf_name, "notes": notes, "docs": t.docs}}
+
+    def _cached(self, pdf_bytes: bytes, pdf_name: str, publication_date: Optional[date],
+                t: StageTimings, read: bool = True,
+                source_path: str = UPLOAD_SOURCE) -> Tuple[Optional[str], Optional[Dict[str, Any]]]:
+        """(result cache key or None, cached bundle or None); read=False only computes the key."""
+        t.cache = "off"
+        if self.result_cache is None:
+            return None, None
+        t0 = time.perf_counter()
+        key = self.result_key(pdf_bytes, pdf_name, publication_date, source_path)
+        if not read:
+            t.cache = "bypass"
+            return key, None
+        cached = self.result_cache.get(key)
+        t.add("result_cache", time.perf_counter() - t0)
+        t.cache = "miss"
+        if cached is not None:
+            if DEBUG_PRINTS:
+                logging.info(f"[CACHE] result hit {key[:12]} ({pdf_name})")
+            t.cache = "hit"
+            t.docs = len(cached.get("docs", []))
+        return key, cached
+
+    def _link(self, pdf_bytes: bytes, progress: Optional[ProgressFn],
+              t: StageTimings) -> Tuple[List[LinkResult], List[str]]:
+        """Text extraction, Sumário, slicing and linking: (links, notes)."""
+        # 1) extract text page by page (RAM); each page's lines are classified (one spaCy pass per
+        #    unique line) and fed to the Sumário range tracker as they arrive, overlapping with the
+        #    OCR of later pages
+        lines: List[str] = []
+        notes: List[str] = []
+        ocr_pages: List[int] = []
+        ocr_bytes: Dict[int, int] = {}
+        splitter = _LineSplitter()
+        index = LineIndex(self.gnlp)
+        tracker = SumarioRangeTracker(self.sumario, index)
+        n_pages = 0
+
+        # text_extraction = time spent waiting for the next page (render/OCR); line_index and the
+        # tracker's share of sumario are timed in _feed_lines
+        t0 = time.perf_counter()
+        for pg in self._pages(pdf_bytes):
+            t.add("text_extraction", time.perf_counter() - t0)
+            n_pages += 1
+            notes.extend(pg.notes)
+            if pg.ocr_jobs:
+                t.ocr_pages += 1
+                t.ocr_s += pg.ocr_s
+            if pg.ocr:
+                ocr_pages.append(pg.index)
+            if pg.ocr_bytes:
+                ocr_bytes[pg.index] = pg.ocr_bytes
+            # pages are joined with a blank line, exactly like TextExtractionResult.combined
+            self._feed_lines(splitter.feed(("\n\n" if pg.index else "") + pg.text), lines, index, tracker, t)
+            if progress:
+                progress("text_extraction", {"pages": n_pages})
+            t0 = time.perf_counter()
+        t.add("text_extraction", time.perf_counter() - t0)
+        t.pages = n_pages
+        self._feed_lines(splitter.flush(), lines, index, tracker, t)
+        if n_pages == 0:
+            notes.append("no pages")
 
-            sum_start, sum_end = self.sumario.find_range(lines)
+        if DEBUG_PRINTS and self.ocr_cache is not None:
+            logging.info(f"[OCR] pages={ocr_pages} cache={self.ocr_cache.stats()}")
+        if DEBUG_PRINTS and ocr_bytes:
+            logging.info(f"[OCR] pixmap bytes per page: {ocr_bytes}")
+
+        # 2) downstream pipeline over the collected lines
+        if progress:
+            progress("sumario", {"pages": n_pages})
+        t0 = time.perf_counter()
+        try:
+            sum_start, sum_end = tracker.result(len(lines))
             sum_lines = lines[sum_start:sum_end] if (sum_start is not None and sum_end is not None) else []
-            items = self.sumario.parse_items(sum_lines)
+            items = self.sumario.parse_items(sum_lines, index.sub(sum_start, sum_end) if sum_lines else None)
 
             if DEBUG_PRINTS:
+                logging.info(f"[NLP] lines={len(lines)} unique={index.unique} memo={self.gnlp.memo_stats()['lines']}")
                 rng = f"{sum_start}..{(sum_end-1) if (sum_start is not None and sum_end is not None ) else 'N/A'}"
                 logging.info(f"[SUMARIO] range: {rng}, items: {len(items)}")
                 for idx, it in enumerate(items[:50], 1): # cap output
                     # support both SumarioItem (tipo/number/year) and SumarioDoc (doc_name)
                     doc_name = getattr(it, "doc_name", None)
                     if not doc_name:
-                        t = getattr(it, "tipo", "") or ""
-                        n = getattr(it, "number", "") or ""
-                        y = getattr(it, "year", "") or ""
-                        if n and y:
-                            doc_name = f"{t} {n}/{y}"
-                        elif n:
-                            doc_name = f"{t} {n}"
+                        tipo_s = getattr(it, "tipo", "") or ""
+                        num_s = getattr(it, "number", "") or ""
+                        year_s = getattr(it, "year", "") or ""
+                        if num_s and year_s:
+                            doc_name = f"{tipo_s} {num_s}/{year_s}"
+                        elif num_s:
+                            doc_name = f"{tipo_s} {num_s}"
                         else:
-                            doc_name = t
+                            doc_name = tipo_s
                     primary_org = getattr(it, "primary_org", None) or getattr(it, "section_sumario", None)
                     logging.info(f"[SUMARIO] {idx:02d} doc='{doc_name}' org='{primary_org}' header='{it.text[:120].replace(chr(10),' ')}'")
                             
@@ -71,11 +297,15 @@ class Pipeline:
         except Exception as e:
             logging.exception("stage:sumario failed")
             raise RuntimeError(f"stage:sumario -> {e.__class__.__name__}: {e}") from e
+        t.add("sumario", time.perf_counter() - t0)
         
+        if progress:
+            progress("slicing", {"pages": n_pages})
+        t0 = time.perf_counter()
         try:      
             exclude = (sum_start, sum_end) if (sum_start is not None and sum_end is not None) else None
-            header_lines = self.slicer.detect_headers(lines, exclude)
-            slices = self.slicer.slices(lines, header_lines, exclude)
+            header_lines = self.slicer.detect_headers(lines, exclude, index)
+            slices = self.slicer.slices(lines, header_lines, exclude, index)
 
             if DEBUG_PRINTS:
                 logging.info(f"[SLICER] headers detected: {len(header_lines)}; slices build: {len(slices)}")
@@ -86,15 +316,146 @@ class Pipeline:
         except Exception as e:
             logging.exception("stage:slicing failed")
             raise RuntimeError(f"stage:slicing -> {e.__class__.__name__}: {e}") from e
+        t.add("slicing", time.perf_counter() - t0)
         
+        if progress:
+            progress("link_or_build", {"pages": n_pages})
+        t0 = time.perf_counter()
         try:
-        
             links = self.linker.link(items, slices)
-            docs = [self.factory.build(lk, pdf_name=pdf_name, source_path="memory://upload", publication_date=publication_date)
-                    for lk in links]
         except Exception as e:
             logging.exception("stage:link_or_build failed")
             raise RuntimeError(f"stage:link_or_build -> {e.__class__.__name__}: {e}") from e
+        t.add("link_or_build", time.perf_counter() - t0)
+        for lk in links:
+            t.links[lk.status] = t.links.get(lk.status, 0) + 1
+        return links, notes
+
+    def _build_docs(self, links: List[LinkResult], pdf_name: str, publication_date: Optional[date],
+                    t: StageTimings, source_path: str) -> Iterator[Doc]:
+        """One Doc per link, built lazily (build time counts towards link_or_build)."""
+        for lk in links:
+            t0 = time.perf_counter()
+            try:
+                doc = self.factory.build(lk, pdf_name=pdf_name, source_path=source_path,
+                                         publication_date=publication_date)
+            except Exception as e:
+                logging.exception("stage:link_or_build failed")
+                raise RuntimeError(f"stage:link_or_build -> {e.__class__.__name__}: {e}") from e
+            t.add("link_or_build", time.perf_counter() - t0)
+            t.docs += 1
+            yield doc
+
+    def scan_sumario(self, pdf_bytes: bytes, pdf_name: str = "upload.pdf",
+                     timings: Optional[StageTimings] = None) -> Dict[str, Any]:
+        """
+        Quick scan for consumers that only need the list of acts: pages are extracted lazily and
+        extraction stops as soon as the Sumário block is closed; no body headers, slices or links.
+        """
+        t = timings if timings is not None else StageTimings()
+        lines: List[str] = []
+        notes: List[str] = []
+        splitter = _LineSplitter()
+        index = LineIndex(self.gnlp)
+        tracker = SumarioRangeTracker(self.sumario, index)
+        n_pages = 0
+
+        pages = self._pages(pdf_bytes)
+        t0 = time.perf_counter()
+        try:
+            for pg in pages:
+                t.add("text_extraction", time.perf_counter() - t0)
+                n_pages += 1
+                notes.extend(pg.notes)
+                if pg.ocr_jobs:
+                    t.ocr_pages += 1
+                    t.ocr_s += pg.ocr_s
+                new_lines = splitter.feed(("\n\n" if pg.index else "") + pg.text)
+                if self._feed_lines(new_lines, lines, index, tracker, t):
+                    break
+                t0 = time.perf_counter()
+            else:
+                t.add("text_extraction", time.perf_counter() - t0)
+                self._feed_lines(splitter.flush(), lines, index, tracker, t)
+        finally:
+            pages.close()  # cancels OCR of pages we no longer need
+        t.pages = n_pages
+
+        t0 = time.perf_counter()
+        try:
+            sum_start, sum_end = tracker.result(len(lines))
+            sum_lines = lines[sum_start:sum_end] if (sum_start is not None and sum_end is not None) else []
+            items = self.sumario.parse_items(sum_lines, index.sub(sum_start, sum_end) if sum_lines else None)
+        except Exception as e:
+            logging.exception("stage:sumario failed")
+            raise RuntimeError(f"stage:sumario -> {e.__class__.__name__}: {e}") from e
+        t.add("sumario", time.perf_counter() - t0)
+
+        if DEBUG_PRINTS:
+            logging.info(f"[SUMARIO] quick scan: pages={n_pages} closed={tracker.closed} items={len(items)}")
+        return {
+            "pdf_name": pdf_name,
+            "pages_scanned": n_pages,
+            "notes": notes,
+            "items": [asdict(it) for it in items],
+        }
+
+    def _pages(self, pdf_bytes: bytes) -> Iterator[PageText]:
+        pages = self.text_extractor().iter_pages(pdf_bytes)
+        try:
+            while True:
+                try:
+                    pg = next(pages, None)
+                except Exception as e:
+                    logging.exception("stage:text_extraction failed")
+                    error = BadInputError if isinstance(e, _BAD_INPUT_ERRORS) else RuntimeError
+                    raise error(f"stage:text_extraction -> {e.__class__.__name__}: {e}") from e
+                if pg is None:
+                    return
+                yield pg
+        finally:
+            pages.close()
+
+    def _feed_lines(self, new_lines: List[str], lines: List[str], index: LineIndex,
+                    tracker: SumarioRangeTracker, timings: StageTimings) -> bool:
+        """Append, classify and track a batch of lines; True once the Sumário block is closed."""
+        first = len(lines)
+        lines.extend(new_lines)
+        t0 = time.perf_counter()
+        try:
+            index.extend(new_lines)
+        except Exception as e:
+            logging.exception("stage:line_index failed")
+            raise RuntimeError(f"stage:line_index -> {e.__class__.__name__}: {e}") from e
+        t1 = time.perf_counter()
+        timings.add("line_index", t1 - t0)
+        try:
+            for i in range(first, len(lines)):
+                if tracker.push(i, lines[i]):
+                    return True
+        except Exception as e:
+            logging.exception("stage:sumario failed")
+            raise RuntimeError(f"stage:sumario -> {e.__class__.__name__}: {e}") from e
+        finally:
+            timings.add("sumario", time.perf_counter() - t1)
+        return False
+
+
+class _LineSplitter:
+    """Incremental str.splitlines(): feed chunks, get the lines completed so far."""
+
+    def __init__(self):
+        self._tail = ""
+
+    def feed(self, chunk: str) -> List[str]:
+        parts = (self._tail + chunk).splitlines(keepends=True)
+        if parts and (parts[-1].splitlines()[0] == parts[-1] or parts[-1].endswith("\r")):
+            # no line break yet, or a "\r" the next chunk may turn into "\r\n": wait for more text
+            self._tail = parts.pop()
+        else:
+            self._tail = ""
+        return [p.splitlines()[0] for p in parts]
 
-        bundle = PdfBundle(pdf_name=pdf_name, source_path="memory://upload", docs=docs, notes=list(tx.notes))
-        return bundle.to_json()
+    def flush(self) -> List[str]:
+        tail, self._tail = self._tail, ""
+        return tail.splitlines()
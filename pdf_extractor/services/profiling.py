@@ -0,0 +1,121 @@
+# pdf_extractor/services/profiling.py
+from __future__ import annotations
+from dataclasses import asdict
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+import cProfile
+import json
+import logging
+import os
+import pstats
+import random
+import threading
+import time
+import uuid
+
+from .metrics import StageTimings
+
+TOP_FUNCTIONS = 25  # summarized in the .json next to each profile
+
+
+class ProfileStore:
+    """
+    Opt-in cProfile capture of single extractions. Each capture is <root>/<id>.prof (pstats dump:
+    `python -m pstats`, snakeviz, ...) plus <id>.json with pdf_name, why it was taken, the
+    StageTimings breakdown and the top functions by cumulative time. Oldest captures are removed
+    beyond max_files / max_bytes.
+
+    A call is profiled when forced (request header, CLI flag) or picked at sample_rate; otherwise
+    wanted() is a single random() draw (nothing at all with sample_rate 0).
+    """
+
+    def __init__(self, root: str, sample_rate: float = 0.0, max_files: int = 200, max_bytes: int = 256 * 1024 * 1024):
+        self.root = Path(root)
+        self.root.mkdir(parents=True, exist_ok=True)
+        self.sample_rate = max(0.0, min(1.0, sample_rate))
+        self.max_files = max(1, max_files)
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+
+    def wanted(self, force: bool = False) -> Optional[str]:
+        """Why this call should be profiled ("forced" | "sampled"), or None."""
+        if force:
+            return "forced"
+        if self.sample_rate and random.random() < self.sample_rate:
+            return "sampled"
+        return None
+
+    def run(self, fn: Callable[..., Any], *args: Any, pdf_name: str, timings: StageTimings, reason: str,
+            **kwargs: Any) -> Any:
+        """fn(*args, **kwargs) under cProfile; the capture id ends up in timings.profile."""
+        prof = cProfile.Profile()
+        try:
+            prof.enable()
+        except ValueError:
+            # another profiler is active (3.12+ allows one per process): run unprofiled
+            logging.warning(f"[PROFILE] profiler busy, not profiling {pdf_name}")
+            return fn(*args, **kwargs)
+        t0 = time.perf_counter()
+        error: Optional[str] = None
+        try:
+            return fn(*args, **kwargs)
+        except Exception as e:
+            error = f"{e.__class__.__name__}: {e}"
+            raise
+        finally:
+            prof.disable()
+            elapsed = time.perf_counter() - t0
+            try:
+                timings.profile = self._save(prof, pdf_name, reason, timings, elapsed, error)
+            except OSError:
+                logging.exception(f"[PROFILE] could not save the profile of {pdf_name}")
+
+    def _save(self, prof: cProfile.Profile, pdf_name: str, reason: str, timings: StageTimings,
+              elapsed: float, error: Optional[str]) -> str:
+        profile_id = f"{time.strftime('%Y%m%dT%H%M%S')}-{uuid.uuid4().hex[:8]}"
+        path = self.root / f"{profile_id}.prof"
+        tmp = path.with_name(f".{path.name}.tmp")
+        prof.dump_stats(str(tmp))
+        os.replace(tmp, path)
+
+        meta = {
+            "id": profile_id,
+            "pdf_name": pdf_name,
+            "reason": reason,
+            "created": time.time(),
+            "total_s": round(elapsed, 6),
+            "error": error,
+            "timings": asdict(timings),
+            "top": _top_functions(prof, TOP_FUNCTIONS),
+        }
+        (self.root / f"{profile_id}.json").write_text(json.dumps(meta, ensure_ascii=False, indent=2), encoding="utf-8")
+        logging.info(f"[PROFILE] {pdf_name} ({reason}, {elapsed:.2f}s) -> {path}")
+        self._prune()
+        return profile_id
+
+    def _prune(self) -> None:
+        with self._lock:
+            captures = []
+            for prof in self.root.glob("*.prof"):
+                try:
+                    st = prof.stat()
+                    size = st.st_size + prof.with_suffix(".json").stat().st_size
+                except FileNotFoundError:
+                    continue  # pruned by another process (or its .json is not written yet)
+                captures.append((st.st_mtime, prof, size))
+            captures.sort(key=lambda c: c[0], reverse=True)  # newest first
+            total = 0
+            for k, (_mtime, prof, size) in enumerate(captures):
+                total += size
+                if k >= self.max_files or total > self.max_bytes:
+                    prof.unlink(missing_ok=True)
+                    prof.with_suffix(".json").unlink(missing_ok=True)
+
+
+def _top_functions(prof: cProfile.Profile, n: int) -> List[Dict[str, Any]]:
+    stats = pstats.Stats(prof).stats  # {(file, line, func): (primitive calls, calls, tottime, cumtime, callers)}
+    rows = sorted(stats.items(), key=lambda kv: kv[1][3], reverse=True)[:n]
+    return [
+        {"function": f"{file}:{line}({func})", "calls": nc, "tottime_s": round(tt, 6), "cumtime_s": round(ct, 6)}
+        for (file, line, func), (_cc, nc, tt, ct, _callers) in rows
+    ]
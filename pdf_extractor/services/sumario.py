@@ -5,6 +5,7 @@ from typing import List, Optional, Tuple
 import unicodedata
 
 from .gazette_nlp import GazetteNLP, ascii_lower
+from .line_index import LineIndex
 
 
 @dataclass(frozen=True, slots=True)
@@ -20,49 +21,74 @@ class SumarioItem:
     section_orgs: Tuple[str, ...] = tuple()      # all orgs parsed from the block (ordered, deduped)
 
 
+class SumarioRangeTracker:
+    """
+    find_range() fed one line at a time (lines may still be arriving from the extractor):
+      1) locate "Sumário" / "Sumario"
+      2) pick first ORG heading after Sumário as anchor A, then the next occurrence of the same heading as end
+    push() returns True once the end is known; result() applies the fallbacks once all lines are in.
+    With an index, line i must already be in it when pushed.
+    """
+
+    def __init__(self, parser: "SumarioParser", index: Optional[LineIndex] = None):
+        self.gnlp = parser.gnlp
+        self.index = index
+        self.start: Optional[int] = None
+        self.end: Optional[int] = None
+        self._target: Optional[str] = None          # ascii-lower anchor heading
+        self._next_org: Optional[int] = None        # fallback end: next org heading after the anchor
+
+    @property
+    def closed(self) -> bool:
+        return self.end is not None
+
+    def push(self, i: int, line: str) -> bool:
+        if self.end is not None:
+            return True
+        if self.start is None:
+            if ascii_lower(line.strip()) in ("sumario", "sumário"):
+                self.start = i
+            return False
+        if self._target is None:
+            if self._is_org(i, line):
+                self._target = ascii_lower(line.strip())
+            return False
+        if ascii_lower(line.strip()) == self._target:
+            self.end = i
+            return True
+        if self._next_org is None and i < self.start + 150 and self._is_org(i, line):
+            self._next_org = i
+        return False
+
+    def result(self, n_lines: int) -> Tuple[Optional[int], Optional[int]]:
+        if self.start is None:
+            return None, None
+        if self._target is None:
+            # fallback: cap block size
+            return self.start, min(n_lines, self.start + 120)
+        if self.end is not None:
+            return self.start, self.end
+        # fallback: stop at the next org heading or cap
+        if self._next_org is not None:
+            return self.start, self._next_org
+        return self.start, min(n_lines, self.start + 150)
+
+    def _is_org(self, i: int, line: str) -> bool:
+        if self.index is not None:
+            return self.index.is_org(i)
+        return self.gnlp.is_org_heading(line)
+
+
 class SumarioParser:
     def __init__(self, nlp: GazetteNLP):
         self.gnlp = nlp
 
-    def find_range(self, lines: List[str]) -> Tuple[Optional[int], Optional[int]]:
-        # 1) locate "Sumário" / "Sumario"
-        start = None
+    def find_range(self, lines: List[str], index: Optional[LineIndex] = None) -> Tuple[Optional[int], Optional[int]]:
+        tracker = SumarioRangeTracker(self, index)
         for i, ln in enumerate(lines):
-            if ascii_lower(ln.strip()) in ("sumario", "sumário"):
-                start = i
+            if tracker.push(i, ln):
                 break
-        if start is None:
-            return None, None
-
-        # 2) pick first ORG heading after Sumário as anchor A, then the next occurrence of the same heading as end.
-        first_org = None
-        j = start + 1
-        while j < len(lines):
-            if self.gnlp.is_org_heading(lines[j]):
-                first_org = lines[j].strip()
-                break
-            j += 1
-        if first_org is None:
-            # fallback: cap block size
-            return start, min(len(lines), start + 120)
-
-        target = ascii_lower(first_org)
-        end = None
-        k = j + 1
-        while k < len(lines):
-            if ascii_lower(lines[k].strip()) == target:
-                end = k
-                break
-            k += 1
-        if end is None:
-            # fallback: stop at the next org heading or cap
-            for k in range(j + 1, min(len(lines), start + 150)):
-                if self.gnlp.is_org_heading(lines[k]):
-                    end = k
-                    break
-        if end is None:
-            end = min(len(lines), start + 150)
-        return start, end
+        return tracker.result(len(lines))
 
     # ---------- helpers ----------
 
@@ -74,58 +100,22 @@ class SumarioParser:
           - DOC_NUM: any entity with digits; we keep only digits.
           - DOC_YEAR: 4-digit number in a plausible range (1900..2100).
         """
-        t = text.strip()
-        if not t:
-            return None, None, None
-
-        doc = self.gnlp.nlp(t)
-
-        # Find a DOC_TYPE whose preceding tokens are only punct/space
-        kind_ent = None
-        for e in doc.ents:
-            if e.label_ != "DOC_TYPE":
-                continue
-            if all((tok.is_punct or tok.is_space) for tok in doc[:e.start]):
-                kind_ent = e
-                break
-        if not kind_ent:
-            return None, None, None
-
-        tipo = doc[kind_ent.start:kind_ent.end].text
-        # normalize tipo to ascii-lower
-        tipo = unicodedata.normalize("NFKD", tipo).encode("ascii", "ignore").decode("ascii").lower().strip()
-
-        number = None
-        year = None
-        for e in doc.ents:
-            if e.label_ == "DOC_NUM":
-                digits = "".join(ch for ch in e.text if ch.isdigit())
-                if digits:
-                    number = digits
-            elif e.label_ == "DOC_YEAR":
-                y = "".join(ch for ch in e.text if ch.isdigit())
-                if len(y) == 4:
-                    yi = int(y)
-                    if 1900 <= yi <= 2100:
-                        year = y
-
-        return (tipo, number, year)
+        return self.gnlp.classify(text).sumario_header()
 
     def _line_starts_header(self, text: str) -> bool:
         """Header if spaCy finds a DOC_TYPE with only punct/space before it."""
-        doc = self.gnlp.nlp(text.strip())
-        for e in doc.ents:
-            if e.label_ == "DOC_TYPE" and all((t.is_punct or t.is_space) for t in doc[:e.start]):
-                return True
-        return False
+        return self.gnlp.classify(text).lead
 
-    def _consume_org_block(self, sum_lines: List[str], start_idx: int) -> tuple[str, Tuple[int, int], int]:
+    def _consume_org_block(self, sum_lines: List[str], start_idx: int,
+                           index: Optional[LineIndex] = None) -> tuple[str, Tuple[int, int], int]:
         """Consume contiguous ORG heading lines (trust spaCy is_org_heading) starting at start_idx."""
+        if index is None:
+            index = LineIndex(self.gnlp, sum_lines)
         parts: List[str] = []
         i = start_idx
         while i < len(sum_lines):
             raw = sum_lines[i].strip()
-            if not raw or not self.gnlp.is_org_heading(raw):
+            if not raw or not index.is_org(i):
                 break
             parts.append(raw)
             i += 1
@@ -139,7 +129,7 @@ class SumarioParser:
         """
         if not raw_block:
             return []
-        doc = self.gnlp.nlp(raw_block)
+        doc = self.gnlp.nlp.make_doc(raw_block)  # only the tokens are used
         names: List[str] = []
         current: List[str] = []
         for tok in doc:
@@ -165,11 +155,14 @@ class SumarioParser:
 
     # ---------- main ----------
 
-    def parse_items(self, sum_lines: List[str]) -> List[SumarioItem]:
+    def parse_items(self, sum_lines: List[str], index: Optional[LineIndex] = None) -> List[SumarioItem]:
         """
         Trust spaCy for both ORG headings and headers.
         Title now captures ALL lines until the next header or next ORG block (does NOT stop on blanks).
+        `index` must cover sum_lines with local line numbers (LineIndex.sub()); built here if missing.
         """
+        if index is None:
+            index = LineIndex(self.gnlp, sum_lines)
         items: List[SumarioItem] = []
         current_org_raw: Optional[str] = None
         current_orgs: List[str] = []
@@ -182,23 +175,23 @@ class SumarioParser:
                 continue
 
             # ORG block inside Sumário (spaCy-driven)
-            if self.gnlp.is_org_heading(raw):
-                block_raw, _rng, next_i = self._consume_org_block(sum_lines, i)
+            if index.is_org(i):
+                block_raw, _rng, next_i = self._consume_org_block(sum_lines, i, index)
                 current_org_raw = block_raw
                 current_orgs = self._split_block_orgs(block_raw)
                 i = next_i
                 continue
 
-            tipo, number, year = self._extract_kind_num_year(raw)
+            tipo, number, year = index.sumario_header(i)
             if tipo:
                 # Capture ALL following lines until next header or next ORG (do not stop on blanks)
                 lead_lines: List[str] = []
                 j = i + 1
                 while j < len(sum_lines):
                     nxt = sum_lines[j]
-                    if self.gnlp.is_org_heading(nxt.strip()):
+                    if index.is_org(j):
                         break
-                    if self._line_starts_header(nxt):
+                    if index.starts_header(j):
                         break
                     lead_lines.append(nxt.rstrip())
                     j += 1
@@ -1,14 +1,25 @@
 # pdf_extractor/services/text_extractor.py
 from __future__ import annotations
-from dataclasses import dataclass
-from typing import List, Optional
-import io
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor
+from dataclasses import dataclass, field
+from typing import Deque, Dict, Iterator, List, Optional, Tuple, Union
+import hashlib
+import json
+import multiprocessing
 import os
+import time
 
 import fitz  # PyMuPDF
-from PIL import Image
 import pytesseract
 
+from ..io.disk_cache import DiskLRUCache
+from .layout import PageLayout, analyze_layout
+from .ocr_backend import OcrBackend, get_ocr_backend
+
+# bump when the cached OCR value format (or what goes into the key) changes
+OCR_CACHE_FORMAT = 3
+
 
 @dataclass(slots=True)
 class TextExtractionResult:
@@ -17,6 +28,36 @@ class TextExtractionResult:
     combined: str             # all pages joined with \n\n
     ocr_pages: List[int]      # 0-based page indices that were OCR’d
     notes: List[str]          # informational notes (e.g., "forced OCR on page 2")
+    ocr_bytes: Dict[int, int] = field(default_factory=dict)  # page index -> pixmap bytes rendered for OCR
+
+
+@dataclass(slots=True)
+class PageText:
+    index: int                # 0-based page index
+    text: str
+    ocr: bool                 # whole page OCR'd
+    notes: List[str]
+    ocr_bytes: int = 0        # pixmap bytes rendered for this page
+    ocr_jobs: int = 0         # OCR passes: 1 for a whole page, one per region (cache hits included)
+    ocr_s: float = 0.0        # seconds spent rendering + OCR'ing this page (0 on cache hits)
+
+
+@dataclass(slots=True)
+class _PagePlan:
+    index: int
+    text: str = ""
+    ocr: bool = False
+    notes: List[str] = field(default_factory=list)
+    jobs: List["_OcrJob"] = field(default_factory=list)
+    parts: Optional[List[Union[str, int]]] = None  # region OCR: digital texts / indices into jobs
+
+
+@dataclass(slots=True)
+class OcrText:
+    text: str
+    dpi: str                  # DPI used: "300"; adaptive: "150", "150>300" (page), "150>300[2]" (2 regions)
+    pixmap_bytes: int = 0     # render buffers allocated for this page (0 on a cache hit)
+    seconds: float = 0.0      # render + OCR wall time (0 on a cache hit)
 
 
 class TextExtractor:
@@ -25,7 +66,18 @@ class TextExtractor:
       - Optionally ignores the top N% of each page (to drop headers)
       - Optionally skips the last page entirely
       - Tries digital text first; falls back to OCR if text is empty/very short
-      - Special case for page 2: if it looks like mixed one-col header + two-col body, force OCR
+      - Multi-column pages are emitted in column reading order rebuilt from block geometry
+      - Special case for page 2: if it looks like mixed one-col header + two-col body and the
+        column reconstruction fails its quality check, force OCR
+      - Pages can be consumed one by one as they finish (iter_pages) or all at once (extract)
+      - With workers > 1, page rendering + OCR run in a process pool (results keep page order)
+      - With an ocr_cache, OCR text is looked up by page content before anything is rendered
+      - OCR goes through an OcrBackend: persistent tesserocr engines when installed,
+        else a pytesseract subprocess per call
+      - With ocr_regions, digital pages keep their text and only embedded image blocks
+        (scanned annexes, stamps) are rasterized + OCR'd, merged back in block order
+      - With adaptive_dpi, OCR runs at low_dpi first and only re-renders the page (or just its
+        low-confidence blocks) at dpi when tesseract's word confidences are poor
     """
 
     def __init__(
@@ -37,49 +89,81 @@ class TextExtractor:
         tesseract_cmd: Optional[str] = None,
         tessdata_prefix: Optional[str] = None,
         min_digital_chars: int = 3,  # threshold to decide fallback OCR
+        workers: int = 1,            # >1 -> OCR pages in a process pool
+        ocr_cache: Optional[DiskLRUCache] = None,
+        adaptive_dpi: bool = False,
+        low_dpi: int = 150,
+        min_confidence: float = 75.0,  # mean word confidence (0..100) accepted at low_dpi
+        ocr_backend: str = "auto",     # "auto" | "tesserocr" | "pytesseract"
+        ocr_engines: int = 1,          # persistent engines per process (tesserocr)
+        ocr_regions: bool = False,     # OCR image blocks on digital pages
+        min_region_fraction: float = 0.02,  # ignore image blocks smaller than this share of the clip
+        column_layout: bool = True,    # rebuild column reading order from block geometry
     ):
         self.dpi = dpi
         self.ocr_lang = ocr_lang
         self.ignore_top_percent = max(0.0, min(1.0, ignore_top_percent))
         self.skip_last_page = skip_last_page
         self.min_digital_chars = min_digital_chars
+        self.workers = max(1, workers)
+        self.ocr_cache = ocr_cache
+        self.adaptive_dpi = adaptive_dpi and low_dpi < dpi
+        self.low_dpi = low_dpi
+        self.min_confidence = min_confidence
+        self.tesseract_cmd = tesseract_cmd
+        self.tessdata_prefix = tessdata_prefix
+        self.ocr_backend = ocr_backend
+        self.ocr_engines = ocr_engines
+        self.ocr_regions = ocr_regions
+        self.min_region_fraction = min_region_fraction
+        self.column_layout = column_layout
 
         if tesseract_cmd:
             pytesseract.pytesseract.tesseract_cmd = tesseract_cmd
         if tessdata_prefix:
             os.environ["TESSDATA_PREFIX"] = tessdata_prefix
 
+    @property
+    def ocr(self) -> OcrBackend:
+        # shared per process (engines load the language model once), resolved lazily so that
+        # digital-only documents never start an engine
+        return get_ocr_backend(self.ocr_backend, self.ocr_lang, self.ocr_engines, self.tessdata_prefix)
+
     # Single public entrypoint for API usage (bytes only)
     def extract(self, pdf_bytes: bytes) -> TextExtractionResult:
-        notes: List[str] = []
-        ocr_pages: List[int] = []
-        page_texts: List[str] = []
+        return self._collect(self.iter_pages(pdf_bytes))
+
+    def extract_path(self, pdf_path: str) -> TextExtractionResult:
+        """Same as extract(), but pool workers re-open the file instead of receiving the bytes."""
+        return self._collect(self.iter_pages_path(pdf_path))
 
+    def iter_pages(self, pdf_bytes: bytes) -> Iterator[PageText]:
+        """
+        Yield pages in order as soon as each one is finished, so callers can start working on the
+        first pages while later ones are still being OCR'd. Closing the generator early stops the
+        remaining work (pending OCR jobs are cancelled).
+        """
         with fitz.open(stream=pdf_bytes, filetype="pdf") as doc:
-            last_index = doc.page_count - 1
-            effective_last = last_index - 1 if (self.skip_last_page and doc.page_count >= 1) else last_index
-            if effective_last < 0:
-                return TextExtractionResult(
-                    pdf_name="upload.pdf", pages=[], combined="", ocr_pages=[], notes=["no pages"]
-                )
+            yield from self._iter_doc(doc, pdf_bytes=pdf_bytes)
 
-            for i in range(0, effective_last + 1):
-                page = doc[i]
-                clip = self._page_clip_rect(page, i, self.ignore_top_percent)
-
-                # special case: page 2 (index 1) that looks 1-col header + 2-col body
-                force_ocr = (i == 1) and self._should_force_ocr_page2(page, clip)
-                if force_ocr:
-                    txt = self._extract_text_ocr(page, clip)
-                    ocr_pages.append(i)
-                    notes.append("forced OCR on page 2")
-                else:
-                    txt = self._extract_text_digital(page, clip)
-                    if len(txt) < self.min_digital_chars:
-                        txt = self._extract_text_ocr(page, clip)
-                        ocr_pages.append(i)
-
-                page_texts.append(txt)
+    def iter_pages_path(self, pdf_path: str) -> Iterator[PageText]:
+        with fitz.open(pdf_path) as doc:
+            yield from self._iter_doc(doc, pdf_path=pdf_path)
+
+    def _collect(self, pages: Iterator[PageText]) -> TextExtractionResult:
+        page_texts: List[str] = []
+        ocr_pages: List[int] = []
+        notes: List[str] = []
+        ocr_bytes: Dict[int, int] = {}
+        for pg in pages:
+            page_texts.append(pg.text)
+            notes.extend(pg.notes)
+            if pg.ocr:
+                ocr_pages.append(pg.index)
+            if pg.ocr_bytes:
+                ocr_bytes[pg.index] = pg.ocr_bytes
+        if not page_texts:
+            notes = ["no pages"]
 
         combined = "\n\n".join(page_texts)
         return TextExtractionResult(
@@ -88,6 +172,106 @@ class TextExtractor:
             combined=combined,
             ocr_pages=ocr_pages,
             notes=notes,
+            ocr_bytes=ocr_bytes,
+        )
+
+    def _iter_doc(self, doc: fitz.Document, pdf_bytes: Optional[bytes] = None,
+                  pdf_path: Optional[str] = None) -> Iterator[PageText]:
+        last_index = doc.page_count - 1
+        effective_last = last_index - 1 if (self.skip_last_page and doc.page_count >= 1) else last_index
+        if effective_last < 0:
+            return
+
+        # pages are planned (digital text + OCR jobs submitted) up to `lookahead` pages ahead of
+        # the one being yielded, so pooled OCR keeps the workers busy without running far ahead
+        runner = _OcrRunner(self, doc, pdf_bytes, pdf_path)
+        lookahead = 2 * self.workers if self.workers > 1 else 0
+        pending: Deque[_PagePlan] = deque()
+        try:
+            for i in range(0, effective_last + 1):
+                pending.append(self._plan_page(doc, i, runner))
+                while len(pending) > lookahead:
+                    yield self._finish_page(pending.popleft(), runner)
+            while pending:
+                yield self._finish_page(pending.popleft(), runner)
+        finally:
+            runner.close()
+
+    def _plan_page(self, doc: fitz.Document, i: int, runner: "_OcrRunner") -> _PagePlan:
+        """Cheap pass: digital text, and decide whether the page (or some image regions) needs OCR."""
+        page = doc[i]
+        clip = self._page_clip_rect(page, i, self.ignore_top_percent)
+        plan = _PagePlan(index=i)
+
+        layout = analyze_layout(page, clip) if self.column_layout else None
+        columns_ok = layout is not None and layout.columns > 1 and layout.ok
+
+        # special case: page 2 (index 1) that looks 1-col header + 2-col body
+        force_ocr = (i == 1) and self._should_force_ocr_page2(page, clip)
+        if force_ocr and columns_ok:
+            force_ocr = False
+            plan.notes.append("column layout on page 2 (OCR skipped)")
+        elif force_ocr and layout is not None and layout.reason:
+            plan.notes.append(f"column layout failed on page 2: {layout.reason}")
+        if force_ocr:
+            plan.ocr = True
+            plan.jobs.append(runner.submit(i, clip))
+            plan.notes.append("forced OCR on page 2")
+            return plan
+
+        plan.text = layout.text if columns_ok else self._extract_text_digital(page, clip)
+        if len(plan.text) < self.min_digital_chars:
+            plan.ocr = True
+            plan.jobs.append(runner.submit(i, clip))
+        elif self.ocr_regions:
+            parts = self._region_parts(page, clip, layout if columns_ok else None)
+            if parts is not None:
+                plan.parts = []
+                for part in parts:
+                    if isinstance(part, str):
+                        plan.parts.append(part)
+                    else:
+                        plan.parts.append(len(plan.jobs))
+                        plan.jobs.append(runner.submit(i, part))
+                plan.notes.append(f"region OCR on page {i + 1} ({len(plan.jobs)} regions)")
+        return plan
+
+    def _finish_page(self, plan: _PagePlan, runner: "_OcrRunner") -> PageText:
+        results = [runner.result(job) for job in plan.jobs]
+        text = plan.text
+        if plan.ocr:
+            text = results[0].text
+            if self.adaptive_dpi:
+                plan.notes.append(f"OCR dpi {results[0].dpi} on page {plan.index + 1}")
+        elif plan.parts is not None:
+            text = "".join(p if isinstance(p, str) else results[p].text + "\n" for p in plan.parts).strip()
+        return PageText(
+            index=plan.index,
+            text=text,
+            ocr=plan.ocr,
+            notes=plan.notes,
+            ocr_bytes=sum(r.pixmap_bytes for r in results),
+            ocr_jobs=len(results),
+            ocr_s=sum(r.seconds for r in results),
+        )
+
+    def _worker_settings(self) -> dict:
+        return dict(
+            dpi=self.dpi,
+            ocr_lang=self.ocr_lang,
+            ignore_top_percent=self.ignore_top_percent,
+            skip_last_page=self.skip_last_page,
+            tesseract_cmd=self.tesseract_cmd,
+            tessdata_prefix=self.tessdata_prefix,
+            min_digital_chars=self.min_digital_chars,
+            adaptive_dpi=self.adaptive_dpi,
+            low_dpi=self.low_dpi,
+            min_confidence=self.min_confidence,
+            ocr_backend=self.ocr_backend,
+            ocr_engines=self.ocr_engines,
+            ocr_regions=self.ocr_regions,
+            min_region_fraction=self.min_region_fraction,
+            column_layout=self.column_layout,
         )
 
     # ---------- helpers ----------
@@ -102,18 +286,135 @@ class TextExtractor:
         txt = page.get_text("text", clip=clip) or ""
         return txt.strip()
 
-    def _extract_text_ocr(self, page: fitz.Page, clip: fitz.Rect) -> str:
-        pix = page.get_pixmap(dpi=self.dpi, clip=clip, alpha=False)
-        img = Image.open(io.BytesIO(pix.tobytes("png")))
-        try:
-            return pytesseract.image_to_string(img, lang=self.ocr_lang).strip()
-        except Exception:
-            try:
-                # fallback without explicit lang
-                return pytesseract.image_to_string(img).strip()
-            except Exception:
-                # last resort: don't crash if tesseract is unavailable
-                return ""
+    def _region_parts(self, page: fitz.Page, clip: fitz.Rect,
+                      layout: Optional[PageLayout] = None) -> Optional[List[Union[str, fitz.Rect]]]:
+        """
+        Page blocks in reading order (the column layout's, else extraction order): text blocks as
+        their digital text, large image blocks as the rect to OCR. None if no image qualifies.
+        """
+        if layout is not None:
+            blocks = layout.blocks
+        else:
+            blocks = page.get_text("blocks", clip=clip, flags=fitz.TEXTFLAGS_BLOCKS | fitz.TEXT_PRESERVE_IMAGES) or []
+        min_area = self.min_region_fraction * clip.width * clip.height
+        parts: List[Union[str, fitz.Rect]] = []
+        found = False
+        for b in blocks:  # b = (x0, y0, x1, y1, text, block_no, block_type)
+            if b[6] != 1:
+                parts.append(b[4])
+                continue
+            rect = fitz.Rect(b[:4]) & clip
+            if rect.is_empty or rect.width * rect.height < min_area:
+                continue
+            parts.append(rect)
+            found = True
+        return parts if found else None
+
+    def _extract_text_ocr(self, page: fitz.Page, clip: fitz.Rect) -> OcrText:
+        key = self._ocr_cache_key(page, clip) if self.ocr_cache else None
+        cached = self._ocr_cache_get(key)
+        if cached is not None:
+            return cached  # hit: nothing rendered
+        ocr = self._ocr_page(page, clip)
+        self._ocr_cache_put(key, ocr)
+        return ocr or OcrText("", "none")
+
+    def _ocr_page(self, page: fitz.Page, clip: fitz.Rect) -> Optional[OcrText]:
+        """Render + OCR, uncached. None means tesseract failed (so the result is not cached)."""
+        t0 = time.perf_counter()
+        if self.adaptive_dpi:
+            ocr = self._ocr_adaptive(page, clip)
+        else:
+            txt, nbytes = self._ocr_region(page, clip, self.dpi)
+            ocr = OcrText(txt, str(self.dpi), nbytes) if txt is not None else None
+        if ocr is not None:
+            ocr.seconds = time.perf_counter() - t0
+        return ocr
+
+    def _render(self, page: fitz.Page, clip: fitz.Rect, dpi: int) -> fitz.Pixmap:
+        # 8-bit grayscale, no alpha: 1 byte/pixel instead of 3 (tesseract binarizes anyway)
+        return page.get_pixmap(dpi=dpi, clip=clip, colorspace=fitz.csGRAY, alpha=False)
+
+    def _ocr_region(self, page: fitz.Page, clip: fitz.Rect, dpi: int) -> Tuple[Optional[str], int]:
+        """(text, bytes of the rendered pixmap)"""
+        pix = self._render(page, clip, dpi)
+        return self.ocr.image_to_string(pix), pix.stride * pix.height
+
+    def _ocr_adaptive(self, page: fitz.Page, clip: fitz.Rect) -> Optional[OcrText]:
+        """
+        Low-DPI pass with word confidences (image_to_data). Accept it when every block is
+        confident; re-OCR only the weak blocks at full dpi when they cover a small part of the
+        page; otherwise re-render the whole page at full dpi.
+        """
+        pix = self._render(page, clip, self.low_dpi)
+        nbytes = pix.stride * pix.height
+        data = self.ocr.image_to_data(pix)
+        del pix
+        blocks = _ocr_blocks(data) if data else []
+        if not blocks:
+            # nothing readable at low dpi (or tesseract error): plain full-dpi pass
+            txt, more = self._ocr_region(page, clip, self.dpi)
+            return OcrText(txt, f"{self.low_dpi}>{self.dpi}", nbytes + more) if txt is not None else None
+
+        weak = [b for b in blocks if b.confidence < self.min_confidence]
+        if not weak:
+            return OcrText(_blocks_text(blocks), str(self.low_dpi), nbytes)
+
+        page_area = (clip.x1 - clip.x0) * (clip.y1 - clip.y0)
+        scale = 72.0 / self.low_dpi  # pixels at low_dpi -> PDF points
+        weak_area = sum(b.area for b in weak) * scale * scale
+        if weak_area > 0.5 * page_area:
+            txt, more = self._ocr_region(page, clip, self.dpi)
+            return OcrText(txt, f"{self.low_dpi}>{self.dpi}", nbytes + more) if txt is not None else None
+
+        pad = 4.0  # points around each block, so glyph edges are not cut
+        for b in weak:
+            rect = fitz.Rect(
+                clip.x0 + b.left * scale - pad, clip.y0 + b.top * scale - pad,
+                clip.x0 + b.right * scale + pad, clip.y0 + b.bottom * scale + pad,
+            ) & clip
+            txt, more = self._ocr_region(page, rect, self.dpi)
+            nbytes += more
+            if txt is not None:
+                b.text = txt
+        return OcrText(_blocks_text(blocks), f"{self.low_dpi}>{self.dpi}[{len(weak)}]", nbytes)
+
+    # ---------- OCR cache ----------
+    def _ocr_cache_key(self, page: fitz.Page, clip: fitz.Rect) -> str:
+        """
+        Content address of a rendered region: the page content stream plus the raw streams of the
+        images/forms it draws (scanned pages share the same tiny "/Im0 Do" stream), page geometry,
+        clip, and every OCR setting that changes the output.
+        """
+        h = hashlib.sha256()
+        h.update(page.read_contents())
+        doc = page.parent
+        xrefs = {img[0] for img in page.get_images(full=True)} | {xo[0] for xo in page.get_xobjects()}
+        for xref in sorted(xrefs):
+            h.update(doc.xref_stream_raw(xref) or b"")
+        meta = [
+            OCR_CACHE_FORMAT,
+            [round(v, 2) for v in page.mediabox], page.rotation,
+            [round(v, 2) for v in clip],
+            self.dpi, self.ocr_lang, self.ocr.name, self.ocr.version(),
+            [self.low_dpi, self.min_confidence] if self.adaptive_dpi else None,
+        ]
+        h.update(json.dumps(meta).encode("utf-8"))
+        return h.hexdigest()
+
+    def _ocr_cache_get(self, key: Optional[str]) -> Optional[OcrText]:
+        if not key or self.ocr_cache is None:
+            return None
+        raw = self.ocr_cache.get(key)
+        if raw is None:
+            return None
+        value = json.loads(raw)
+        return OcrText(value["text"], value["dpi"])
+
+    def _ocr_cache_put(self, key: Optional[str], ocr: Optional[OcrText]) -> None:
+        if key and ocr is not None and self.ocr_cache is not None:
+            value = {"text": ocr.text, "dpi": ocr.dpi}
+            self.ocr_cache.put(key, json.dumps(value, ensure_ascii=False).encode("utf-8"))
 
     def _should_force_ocr_page2(self, page: fitz.Page, clip: fitz.Rect) -> bool:
         """
@@ -148,3 +449,130 @@ class TextExtractor:
         has_two_cols_later = (len(left) >= 1 and len(right) >= 1)
 
         return starts_one_col and has_two_cols_later
+
+
+# ---------- OCR job runner ----------
+@dataclass(slots=True)
+class _OcrJob:
+    page_index: int
+    clip: fitz.Rect
+    key: Optional[str] = None
+    done: Optional[OcrText] = None
+    future: Optional[Future] = None
+
+
+class _OcrRunner:
+    """
+    Runs OCR jobs for one document: in-process (at result() time) or, with workers > 1, on a
+    process pool created on the first cache miss. Cache lookups/writes stay in this process.
+    """
+
+    def __init__(self, extractor: TextExtractor, doc: fitz.Document,
+                 pdf_bytes: Optional[bytes], pdf_path: Optional[str]):
+        self.x = extractor
+        self.doc = doc
+        self.pdf_bytes = pdf_bytes
+        self.pdf_path = pdf_path
+        self.pool: Optional[ProcessPoolExecutor] = None
+
+    def submit(self, page_index: int, clip: fitz.Rect) -> _OcrJob:
+        job = _OcrJob(page_index, clip)
+        if self.x.workers <= 1:
+            return job
+        if self.x.ocr_cache is not None:
+            job.key = self.x._ocr_cache_key(self.doc[page_index], clip)
+            job.done = self.x._ocr_cache_get(job.key)
+            if job.done is not None:
+                return job
+        if self.pool is None:
+            # each worker opens its own copy of the document once (initializer), then OCRs pages by index
+            source = (None, self.pdf_path) if self.pdf_path else (self.pdf_bytes, None)
+            # spawn, like ExtractionPool: the API/job-runner process has threads; forking those is unsafe
+            self.pool = ProcessPoolExecutor(
+                max_workers=self.x.workers,
+                mp_context=multiprocessing.get_context("spawn"),
+                initializer=_init_ocr_worker,
+                initargs=(self.x._worker_settings(), *source),
+            )
+        job.future = self.pool.submit(_ocr_job, page_index, tuple(clip))
+        return job
+
+    def result(self, job: _OcrJob) -> OcrText:
+        if job.done is None:
+            if job.future is None:
+                job.done = self.x._extract_text_ocr(self.doc[job.page_index], job.clip)
+            else:
+                ocr = job.future.result()
+                self.x._ocr_cache_put(job.key, ocr)
+                job.done = ocr or OcrText("", "none")
+        return job.done
+
+    def close(self) -> None:
+        if self.pool is not None:
+            self.pool.shutdown(wait=True, cancel_futures=True)
+            self.pool = None
+
+
+# ---------- process-pool workers (module level so they can be pickled) ----------
+_WORKER_EXTRACTOR: Optional[TextExtractor] = None
+_WORKER_DOC: Optional[fitz.Document] = None
+
+
+def _init_ocr_worker(settings: dict, pdf_bytes: Optional[bytes], pdf_path: Optional[str]) -> None:
+    global _WORKER_EXTRACTOR, _WORKER_DOC
+    _WORKER_EXTRACTOR = TextExtractor(**settings)
+    _WORKER_DOC = fitz.open(pdf_path) if pdf_path else fitz.open(stream=pdf_bytes, filetype="pdf")
+
+
+def _ocr_job(page_index: int, clip: Tuple[float, float, float, float]) -> Optional[OcrText]:
+    return _WORKER_EXTRACTOR._ocr_page(_WORKER_DOC[page_index], fitz.Rect(clip))
+
+
+# ---------- adaptive OCR helpers ----------
+@dataclass(slots=True)
+class _OcrBlock:
+    lines: List[str]
+    confs: List[float]
+    left: int
+    top: int
+    right: int
+    bottom: int
+    text: Optional[str] = None  # replacement text after a high-dpi re-OCR
+
+    @property
+    def confidence(self) -> float:
+        return sum(self.confs) / len(self.confs) if self.confs else 0.0
+
+    @property
+    def area(self) -> int:
+        return (self.right - self.left) * (self.bottom - self.top)
+
+
+def _ocr_blocks(data: Dict[str, list]) -> List[_OcrBlock]:
+    """Group image_to_data word rows into blocks (reading order kept), with per-block confidence."""
+    blocks: Dict[int, _OcrBlock] = {}
+    lines: Dict[Tuple[int, int, int], List[str]] = {}
+    for n, word in enumerate(data.get("text", [])):
+        word = (word or "").strip()
+        conf = float(data["conf"][n])
+        if not word or conf < 0:
+            continue
+        b_num = data["block_num"][n]
+        left, top = data["left"][n], data["top"][n]
+        right, bottom = left + data["width"][n], top + data["height"][n]
+        b = blocks.get(b_num)
+        if b is None:
+            b = blocks[b_num] = _OcrBlock(lines=[], confs=[], left=left, top=top, right=right, bottom=bottom)
+        else:
+            b.left, b.top = min(b.left, left), min(b.top, top)
+            b.right, b.bottom = max(b.right, right), max(b.bottom, bottom)
+        b.confs.append(conf)
+        lines.setdefault((b_num, data["par_num"][n], data["line_num"][n]), []).append(word)
+
+    for b_num, b in blocks.items():
+        b.lines = [" ".join(words) for key, words in lines.items() if key[0] == b_num]
+    return list(blocks.values())
+
+
+def _blocks_text(blocks: List[_OcrBlock]) -> str:
+    return "\n\n".join((b.text if b.text is not None else "\n".join(b.lines)) for b in blocks).strip()
@@ -0,0 +1,169 @@
+# pdf_extractor/services/worker_pool.py
+from __future__ import annotations
+from concurrent.futures import Future, ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any, Callable, Dict, Optional
+import json
+import logging
+import multiprocessing
+import threading
+import time
+
+from ..config import Config
+
+# per worker process, built once by _init_worker()
+_PIPE = None
+
+
+class PoolFull(Exception):
+    """Admission queue is full; the caller should retry later."""
+
+
+class ExtractionPool:
+    """
+    Pipeline runs in `workers` spawned processes, each with its own Pipeline/GazetteNLP built once
+    at startup (start() waits until every worker is warm). At most `workers + max_pending`
+    requests are admitted at a time; submit() raises PoolFull beyond that.
+    """
+
+    def __init__(self, cfg: Config, workers: int = 2, max_pending: int = 8):
+        self.cfg = cfg
+        self.workers = max(1, workers)
+        self.max_pending = max(0, max_pending)
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._lock = threading.Lock()
+        self._inflight = 0
+        self._broken = False
+
+    @property
+    def inflight(self) -> int:
+        return self._inflight
+
+    def start(self) -> None:
+        t0 = time.perf_counter()
+        self._executor = self._new_executor()
+        # one ping per worker forces every process (and its Pipeline) to come up now
+        pids = {f.result() for f in [self._executor.submit(_ping) for _ in range(self.workers)]}
+        logging.info(f"[POOL] {self.workers} worker(s) warm in {time.perf_counter() - t0:.2f}s (pids={sorted(pids)})")
+
+    def stop(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(wait=True, cancel_futures=True)
+            self._executor = None
+
+    def submit_ndjson(self, path: str, method: str, *args: Any, **kwargs: Any) -> Future:
+        """
+        Pipeline.<method>(...) is an iterator of JSON objects: the worker appends one line per
+        object to `path` (created by the caller) as they are produced, so the caller can tail it.
+        Same admission and timings rules as submit(); the result is None (or the timings).
+        """
+        return self._submit(_call_ndjson, path, method, args, kwargs)
+
+    def submit(self, method: str, *args: Any, **kwargs: Any) -> Future:
+        """
+        Pipeline.<method>(*args, **kwargs) in a worker; raises PoolFull when the queue is full.
+        With timings=StageTimings() in kwargs the future's result is (result, filled-in timings):
+        the worker fills its own unpickled copy, so it has to be sent back.
+        """
+        return self._submit(_call, method, args, kwargs)
+
+    def reserve(self, n: int) -> "Reservation":
+        """
+        Admit a group of requests (a batch) once: holds up to n free slots, at least one, and
+        raises PoolFull only when none is free. Submitting through the reservation never does.
+        """
+        with self._lock:
+            free = self.workers + self.max_pending - self._inflight
+            if free <= 0:
+                raise PoolFull(f"{self._inflight} requests in flight")
+            slots = max(1, min(n, free))
+            self._inflight += slots
+        return Reservation(self, slots)
+
+    def _submit(self, fn: Callable[..., Any], *args: Any) -> Future:
+        with self._lock:
+            if self._inflight >= self.workers + self.max_pending:
+                raise PoolFull(f"{self._inflight} requests in flight")
+            self._inflight += 1
+        try:
+            fut = self._executor_or_restart().submit(fn, *args)
+        except Exception:
+            self._release(None)
+            raise
+        fut.add_done_callback(self._release)
+        return fut
+
+    def _release(self, fut: Optional[Future]) -> None:
+        with self._lock:
+            self._inflight -= 1
+        self._check_broken(fut)
+
+    def _check_broken(self, fut: Optional[Future]) -> None:
+        if fut is not None and not fut.cancelled() and isinstance(fut.exception(), BrokenProcessPool):
+            # a worker died (OOM, segfault in a native lib): next submit gets a fresh pool
+            logging.error("[POOL] worker process died; pool will be restarted")
+            with self._lock:
+                self._broken = True
+
+    def _executor_or_restart(self) -> ProcessPoolExecutor:
+        with self._lock:
+            if self._executor is None or self._broken:
+                if self._executor is not None:
+                    self._executor.shutdown(wait=False, cancel_futures=True)
+                self._executor = self._new_executor()
+                self._broken = False
+            return self._executor
+
+    def _new_executor(self) -> ProcessPoolExecutor:
+        # spawn: the API process has threads (job runner, batch pool); forking those is unsafe
+        return ProcessPoolExecutor(max_workers=self.workers, mp_context=multiprocessing.get_context("spawn"),
+                                   initializer=_init_worker, initargs=(self.cfg,))
+
+
+class Reservation:
+    """
+    Admission slots held by one caller (ExtractionPool.reserve). The caller keeps at most `slots`
+    of its requests in flight; release() hands the slots back to the pool.
+    """
+
+    def __init__(self, pool: ExtractionPool, slots: int):
+        self.pool = pool
+        self.slots = slots
+
+    def submit(self, method: str, *args: Any, **kwargs: Any) -> Future:
+        """Same as ExtractionPool.submit(), inside the reserved slots (no PoolFull)."""
+        fut = self.pool._executor_or_restart().submit(_call, method, args, kwargs)
+        fut.add_done_callback(self.pool._check_broken)
+        return fut
+
+    def release(self) -> None:
+        with self.pool._lock:
+            self.pool._inflight -= self.slots
+        self.slots = 0
+
+
+def _init_worker(cfg: Config) -> None:
+    global _PIPE
+    from .orchestrator import Pipeline
+    _PIPE = Pipeline(cfg)
+
+
+def _ping() -> int:
+    import os
+    return os.getpid()
+
+
+def _call(method: str, args: tuple, kwargs: Dict[str, Any]) -> Any:
+    result = getattr(_PIPE, method)(*args, **kwargs)
+    if kwargs.get("timings") is not None:
+        return result, kwargs["timings"]
+    return result
+
+
+def _call_ndjson(path: str, method: str, args: tuple, kwargs: Dict[str, Any]) -> Any:
+    # r+b, not w: if the caller already gave up and removed the file, fail instead of recreating it
+    with open(path, "r+b") as f:
+        for obj in getattr(_PIPE, method)(*args, **kwargs):
+            f.write(json.dumps(obj, ensure_ascii=False).encode("utf-8") + b"\n")
+            f.flush()
+    return kwargs.get("timings")
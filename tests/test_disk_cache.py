@@ -0,0 +1,14 @@
+# tests/test_disk_cache.py
+from pdf_extractor.io.disk_cache import DiskLRUCache
+
+
+def test_overwrite_counts_only_the_difference(tmp_path):
+    cache = DiskLRUCache(str(tmp_path), max_bytes=1000)
+    for _ in range(50):
+        cache.put("abcd", b"x" * 300)
+    cache.put("abce", b"y" * 100)
+    cache.put("abcd", b"z" * 200)
+
+    assert cache.stats()["bytes"] == 300
+    assert cache.evictions == 0
+    assert DiskLRUCache(str(tmp_path), max_bytes=1000).stats()["bytes"] == 300  # rescan agrees
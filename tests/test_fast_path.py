@@ -0,0 +1,62 @@
+# tests/test_fast_path.py
+"""GazetteNLP fast path: may_be_tagged() must never skip a line spaCy would tag (verify_fast_path)."""
+import pytest
+
+from benchmarks.synth_gazette import SCENARIOS, make_gazette
+from pdf_extractor.config import Config
+from pdf_extractor.services.gazette_nlp import GazetteNLP, may_be_tagged
+from pdf_extractor.services.orchestrator import Pipeline
+
+ADVERSARIAL = [
+    # tipos with accents, case and punctuation around them
+    "Deliberação n.º 3/2025", "DELIBERAÇÃO N.º 3/2025", "deliberacao n.º 3", "Declaração de retificação",
+    "Revogação n.º 1", "Édital n.º 3/2025", "avisó", "avisó n.º 2", "(Aviso)", "• Aviso n.º 31/2024",
+    "«Despacho»", "l'aviso", "Avisos", "aviso2", "aviso_2", "DESPACHO-CONJUNTO", "Despacho/Aviso",
+    "nos termos do Despacho n.º 4/2020 publicado", "Ato n.º 1", "Acto n.º 1", "ＡＶＩＳＯ 3",
+    # "n.º" variants and other numbering without a tipo
+    "n.º 12/2025", "N.º 12", "nº 5", "Nº 5", "n.o 5", "n. º 5", "n.° 5", "N.ᵒ 5", "Sr.ª Maria", "1.º andar",
+    # superscripts and other non-ASCII digits
+    "nota ¹ do ANEXO", "anexo ¹", "Aviso¹", "aviso² n.º ³", "Despacho n.º 12/²⁰²⁵", "Aviso n.º 5/٢٠٢٥",
+    "Edital ① 2025", "Ⅳ série", "artigo 3.º-A",
+    # upper case beyond ASCII, or letters with no case
+    "ÁGUA e saneamento", "Água e saneamento", "ÇA", "İstanbul", "İAVISO", "ΣΑ", "ǅ", "ǅA", "Å", "ß", "ẞ",
+    "ﬁcha técnica", "ﬂ", "µ", "ª", "º", "A", "a", "É.", "e-mail: geral@madeira.gov.pt", "www.madeira.gov.pt",
+]
+
+
+@pytest.fixture(scope="module")
+def gnlp():
+    return GazetteNLP()
+
+
+@pytest.fixture(scope="module")
+def corpus():
+    pipe = Pipeline(Config())
+    lines = []
+    for name in ("small", "medium", "dense"):
+        lines.extend(pipe.text_extractor().extract(make_gazette(SCENARIOS[name])).combined.splitlines())
+    return [ln for ln in lines if ln.strip()]
+
+
+def test_synthetic_corpus(gnlp, corpus):
+    skipped, mismatches = gnlp.verify_fast_path(corpus)
+
+    assert mismatches == []
+    assert 0 < skipped < len(corpus)
+
+
+@pytest.mark.parametrize("case", ["as-is", "lower", "upper", "title"])
+def test_adversarial_lines(gnlp, case):
+    lines = [ln if case == "as-is" else getattr(ln, case)() for ln in ADVERSARIAL]
+    skipped, mismatches = gnlp.verify_fast_path(lines)
+
+    assert mismatches == []
+    assert skipped > 0
+
+
+def test_fast_path_matches_full_classification(corpus):
+    fast, slow = GazetteNLP(fast_path=True), GazetteNLP(fast_path=False)
+    lines = [ln.strip() for ln in corpus + ADVERSARIAL]
+
+    assert fast.classify_many(lines) == slow.classify_many(lines)
+    assert not may_be_tagged("considerando o disposto no artigo 3.º da lei regional")
@@ -0,0 +1,75 @@
+# tests/test_gazette_nlp.py
+"""GazetteNLP line classification: non-ASCII digits (superscripts, circled, Arabic-Indic), memo invalidation."""
+import fitz  # PyMuPDF
+import pytest
+
+from pdf_extractor.config import Config
+from pdf_extractor.services.gazette_nlp import GazetteNLP
+from pdf_extractor.services.orchestrator import Pipeline
+
+ODD_DIGIT_LINES = [
+    "nota ¹ do ANEXO",
+    "Aviso ²⁰²⁵",
+    "Despacho n.º 12/²⁰²⁵",
+    "Aviso n.º 7 ¹²³⁴",
+    "Edital ① 2025",
+    "Aviso n.º 5/٢٠٢٥",
+]
+
+
+@pytest.fixture(scope="module")
+def gnlp():
+    return GazetteNLP()
+
+
+@pytest.mark.parametrize("line", ODD_DIGIT_LINES)
+def test_odd_digits_do_not_raise(gnlp, line):
+    gnlp.classify(line)
+
+
+def test_superscripts_are_not_years(gnlp):
+    assert gnlp.classify("Aviso ²⁰²⁵").sumario_header() == ("aviso", None, None)
+    assert gnlp.classify("Aviso n.º 7 ¹²³⁴").body_header()[2] is None
+    assert gnlp.classify("Aviso n.º 7 2025").sumario_header() == ("aviso", "7", "2025")
+
+
+def test_footnote_line_gets_through_the_pipeline():
+    doc = fitz.open()
+    page = doc.new_page(width=595, height=842)
+    for i, line in enumerate(["ANEXO", "Aviso n.º 7/2025"] + ODD_DIGIT_LINES):
+        page.insert_text((50, 150 + 14 * i), line, fontsize=10)
+    doc.new_page(width=595, height=842)  # skip_last_page
+    pdf = doc.tobytes()
+
+    out = Pipeline(Config()).process_pdf_bytes(pdf, pdf_name="footnote.pdf")
+    assert out["pdf_name"] == "footnote.pdf"
+
+
+def _swap_doc_type(gnlp, old, new):
+    """Replace one DOC_TYPE pattern behind GazetteNLP's back: same pattern count."""
+    ruler = gnlp.nlp.get_pipe("gazette_ruler")
+    patterns = [p for p in ruler.patterns if p["pattern"] != [{"LOWER": old}]]
+    ruler.clear()
+    ruler.add_patterns(patterns + [{"label": "DOC_TYPE", "pattern": [{"LOWER": new}]}])
+
+
+def test_memo_follows_a_same_size_pattern_swap():
+    gnlp = GazetteNLP(fast_path=False)
+    assert gnlp.classify_many(["Aviso n.º 3/2025"])[0].kind_text == "Aviso"
+    n = len(gnlp.nlp.get_pipe("gazette_ruler"))
+
+    _swap_doc_type(gnlp, "aviso", "portaria")
+
+    assert len(gnlp.nlp.get_pipe("gazette_ruler")) == n
+    assert gnlp.classify_many(["Aviso n.º 3/2025"])[0].kind_text is None
+    assert gnlp.classify("Portaria n.º 3/2025").kind_text == "Portaria"
+
+
+def test_add_patterns_drops_the_memo_and_the_fast_path():
+    gnlp = GazetteNLP()
+    assert gnlp.classify("Portaria n.º 3/2025").kind_text is None
+
+    gnlp.add_patterns([{"label": "DOC_TYPE", "pattern": [{"LOWER": "portaria"}]}])
+
+    assert not gnlp.fast_path
+    assert gnlp.classify("Portaria n.º 3/2025").kind_text == "Portaria"
@@ -0,0 +1,46 @@
+# tests/test_job_runner.py
+"""JobRunner on a real JobStore: corrupt input fails on the first attempt, in-process or in the pool."""
+import time
+
+import pytest
+
+from pdf_extractor.config import Config
+from pdf_extractor.io.job_store import JobStore
+from pdf_extractor.services.job_runner import JobRunner
+from pdf_extractor.services.worker_pool import ExtractionPool
+
+CORRUPT_PDF = b"%PDF-1.4\nnot really a pdf\n"
+
+
+def _wait_finished(store: JobStore, job_id: str, timeout: float = 60.0):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        job = store.get(job_id)
+        if job.status in ("done", "failed"):
+            return job
+        time.sleep(0.05)
+    pytest.fail(f"job {job_id} still {store.get(job_id).status}")
+
+
+@pytest.mark.parametrize("pooled", [False, True], ids=["in-process", "pool"])
+def test_corrupt_pdf_fails_without_retry(tmp_path, pooled):
+    cfg = Config()
+    store = JobStore(str(tmp_path / "jobs"))
+    pool = ExtractionPool(cfg, workers=1, max_pending=1) if pooled else None
+    runner = JobRunner(store, cfg, retry_delay_s=0.0, poll_s=0.05, pool=pool)
+    if pool is not None:
+        pool.start()
+    runner.start()
+    try:
+        job_id = store.create("bad.pdf", CORRUPT_PDF, max_attempts=3)
+        runner.notify()
+        job = _wait_finished(store, job_id)
+    finally:
+        runner.stop(timeout=30)
+        if pool is not None:
+            pool.stop()
+        store.close()
+
+    assert job.status == "failed"
+    assert job.attempts == 1
+    assert "stage:text_extraction" in job.error
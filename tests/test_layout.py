@@ -0,0 +1,64 @@
+# tests/test_layout.py
+"""layout.analyze_layout: a two-column gutter is found and read column by column; one-column text is left alone."""
+import fitz  # PyMuPDF
+import pytest
+
+from benchmarks.synth_gazette import GazetteSpec, make_gazette
+from pdf_extractor.services.layout import analyze_layout
+
+W, H = 595, 842
+CLIP = fitz.Rect(0, 0.10 * H, W, H)  # what TextExtractor passes for pages after the first
+WORDS = "considerando o disposto no artigo da lei regional nos termos do procedimento concursal comum "
+
+
+def _para(tag: str, lines: int) -> str:
+    return "\n".join(f"{tag} {k:02d} {WORDS[:40]}" for k in range(lines))
+
+
+def _page(*boxes):
+    """One page; boxes = (rect, text[, align]) written as separate text blocks."""
+    doc = fitz.open()
+    page = doc.new_page(width=W, height=H)
+    for rect, text, *align in boxes:
+        assert page.insert_textbox(fitz.Rect(rect), text, fontsize=8, align=align[0] if align else 0) >= 0
+    return doc, page
+
+
+def test_two_columns_with_full_width_header():
+    doc, page = _page(
+        ((50, 100, 545, 120), "CÂMARA MUNICIPAL DO FUNCHAL", fitz.TEXT_ALIGN_CENTER),
+        ((50, 130, 290, 600), _para("esquerda", 40)),
+        ((305, 130, 545, 600), _para("direita", 40)),
+    )
+    layout = analyze_layout(page, CLIP)
+
+    assert (layout.columns, layout.ok, layout.reason) == (2, True, None)
+    assert 290 <= layout.gutter <= 305
+    assert [b[4].split()[0] for b in layout.spanning] == ["CÂMARA"]
+    text = layout.text
+    assert text.index("CÂMARA") < text.index("esquerda 00") < text.index("esquerda 39") < text.index("direita 00")
+
+
+@pytest.mark.parametrize("boxes", [
+    # paragraphs one under the other
+    [((50, 100, 545, 300), _para("primeiro", 12)), ((50, 320, 545, 600), _para("segundo", 12))],
+    # ...with a short right-aligned signature beside the last lines: not a second column
+    [((50, 100, 545, 500), _para("texto", 30)), ((50, 505, 280, 520), "Funchal, 3 de março de 2025."),
+     ((350, 505, 545, 520), "Presidente, Rui Gomes.")],
+], ids=["paragraphs", "signature"])
+def test_single_column_is_left_alone(boxes):
+    doc, page = _page(*boxes)
+    layout = analyze_layout(page, CLIP)
+
+    assert (layout.columns, layout.gutter, layout.ok) == (1, None, True)
+    assert layout.blocks == page.get_text("blocks", clip=CLIP, flags=fitz.TEXTFLAGS_BLOCKS | fitz.TEXT_PRESERVE_IMAGES)
+
+
+def test_synthetic_gazette_pages():
+    doc = fitz.open(stream=make_gazette(GazetteSpec(body_pages=1, sumario_items=4, two_column_page2=True)),
+                    filetype="pdf")
+    sumario, two_col = analyze_layout(doc[0], doc[0].rect), analyze_layout(doc[1], CLIP)
+
+    assert sumario.columns == 1
+    assert two_col.columns == 2 and two_col.ok
+    assert abs(two_col.gutter - W / 2) < 0.1 * W
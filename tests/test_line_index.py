@@ -0,0 +1,213 @@
+# tests/test_line_index.py
+"""
+Differential test for the LineIndex rewrite: SumarioParser / BodySlicer reading a LineIndex must
+give the same ranges, items, headers and slices as the old helpers that ran spaCy on every line
+(kept below, as they were before the rewrite). Input: synthetic gazettes (benchmarks/synth_gazette.py).
+"""
+import unicodedata
+from typing import List, Optional, Tuple
+
+import pytest
+
+from benchmarks.synth_gazette import SCENARIOS, make_gazette
+from pdf_extractor.config import Config
+from pdf_extractor.services.gazette_nlp import ascii_lower
+from pdf_extractor.services.line_index import LineIndex
+from pdf_extractor.services.orchestrator import Pipeline
+from pdf_extractor.services.slicer import BodySlice
+from pdf_extractor.services.sumario import SumarioItem
+
+# lines the generator never writes: leading punctuation, a tipo mid-sentence, repeats, blanks
+EXTRA_LINES = [
+    "", "• Aviso n.º 31/2024", "nos termos do Despacho n.º 4/2020 publicado", "  ", "- Edital 9 2023",
+    "CÂMARA MUNICIPAL DO FUNCHAL", "Contrato n.º 12/1899", "Aviso n.º 31/2024", "aviso", "",
+]
+
+
+class PerLine:
+    """The per-line helpers from before LineIndex (one nlp() call per line, per question)."""
+
+    def __init__(self, gnlp):
+        self.nlp = gnlp.nlp
+
+    def is_org_heading(self, text: str) -> bool:
+        t = text.strip()
+        if not t:
+            return False
+        return any(ent.label_ == "SUM_ORG_LINE" for ent in self.nlp(t).ents)
+
+    def sumario_kind_num_year(self, text: str) -> Tuple[Optional[str], Optional[str], Optional[str]]:
+        t = text.strip()
+        if not t:
+            return None, None, None
+        doc = self.nlp(t)
+        kind_ent = None
+        for e in doc.ents:
+            if e.label_ == "DOC_TYPE" and all((tok.is_punct or tok.is_space) for tok in doc[:e.start]):
+                kind_ent = e
+                break
+        if not kind_ent:
+            return None, None, None
+        tipo = unicodedata.normalize("NFKD", kind_ent.text).encode("ascii", "ignore").decode("ascii").lower().strip()
+        number = year = None
+        for e in doc.ents:
+            if e.label_ == "DOC_NUM":
+                digits = "".join(ch for ch in e.text if ch.isdigit())
+                if digits:
+                    number = digits
+            elif e.label_ == "DOC_YEAR":
+                y = "".join(ch for ch in e.text if ch.isdigit())
+                if len(y) == 4 and 1900 <= int(y) <= 2100:
+                    year = y
+        return tipo, number, year
+
+    def starts_header(self, text: str) -> bool:
+        doc = self.nlp(text.strip())
+        return any(e.label_ == "DOC_TYPE" and all((t.is_punct or t.is_space) for t in doc[:e.start])
+                   for e in doc.ents)
+
+    def body_kind_num_year(self, line: str) -> Tuple[Optional[str], Optional[str], Optional[str], int]:
+        doc = self.nlp(line.strip())
+        kind_ent = next((e for e in doc.ents if e.label_ == "DOC_TYPE"), None)
+        if not kind_ent:
+            return None, None, None, -1
+        num = year = None
+        for e in doc.ents:
+            if e.label_ == "DOC_NUM" and any(ch.isdigit() for ch in e.text):
+                num = "".join(ch for ch in e.text if ch.isdigit())
+            if e.label_ == "DOC_YEAR" and e.text.isdigit() and 1900 <= int(e.text) <= 2100:
+                year = e.text
+        last_idx = kind_ent.end - 1
+        if num or year:
+            last_idx = max([kind_ent.end] + [e.end for e in doc.ents if e.label_ in ("DOC_NUM", "DOC_YEAR")]) - 1
+        return kind_ent.text.lower().strip(), num, year, last_idx
+
+    def find_range(self, lines: List[str]) -> Tuple[Optional[int], Optional[int]]:
+        start = next((i for i, ln in enumerate(lines) if ascii_lower(ln.strip()) in ("sumario", "sumário")), None)
+        if start is None:
+            return None, None
+        j = next((j for j in range(start + 1, len(lines)) if self.is_org_heading(lines[j])), None)
+        if j is None:
+            return start, min(len(lines), start + 120)
+        target = ascii_lower(lines[j].strip())
+        end = next((k for k in range(j + 1, len(lines)) if ascii_lower(lines[k].strip()) == target), None)
+        if end is None:
+            end = next((k for k in range(j + 1, min(len(lines), start + 150)) if self.is_org_heading(lines[k])), None)
+        if end is None:
+            end = min(len(lines), start + 150)
+        return start, end
+
+    def parse_items(self, parser, sum_lines: List[str]) -> List[SumarioItem]:
+        items: List[SumarioItem] = []
+        current_org_raw: Optional[str] = None
+        current_orgs: List[str] = []
+        i = 0
+        while i < len(sum_lines):
+            raw = sum_lines[i].strip()
+            if not raw:
+                i += 1
+                continue
+            if self.is_org_heading(raw):
+                parts: List[str] = []
+                while i < len(sum_lines) and sum_lines[i].strip() and self.is_org_heading(sum_lines[i]):
+                    parts.append(sum_lines[i].strip())
+                    i += 1
+                current_org_raw = " ".join(parts).strip()
+                current_orgs = parser._split_block_orgs(current_org_raw)
+                continue
+            tipo, number, year = self.sumario_kind_num_year(raw)
+            if tipo:
+                lead_lines: List[str] = []
+                j = i + 1
+                while j < len(sum_lines):
+                    nxt = sum_lines[j]
+                    if self.is_org_heading(nxt.strip()) or self.starts_header(nxt):
+                        break
+                    lead_lines.append(nxt.rstrip())
+                    j += 1
+                items.append(SumarioItem(
+                    tipo=tipo, number=number, year=year, text=raw, title="\n".join(lead_lines).strip(),
+                    line_range=(i, max(i, j - 1)),
+                    section_sumario=(current_orgs[0] if current_orgs else None),
+                    section_sumario_raw=current_org_raw, section_orgs=tuple(current_orgs),
+                ))
+                i = j
+                continue
+            i += 1
+        return items
+
+    def detect_headers(self, lines: List[str], exclude_range: Optional[Tuple[int, int]]) -> List[int]:
+        headers: List[int] = []
+        for i, ln in enumerate(lines):
+            if exclude_range is not None and exclude_range[0] <= i < exclude_range[1]:
+                continue
+            raw = ln.strip()
+            if not raw or self.is_org_heading(raw):
+                continue
+            if self.body_kind_num_year(raw)[0]:
+                headers.append(i)
+        return headers
+
+    def slices(self, lines: List[str], header_lines: List[int]) -> List[BodySlice]:
+        header_lines = sorted(set(header_lines))
+        org_by_line = {}
+        last_seen_org = None
+        for i, ln in enumerate(lines):
+            if self.is_org_heading(ln):
+                last_seen_org = ln.strip()
+            org_by_line[i] = last_seen_org
+        out: List[BodySlice] = []
+        for start, end in zip(header_lines, header_lines[1:] + [len(lines)]):
+            tipo, num, year, _ = self.body_kind_num_year(lines[start].strip())
+            out.append(BodySlice(
+                start_line=start, end_line=end - 1, header_text=lines[start].strip(),
+                text="\n".join(lines[start:end]).strip(), section_body=org_by_line.get(start),
+                kind=tipo, number=num, year=year,
+            ))
+        return out
+
+
+@pytest.fixture(scope="module")
+def pipe():
+    return Pipeline(Config())
+
+
+@pytest.fixture(scope="module", params=["small", "medium", "dense", "small+extra"])
+def lines(request, pipe):
+    name, _, extra = request.param.partition("+")
+    lines = pipe.text_extractor().extract(make_gazette(SCENARIOS[name])).combined.splitlines()
+    if extra:
+        # inside the Sumário and at the end of the body
+        s = next(i for i, ln in enumerate(lines) if ascii_lower(ln.strip()) == "sumario")
+        lines = lines[:s + 3] + EXTRA_LINES + lines[s + 3:] + EXTRA_LINES
+    return lines
+
+
+def test_line_lookups_match_per_line_helpers(pipe, lines):
+    old = PerLine(pipe.gnlp)
+    index = LineIndex(pipe.gnlp, lines)
+
+    for i, ln in enumerate(lines):
+        assert index.is_org(i) == old.is_org_heading(ln), ln
+        if ln.strip():
+            assert index.starts_header(i) == old.starts_header(ln), ln
+            assert index.sumario_header(i) == old.sumario_kind_num_year(ln), ln
+            assert index.body_header(i) == old.body_kind_num_year(ln), ln
+
+
+def test_stages_match_per_line_helpers(pipe, lines):
+    old = PerLine(pipe.gnlp)
+    index = LineIndex(pipe.gnlp, lines)
+
+    rng = pipe.sumario.find_range(lines, index)
+    assert rng == old.find_range(lines)
+    start, end = rng
+    assert start is not None and end is not None
+
+    items = pipe.sumario.parse_items(lines[start:end], index.sub(start, end))
+    assert items
+    assert items == old.parse_items(pipe.sumario, lines[start:end])
+
+    headers = pipe.slicer.detect_headers(lines, rng, index)
+    assert headers == old.detect_headers(lines, rng)
+    assert pipe.slicer.slices(lines, headers, rng, index) == old.slices(lines, headers)
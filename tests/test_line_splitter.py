@@ -0,0 +1,39 @@
+# tests/test_line_splitter.py
+"""orchestrator._LineSplitter: the lines of any chunking are those of str.splitlines() on the whole text."""
+import random
+
+import pytest
+
+from pdf_extractor.services.orchestrator import _LineSplitter
+
+# every separator str.splitlines() knows, "\r\n" included
+BREAKS = ["\n", "\r", "\r\n", "\v", "\f", "\x1c", "\x1d", "\x1e", "\x85", "\u2028", "\u2029"]
+
+
+def _split(chunks):
+    splitter = _LineSplitter()
+    out = []
+    for chunk in chunks:
+        out.extend(splitter.feed(chunk))
+    return out + splitter.flush()
+
+
+@pytest.mark.parametrize("chunks", [
+    ["Aviso n.º 1", "/2025\nTexto", "\n"],
+    ["a\r", "\nb"],                      # "\r\n" across the boundary is one break
+    ["a\r", "", "\n", "b\r"],
+    ["", "linha"],
+    ["\n\n", "\n"],
+    ["página 1", "\n\n" + "página 2"],   # how the pipeline joins pages
+], ids=repr)
+def test_boundaries(chunks):
+    assert _split(chunks) == "".join(chunks).splitlines()
+
+
+def test_random_chunking():
+    rnd = random.Random(0)
+    for _ in range(2000):
+        text = "".join(rnd.choice(BREAKS) if rnd.random() < 0.3 else rnd.choice("ab ç") for _ in range(rnd.randint(0, 30)))
+        cuts = sorted(rnd.sample(range(len(text) + 1), rnd.randint(0, min(5, len(text) + 1))))
+        chunks = [text[i:j] for i, j in zip([0] + cuts, cuts + [len(text)])]
+        assert _split(chunks) == text.splitlines(), chunks
@@ -0,0 +1,83 @@
+# tests/test_manifest.py
+"""Manifest: unchanged stems are skipped, changed inputs and --force rebuild (unit + cli/extractor runs)."""
+import os
+import sys
+
+import pytest
+
+from benchmarks.synth_gazette import GazetteSpec, make_gazette
+from pdf_extractor.cli import extractor
+from pdf_extractor.io.manifest import Manifest
+from pdf_extractor.services.text_extractor import TextExtractor
+
+
+def _bundle(out_root, stem):
+    out = out_root / stem / "bundle.json"
+    out.parent.mkdir(parents=True)
+    out.write_text("{}", encoding="utf-8")
+
+
+def test_input_rewritten_during_build_is_seen_as_changed(tmp_path):
+    src = tmp_path / "a.pdf"
+    src.write_bytes(b"v1")
+    m = Manifest(str(tmp_path / "out"))
+    inp = m.input_hash("a", src)
+    # the build reads v1; meanwhile the file is replaced by a same-size v2
+    src.write_bytes(b"v2")
+    os.utime(src, ns=(inp.stat[1] + 10**9, inp.stat[1] + 10**9))
+    _bundle(tmp_path / "out", "a")
+    m.record("a", src, inp, "p1", docs=0)
+    m.save()
+
+    m = Manifest(str(tmp_path / "out"))
+    assert m.status("a", m.input_hash("a", src).sha256, "p1") == "input"
+
+
+def test_unchanged_input_reuses_the_hash(tmp_path, monkeypatch):
+    src = tmp_path / "a.pdf"
+    src.write_bytes(b"v1")
+    m = Manifest(str(tmp_path / "out"))
+    inp = m.input_hash("a", src)
+    _bundle(tmp_path / "out", "a")
+    m.record("a", src, inp, "p1", docs=0)
+
+    monkeypatch.setattr("pdf_extractor.io.manifest.file_sha256", lambda p: pytest.fail("rehashed"))
+    assert m.input_hash("a", src) == inp
+    assert m.status("a", inp.sha256, "p1") == "unchanged"
+    assert m.status("a", inp.sha256, "p2") == "pipeline"
+
+
+@pytest.fixture(scope="module")
+def completo():
+    pdf = make_gazette(GazetteSpec(body_pages=1, sumario_items=2, act_lines=4))
+    return TextExtractor().extract(pdf).combined
+
+
+def _run(monkeypatch, capsys, in_root, out_root, *extra):
+    monkeypatch.setattr(sys, "argv", ["extractor", "--input-root", str(in_root), "--output-root", str(out_root), *extra])
+    extractor.main()
+    return capsys.readouterr().out
+
+
+def test_cli_unchanged_changed_forced(tmp_path, monkeypatch, capsys, completo):
+    in_root, out_root = tmp_path / "in", tmp_path / "out"
+    for stem in ("a", "b"):
+        (in_root / stem).mkdir(parents=True)
+        (in_root / stem / "completo.txt").write_text(completo, encoding="utf-8")
+
+    out = _run(monkeypatch, capsys, in_root, out_root)
+    assert "Rebuilding 2 stem(s): 2 new." in out
+    assert set(Manifest(str(out_root)).entries) == {"a", "b"}
+
+    out = _run(monkeypatch, capsys, in_root, out_root)
+    assert "Unchanged: 2 stem(s) skipped" in out
+    assert "Processed 0 PDF stems." in out
+
+    (in_root / "b" / "completo.txt").write_text(completo + "\nAdenda.\n", encoding="utf-8")
+    out = _run(monkeypatch, capsys, in_root, out_root)
+    assert "Unchanged: 1 stem(s) skipped" in out
+    assert "Rebuilding 1 stem(s): 1 with a changed input." in out
+
+    out = _run(monkeypatch, capsys, in_root, out_root, "--force")
+    assert "Rebuilding 2 stem(s): 2 unchanged (--force)." in out
+    assert "Processed 2 PDF stems." in out
@@ -0,0 +1,46 @@
+# tests/test_ocr_backend.py
+"""TesserocrPool._set_image hands a pixmap's samples to SetImageBytes (no tesserocr needed)."""
+import fitz  # PyMuPDF
+import pytest
+
+from pdf_extractor.services.ocr_backend import TesserocrPool, as_pil
+
+
+class FakeApi:
+    def __init__(self, bytes_only: bool = False):
+        self.bytes_only = bytes_only
+        self.calls = []
+
+    def SetImageBytes(self, data, width, height, bpp, stride):
+        if self.bytes_only and not isinstance(data, bytes):
+            raise TypeError("Argument 'imagedata' has incorrect type (expected bytes, got memoryview)")
+        self.calls.append((type(data), bytes(data), width, height, bpp, stride))
+
+
+@pytest.fixture
+def pix():
+    return fitz.Pixmap(fitz.csGRAY, fitz.IRect(0, 0, 37, 11), 0)
+
+
+def test_pixmap_samples_are_not_copied(pix, monkeypatch):
+    monkeypatch.setattr(TesserocrPool, "_bytes_only", False)
+    api = FakeApi()
+    TesserocrPool._set_image(api, pix)
+
+    assert api.calls == [(memoryview, pix.samples, 37, 11, 1, pix.stride)]
+
+
+def test_bytes_only_build_copies_once_detected(pix, monkeypatch):
+    monkeypatch.setattr(TesserocrPool, "_bytes_only", False)
+    api = FakeApi(bytes_only=True)
+    TesserocrPool._set_image(api, pix)
+    TesserocrPool._set_image(api, pix)
+
+    assert [c[0] for c in api.calls] == [bytes, bytes]
+    assert TesserocrPool._bytes_only
+
+
+def test_as_pil_wraps_pixmap(pix):
+    img = as_pil(pix)
+    assert (img.mode, img.size) == ("L", (37, 11))
+    assert img.tobytes() == pix.samples
@@ -0,0 +1,47 @@
+# tests/test_pipeline_smoke.py
+"""
+End-to-end run of Pipeline.process_pdf_bytes / iter_docs on a synthetic gazette
+(benchmarks/synth_gazette.py): every stage, including the DEBUG_PRINTS logging, must get through
+a PDF whose Sumário has items. Run from the repository root: python -m pytest -q
+"""
+import pytest
+
+from benchmarks.synth_gazette import SCENARIOS, make_gazette
+from pdf_extractor.config import Config
+from pdf_extractor.services import orchestrator
+from pdf_extractor.services.metrics import StageTimings
+from pdf_extractor.services.orchestrator import Pipeline
+
+SPEC = SCENARIOS["small"]
+
+
+@pytest.fixture(scope="module")
+def pipe():
+    return Pipeline(Config(dpi=300, ignore_top_percent=0.10, skip_last_page=True))
+
+
+@pytest.fixture(scope="module")
+def pdf():
+    return make_gazette(SPEC)
+
+
+@pytest.mark.parametrize("debug", [False, True])
+def test_process_pdf_bytes(pipe, pdf, monkeypatch, debug):
+    monkeypatch.setattr(orchestrator, "DEBUG_PRINTS", debug)
+    t = StageTimings()
+    out = pipe.process_pdf_bytes(pdf, pdf_name="small.pdf", timings=t)
+
+    assert out["pdf_name"] == "small.pdf"
+    assert len(out["docs"]) == SPEC.sumario_items
+    assert t.links == {"matched": SPEC.sumario_items}
+    assert t.docs == SPEC.sumario_items
+    for stage in ("text_extraction", "line_index", "sumario", "slicing", "link_or_build"):
+        assert stage in t.stages
+
+
+def test_iter_docs_matches_bundle(pipe, pdf):
+    lines = list(pipe.iter_docs(pdf, pdf_name="small.pdf"))
+    trailer = lines.pop()["trailer"]
+
+    assert trailer["docs"] == len(lines) == SPEC.sumario_items
+    assert lines == pipe.process_pdf_bytes(pdf, pdf_name="small.pdf")["docs"]
@@ -0,0 +1,82 @@
+# tests/test_result_cache.py
+"""ResultCache, and its use by POST /extract: a cache hit answers the same body, If-None-Match gets a 304."""
+import importlib
+import os
+import time
+from datetime import date
+
+import pytest
+from fastapi.testclient import TestClient
+
+from benchmarks.synth_gazette import GazetteSpec, make_gazette
+from pdf_extractor.io.result_cache import ResultCache
+
+
+def test_key_covers_everything_in_the_bundle():
+    base = ResultCache.key(b"%PDF", "a.pdf", None, "v1")
+
+    assert base == ResultCache.key(b"%PDF", "a.pdf", None, "v1")
+    assert len({base,
+                ResultCache.key(b"%PDF-", "a.pdf", None, "v1"),
+                ResultCache.key(b"%PDF", "b.pdf", None, "v1"),
+                ResultCache.key(b"%PDF", "a.pdf", date(2025, 3, 1), "v1"),
+                ResultCache.key(b"%PDF", "a.pdf", None, "v2"),
+                ResultCache.key(b"%PDF", "a.pdf", None, "v1", source_path="/in/a.pdf")}) == 6
+
+
+def test_put_get_and_expiry(tmp_path, monkeypatch):
+    cache = ResultCache(str(tmp_path), max_bytes=1 << 20, max_age_s=60)
+    bundle = {"docs": [{"id": "Aviso 1/2025", "texto": "ação"}], "notes": []}
+    cache.put("ab" * 32, bundle)
+
+    assert cache.get("ab" * 32) == bundle
+    assert cache.get("cd" * 32) is None
+
+    now = time.time()
+    monkeypatch.setattr("pdf_extractor.io.result_cache.time.time", lambda: now + 61)
+    assert cache.get("ab" * 32) is None
+    assert cache.expired == 1
+
+
+@pytest.fixture(scope="module")
+def api(tmp_path_factory):
+    # api.main builds its caches/job store in the working directory at import time
+    cwd = os.getcwd()
+    os.chdir(tmp_path_factory.mktemp("api"))
+    try:
+        main = importlib.import_module("pdf_extractor.api.main")
+    finally:
+        os.chdir(cwd)
+    return main
+
+
+@pytest.fixture
+def client(api, monkeypatch):
+    monkeypatch.setattr(api, "POOL", None)  # run /extract in a thread of this process
+    return TestClient(api.app)
+
+
+@pytest.fixture(scope="module")
+def pdf():
+    return make_gazette(GazetteSpec(body_pages=1, sumario_items=3, act_lines=4))
+
+
+def _post(client, pdf, **headers):
+    return client.post("/extract", files={"pdf": ("g.pdf", pdf, "application/pdf")}, headers=headers)
+
+
+def test_extract_hit_and_304(client, pdf):
+    first = _post(client, pdf)
+    second = _post(client, pdf)
+
+    assert first.status_code == second.status_code == 200
+    assert (first.headers["x-cache"], second.headers["x-cache"]) == ("miss", "hit")
+    assert first.headers["etag"] == second.headers["etag"]
+    assert second.content == first.content
+    assert len(first.json()["docs"]) == 3
+
+    etag = first.headers["etag"]
+    for inm in (etag, f"W/{etag}", f'"other", {etag}'):
+        r = _post(client, pdf, **{"If-None-Match": inm})
+        assert (r.status_code, r.headers["etag"], r.content) == (304, etag, b"")
+    assert _post(client, pdf, **{"If-None-Match": '"other"'}).status_code == 200
@@ -0,0 +1,21 @@
+# tests/test_worker_pool.py
+"""ExtractionPool admission: a reservation takes what is free (at least one slot) and gives it back."""
+import pytest
+
+from pdf_extractor.config import Config
+from pdf_extractor.services.worker_pool import ExtractionPool, PoolFull
+
+
+def test_reserve_takes_free_slots_and_releases_them():
+    pool = ExtractionPool(Config(), workers=1, max_pending=2)  # capacity 3, never started
+    big = pool.reserve(8)
+    assert (big.slots, pool.inflight) == (3, 3)
+    with pytest.raises(PoolFull):
+        pool.reserve(1)
+
+    big.release()
+    small = pool.reserve(2)
+    assert (small.slots, pool.inflight) == (2, 2)
+    assert pool.reserve(5).slots == 1
+    small.release()
+    assert pool.inflight == 1